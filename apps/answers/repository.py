@@ -1,4 +1,15 @@
 from apps.answers.models import Answer, AnswerLike
+from apps.questions.models import Question
+from core.app.base.ownership import OwnershipPolicy
+from core.app.base.projection import apply_projection
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class AnswerPolicy(OwnershipPolicy):
+    manage_permission = "answer.moderate"
 
 
 class AnswerRepository:
@@ -7,8 +18,49 @@ class AnswerRepository:
         return Answer.objects.filter(id=answer_id).first()
 
     @staticmethod
-    def get_by_question(question_id):
-        return Answer.objects.filter(question_id=question_id).order_by("-created_at")
+    def exists(answer_id):
+        return Answer.objects.filter(id=answer_id).exists()
+
+    @staticmethod
+    def get_manageable(user):
+        return AnswerPolicy.scope(Answer.objects.all(), user)
+
+    @staticmethod
+    def get_manageable_by_id(answer_id, user):
+        return AnswerRepository.get_manageable(user).filter(id=answer_id).first()
+
+    @staticmethod
+    def update_answers(user, answer_ids, fields):
+        return (
+            AnswerRepository.get_manageable(user)
+            .filter(id__in=answer_ids)
+            .update(updated_at=timezone.now(), **fields)
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def delete_answers(user, answer_ids):
+        answers = AnswerRepository.get_manageable(user).filter(id__in=answer_ids)
+        question_ids = set(answers.values_list("question_id", flat=True))
+        _, deleted = answers.delete()
+        if question_ids:
+            # 以子查詢一次重算受影響問題的回答數
+            answer_counts = (
+                Answer.objects.filter(question_id=OuterRef("pk"))
+                .order_by()
+                .values("question_id")
+                .annotate(total=Count("id"))
+                .values("total")
+            )
+            Question.objects.filter(id__in=question_ids).update(
+                answer_count=Coalesce(Subquery(answer_counts), Value(0))
+            )
+        return deleted.get(Answer._meta.label, 0)
+
+    @staticmethod
+    def get_by_question(question_id, projection=None):
+        answers = apply_projection(Answer.objects.all(), projection)
+        return answers.filter(question_id=question_id).order_by("-created_at")
 
     @staticmethod
     def toggle_like(answer, user):
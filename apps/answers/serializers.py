@@ -1,9 +1,13 @@
 from rest_framework import serializers
 from apps.answers.models import Answer
-from core.app.base.serializer import SuccessSerializer
+from core.app.base.serializer import (
+    BulkIdsSerializer,
+    SparseFieldsMixin,
+    SuccessSerializer,
+)
 
 
-class AnswerSerializer(serializers.ModelSerializer):
+class AnswerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.CharField(source="author.username", read_only=True)
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
 
@@ -26,6 +30,10 @@ class AnswerCreateSerializer(serializers.ModelSerializer):
         fields = ["content", "question_id"]
 
 
+class AnswerBulkUpdateSerializer(BulkIdsSerializer):
+    content = serializers.CharField(help_text="內容")
+
+
 class AnswerListItemSerializer(serializers.ModelSerializer):
     author = serializers.CharField(source="author.username", read_only=True)
     is_liked = serializers.BooleanField()
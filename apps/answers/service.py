@@ -1,7 +1,7 @@
 from apps.answers.repository import AnswerRepository
 from apps.answers.serializers import AnswerCreateSerializer
 from apps.questions.models import Question
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from apps.answers.models import Answer
 
 
@@ -25,11 +25,11 @@ class AnswerService:
         return answer
 
     @classmethod
-    def list_answers(cls, question_id, user=None):
+    def list_answers(cls, question_id, user=None, projection=None):
         question = Question.objects.filter(id=question_id).first()
         if not question:
             raise NotFound("問題不存在")
-        answers = cls.repository_class.get_by_question(question_id)
+        answers = cls.repository_class.get_by_question(question_id, projection)
 
         is_liked_map = {}
         if user and user.is_authenticated:
@@ -43,13 +43,17 @@ class AnswerService:
                 is_liked_map[answer.id] = False
         return answers, is_liked_map
 
+    @classmethod
+    def _raise_unavailable(cls, answer_id, message):
+        if cls.repository_class.exists(answer_id):
+            raise PermissionDenied(message)
+        raise NotFound("回答不存在")
+
     @classmethod
     def update_answer(cls, answer_id, user, data, partial=False):
-        answer = cls.repository_class.get_by_id(answer_id)
+        answer = cls.repository_class.get_manageable_by_id(answer_id, user)
         if not answer:
-            raise NotFound("回答不存在")
-        if answer.author != user:
-            raise PermissionDenied("您沒有權限修改此回答")
+            cls._raise_unavailable(answer_id, "您沒有權限修改此回答")
         serializer = AnswerCreateSerializer(answer, data=data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -57,14 +61,24 @@ class AnswerService:
 
     @classmethod
     def delete_answer(cls, answer_id, user):
-        answer = cls.repository_class.get_by_id(answer_id)
-        if not answer:
-            raise NotFound("回答不存在")
-        if answer.author != user:
-            raise PermissionDenied("您沒有權限刪除此回答")
-        answer.delete()
+        if not cls.repository_class.delete_answers(user, [answer_id]):
+            cls._raise_unavailable(answer_id, "您沒有權限刪除此回答")
         return True
 
+    @classmethod
+    def bulk_update_answers(cls, answer_ids, user, data):
+        serializer = AnswerCreateSerializer(data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        if "content" not in serializer.validated_data:
+            raise ValidationError({"content": ["沒有可批次更新的欄位"]})
+        return cls.repository_class.update_answers(
+            user, answer_ids, {"content": serializer.validated_data["content"]}
+        )
+
+    @classmethod
+    def bulk_delete_answers(cls, answer_ids, user):
+        return cls.repository_class.delete_answers(user, answer_ids)
+
     @classmethod
     def toggle_like(cls, answer_id, user):
         answer = cls.repository_class.get_by_id(answer_id)
@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.answers.models import Answer
+from apps.questions.models import Question
+from core.app.base.testing import find_select, selected_columns
+
+User = get_user_model()
+
+
+@override_settings(LAZY_LOAD_GUARD=True)
+class AnswerProjectionTest(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(
+            email="answer@example.com", password="pw", nickname="answer"
+        )
+        self.question = Question.objects.create(title="q", content="c", author=author)
+        Answer.objects.create(question=self.question, content="a", author=author)
+        self.client = APIClient()
+
+    def test_list_selects_serializer_columns(self):
+        """測試回答列表只讀取 AnswerSerializer 需要的欄位"""
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("questions:answer_list", args=[self.question.id])
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            selected_columns(find_select(context.captured_queries, "answers_answer")),
+            [
+                "answers_answer.id",
+                "answers_answer.content",
+                "answers_answer.created_at",
+                "answers_answer.author_id",
+                "answers_answer.likes",
+                "users_user.id",
+                "users_user.username",
+            ],
+        )
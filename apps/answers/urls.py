@@ -1,10 +1,18 @@
 from django.urls import path
-from .views import AnswerCreateView, AnswerDetailView, AnswerLikeView
+from .views import (
+    AnswerBulkDeleteView,
+    AnswerBulkUpdateView,
+    AnswerCreateView,
+    AnswerDetailView,
+    AnswerLikeView,
+)
 
 app_name = "answers"
 
 urlpatterns = [
     path("", AnswerCreateView.as_view(), name="answer_create"),
+    path("bulk-update/", AnswerBulkUpdateView.as_view(), name="answer_bulk_update"),
+    path("bulk-delete/", AnswerBulkDeleteView.as_view(), name="answer_bulk_delete"),
     path("<int:answer_id>/", AnswerDetailView.as_view(), name="answer_detail"),
     path("<int:answer_id>/like/", AnswerLikeView.as_view(), name="answer_like"),
 ]
@@ -6,14 +6,25 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import FormParser
 
 from apps.answers.serializers import (
+    AnswerBulkUpdateSerializer,
     AnswerSerializer,
     AnswerCreateSerializer,
+    AnswerListItemSerializer,
     AnswerListResponseSerializer,
     AnswerSuccessResponseSerializer,
     AnswerLikeSuccessResponseSerializer,
 )
 from apps.answers.service import AnswerService
-from core.app.base.serializer import BaseErrorSerializer, DeleteSuccessSerializer
+from core.app.base.lazyload import render
+from core.app.base.projection import projection_for
+from core.app.base.serializer import (
+    BaseErrorSerializer,
+    BulkIdsSerializer,
+    BulkResultResponseSerializer,
+    DeleteSuccessSerializer,
+    sparse_fields,
+    sparse_fields_parameters,
+)
 
 
 class AnswerCreateView(GenericAPIView):
@@ -52,13 +63,22 @@ class AnswerListView(GenericAPIView):
         },
         summary="取得所有回答",
         tags=["Questions"],
+        parameters=sparse_fields_parameters(AnswerListItemSerializer),
     )
     def get(self, request, question_id=None):
-        answers, is_liked_map = AnswerService.list_answers(question_id, request.user)
-        serializer = AnswerSerializer(answers, many=True, context={"request": request})
-        answers_data = serializer.data
-        for ans in answers_data:
-            ans["is_liked"] = is_liked_map.get(ans["id"], False)
+        # is_liked 由 view 另外補上，欄位以 AnswerListItemSerializer 為準
+        fields = sparse_fields(request.query_params, AnswerListItemSerializer)
+        answers, is_liked_map = AnswerService.list_answers(
+            question_id, request.user, projection_for(AnswerSerializer, fields)
+        )
+        serializer = AnswerSerializer(
+            answers, many=True, fields=fields, context={"request": request}
+        )
+        answers_data = render(serializer)
+        if fields is None or "is_liked" in fields:
+            # 以回答物件對應，?fields= 未包含 id 時也能補上
+            for answer, ans in zip(answers, answers_data):
+                ans["is_liked"] = is_liked_map.get(answer.id, False)
         return Response({"success": True, "message": "查詢成功", "data": answers_data})
 
 
@@ -156,3 +176,47 @@ class AnswerLikeView(GenericAPIView):
                 },
             }
         )
+
+
+class AnswerBulkUpdateView(GenericAPIView):
+    @extend_schema(
+        request=AnswerBulkUpdateSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次更新回答",
+        tags=["Answers"],
+    )
+    def post(self, request):
+        serializer = AnswerBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = AnswerService.bulk_update_answers(
+            serializer.validated_data["ids"], request.user, request.data
+        )
+        return Response(
+            {"success": True, "message": "回答批次更新成功", "data": {"count": count}}
+        )
+
+
+class AnswerBulkDeleteView(GenericAPIView):
+    @extend_schema(
+        request=BulkIdsSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次刪除回答",
+        tags=["Answers"],
+    )
+    def post(self, request):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = AnswerService.bulk_delete_answers(
+            serializer.validated_data["ids"], request.user
+        )
+        return Response(
+            {"success": True, "message": "回答批次刪除成功", "data": {"count": count}}
+        )
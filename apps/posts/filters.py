@@ -0,0 +1,34 @@
+from apps.posts.repository import POST_ORDERINGS, PostRepository
+from apps.posts.serializers import PostListQuerySerializer
+from apps.tags.repository import PostTagRepository
+from core.app.base.filters import FilterPipeline
+
+
+class PostListFilter(FilterPipeline):
+    query_serializer_class = PostListQuerySerializer
+    filters = {
+        "keyword": "filter_keyword",
+        "tags": "filter_tags",
+        "author": "author_id",
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lt",
+    }
+    orderings = POST_ORDERINGS
+
+    @classmethod
+    def filter_keyword(cls, queryset, value, params):
+        return PostRepository.search(queryset, value)
+
+    @classmethod
+    def filter_tags(cls, queryset, value, params):
+        return PostTagRepository.filter(queryset, value, params["tag_match"])
+
+    @classmethod
+    def get_ordering(cls, queryset, params):
+        ordering = params.get("sort") or (
+            "relevance" if params.get("keyword") else cls.default_ordering
+        )
+        # 未使用全文檢索（無關鍵字或非 PostgreSQL）時沒有 rank 可排序
+        if ordering == "relevance" and "rank" not in queryset.query.annotations:
+            return cls.default_ordering
+        return ordering
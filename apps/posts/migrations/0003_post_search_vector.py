@@ -0,0 +1,110 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:10
+
+import re
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(
+    fields=["search_vector"], name="post_search_vector_idx"
+)
+
+
+# 分詞規則複製自當時的 apps.posts.search；遷移不引用應用程式碼，
+# 之後調整分詞也不會改變此遷移的行為
+CJK_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+"
+)
+
+UPDATE_SQL = """
+    UPDATE posts_post SET search_vector =
+        setweight(to_tsvector('english'::regconfig, %s), 'A')
+        || setweight(to_tsvector('simple'::regconfig, %s), 'A')
+        || setweight(to_tsvector('english'::regconfig, %s), 'B')
+        || setweight(to_tsvector('simple'::regconfig, %s), 'B')
+    WHERE id = %s
+"""
+
+
+def strip_cjk(text):
+    return CJK_RE.sub(" ", text or "")
+
+
+def cjk_bigrams(text):
+    tokens = []
+    for run in CJK_RE.findall(text or ""):
+        tokens.extend(run[index : index + 2] for index in range(len(run) - 1))
+        tokens.append(run[-1])
+    return " ".join(tokens)
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Post = apps.get_model("posts", "Post")
+    last_id = 0
+    while True:
+        rows = list(
+            Post.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "title", "content")[:1000]
+        )
+        if not rows:
+            return
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                UPDATE_SQL,
+                [
+                    (
+                        strip_cjk(title),
+                        cjk_bigrams(title),
+                        strip_cjk(content),
+                        cjk_bigrams(content),
+                        post_id,
+                    )
+                    for post_id, title, content in rows
+                ],
+            )
+        last_id = rows[-1][0]
+
+
+def create_search_index(apps, schema_editor):
+    # GIN 為 PostgreSQL 專屬，且在回填完成後才建立，避免回填時逐列維護索引
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.add_index(apps.get_model("posts", "Post"), SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.remove_index(apps.get_model("posts", "Post"), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+    # 每批回填各自提交，大量貼文時不會長時間鎖住整張表
+    atomic = False
+
+    dependencies = [
+        ("posts", "0002_remove_post_image_type_alter_post_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="post", index=SEARCH_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0003_post_search_vector"),
+        ("tags", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="tag_items",
+            field=models.ManyToManyField(
+                blank=True, related_name="posts", through="tags.PostTag", to="tags.tag"
+            ),
+        ),
+    ]
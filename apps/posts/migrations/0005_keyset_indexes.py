@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0004_post_tag_items"),
+        ("tags", "0002_backfill_tags"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="post_created_id_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
 import base64
 
 from apps.users.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.paginator import Paginator
 from django.db.models import Q
@@ -14,9 +16,20 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    # tags 保留原始字串供顯示，篩選與計數以 tag_items 為準
+    tag_items = models.ManyToManyField(
+        "tags.Tag", through="tags.PostTag", related_name="posts", blank=True
+    )
+    # 由 PostRepository.refresh_search_vectors 維護，含中日韓二字詞與一般詞彙
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="post_search_vector_idx"),
+            # 游標分頁依 (created_at, id) 排序與過濾
+            models.Index(fields=["-created_at", "-id"], name="post_created_id_idx"),
+        ]
 
     def get_image_url(self):
         if self.image:
@@ -1,48 +1,143 @@
 from apps.posts.models import Post
-from django.core.paginator import Paginator
-from django.db.models import Q
+from apps.posts.search import build_search_query, build_search_vector, search_enabled
+from apps.tags.repository import PostTagRepository
+from core.app.base.counting import CountStrategy
+from core.app.base.ownership import OwnershipPolicy
+from core.app.base.projection import apply_projection
+from django.contrib.postgres.search import SearchRank
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+SEARCH_FIELDS = frozenset(("title", "content"))
+POST_ORDERINGS = {
+    "latest": ("-created_at", "-id"),
+    "oldest": ("created_at", "id"),
+    "relevance": ("-rank", "-created_at", "-id"),
+}
+
+
+class PostPolicy(OwnershipPolicy):
+    manage_permission = "post.moderate"
 
 
 class PostRepository:
     @staticmethod
-    def get_by_id(post_id):
-        return Post.objects.filter(id=post_id).first()
+    def get_by_id(post_id, projection=None):
+        posts = apply_projection(Post.objects.all(), projection)
+        return posts.filter(id=post_id).first()
 
     @staticmethod
-    def get_all_posts():
-        return Post.objects.all().order_by("-created_at")
+    def exists(post_id):
+        return Post.objects.filter(id=post_id).exists()
+
+    @staticmethod
+    def get_manageable(user):
+        return PostPolicy.scope(Post.objects.all(), user)
+
+    @staticmethod
+    def get_manageable_by_id(post_id, user):
+        return PostRepository.get_manageable(user).filter(id=post_id).first()
+
+    @staticmethod
+    @transaction.atomic
+    def update_posts(user, post_ids, fields):
+        # 先取出通過權限篩選的 id，標籤與搜尋向量只處理實際更新的貼文
+        allowed_ids = list(
+            PostRepository.get_manageable(user)
+            .filter(id__in=post_ids)
+            .values_list("id", flat=True)
+        )
+        if not allowed_ids:
+            return 0
+        count = Post.objects.filter(id__in=allowed_ids).update(
+            updated_at=timezone.now(), **fields
+        )
+        if "tags" in fields:
+            PostTagRepository.set_tags(allowed_ids, fields["tags"])
+        if not SEARCH_FIELDS.isdisjoint(fields):
+            PostRepository.refresh_search_vectors(allowed_ids)
+        return count
 
     @staticmethod
-    def get_posts_with_filters(page, size, keyword, tags=""):
-        posts = Post.objects.all()
+    def refresh_search_vectors(post_ids=None, batch_size=500):
+        """依 id 分批重算 search_vector；post_ids 為 None 時處理全部貼文"""
+        if not search_enabled():
+            return 0
+        posts = Post.objects.order_by("id")
+        if post_ids is not None:
+            posts = posts.filter(id__in=post_ids)
+        refreshed = 0
+        last_id = 0
+        while True:
+            rows = list(
+                posts.filter(id__gt=last_id).values_list("id", "title", "content")[
+                    :batch_size
+                ]
+            )
+            if not rows:
+                return refreshed
+            Post.objects.bulk_update(
+                [
+                    Post(id=post_id, search_vector=build_search_vector(title, content))
+                    for post_id, title, content in rows
+                ],
+                ["search_vector"],
+            )
+            refreshed += len(rows)
+            last_id = rows[-1][0]
 
-        if keyword:
-            posts = posts.filter(
+    @staticmethod
+    def search(posts, keyword):
+        if not search_enabled():
+            return posts.filter(
                 Q(title__icontains=keyword) | Q(content__icontains=keyword)
             )
+        query = build_search_query(keyword)
+        if query is None:
+            return posts
+        return (
+            posts.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at", "-id")
+        )
 
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
-            if tag_list:
-                tag_queries = Q()
-                for tag in tag_list:
-                    tag_queries |= Q(tags__icontains=tag)
-                posts = posts.filter(tag_queries)
+    @staticmethod
+    @transaction.atomic
+    def delete_posts(user, post_ids):
+        posts = PostRepository.get_manageable(user).filter(id__in=post_ids)
+        PostTagRepository.release(posts.values_list("id", flat=True))
+        _, deleted = posts.delete()
+        count = deleted.get(Post._meta.label, 0)
+        CountStrategy.adjust(Post, -count)
+        return count
 
-        paginator = Paginator(posts, size)
-        return paginator.get_page(page)
+    @staticmethod
+    def get_all_posts():
+        return Post.objects.all().order_by("-created_at")
+
+    @staticmethod
+    def get_list_queryset(projection=None):
+        """列表的基礎 queryset，篩選與排序交給 PostListFilter，分頁交給 view"""
+        return apply_projection(Post.objects.defer("search_vector"), projection)
 
     @staticmethod
+    @transaction.atomic
     def create_post(title, content, author, tags="", image_file=None):
-        return Post.objects.create(
+        post = Post.objects.create(
             title=title,
             content=content,
             author=author,
             tags=tags,
             image=image_file,
         )
+        PostTagRepository.set_tags([post.id], tags)
+        PostRepository.refresh_search_vectors([post.id])
+        CountStrategy.adjust(Post, 1)
+        return post
 
     @staticmethod
+    @transaction.atomic
     def update_post(post, data, partial=False):
         if partial:
             for field, value in data.items():
@@ -53,9 +148,8 @@ class PostRepository:
                 if hasattr(post, field):
                     setattr(post, field, value)
         post.save()
+        if "tags" in data:
+            PostTagRepository.set_tags([post.id], data["tags"])
+        if not SEARCH_FIELDS.isdisjoint(data):
+            PostRepository.refresh_search_vectors([post.id])
         return post
-
-    @staticmethod
-    def delete_post(post):
-        post.delete()
-        return True
@@ -0,0 +1,67 @@
+import re
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Value
+
+# 中日韓文字（含假名、韓文音節）視為無空白分詞的語言
+CJK_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+"
+)
+CJK_CONFIG = "simple"
+WORD_CONFIG = "english"
+
+
+def search_enabled():
+    """全文檢索依賴 PostgreSQL 的 tsvector，其他資料庫退回 icontains"""
+    return connection.vendor == "postgresql"
+
+
+def strip_cjk(text):
+    return CJK_RE.sub(" ", text or "")
+
+
+def cjk_bigrams(text):
+    """
+    將每段連續的中日韓文字切成重疊的二字詞，段尾再補一個單字。
+
+    二字詞在文件中的位置相鄰，搭配 phrase 查詢即可得到與 icontains 相同的子字串語意；
+    段尾單字讓單字查詢以前綴比對（字:*）也能命中最後一個字。
+    """
+    tokens = []
+    for run in CJK_RE.findall(text or ""):
+        tokens.extend(run[index : index + 2] for index in range(len(run) - 1))
+        tokens.append(run[-1])
+    return tokens
+
+
+def _weighted_vector(text, weight):
+    return SearchVector(
+        Value(strip_cjk(text)), config=WORD_CONFIG, weight=weight
+    ) + SearchVector(
+        Value(" ".join(cjk_bigrams(text))), config=CJK_CONFIG, weight=weight
+    )
+
+
+def build_search_vector(title, content):
+    """標題權重 A、內容權重 B，SearchRank 會讓標題命中排在前面"""
+    return _weighted_vector(title, "A") + _weighted_vector(content, "B")
+
+
+def build_search_query(keyword):
+    queries = []
+    words = strip_cjk(keyword).strip()
+    if words:
+        queries.append(SearchQuery(words, config=WORD_CONFIG))
+    for run in CJK_RE.findall(keyword or ""):
+        if len(run) == 1:
+            queries.append(
+                SearchQuery(f"{run}:*", config=CJK_CONFIG, search_type="raw")
+            )
+            continue
+        bigrams = " ".join(run[index : index + 2] for index in range(len(run) - 1))
+        queries.append(SearchQuery(bigrams, config=CJK_CONFIG, search_type="phrase"))
+    if not queries:
+        return None
+    return reduce(lambda left, right: left & right, queries)
@@ -1,9 +1,15 @@
 from rest_framework import serializers
 from .models import Post
-from core.app.base.serializer import SuccessSerializer
+from apps.posts.repository import POST_ORDERINGS
+from core.app.base.serializer import (
+    BulkIdsSerializer,
+    ListQuerySerializer,
+    SparseFieldsMixin,
+    SuccessSerializer,
+)
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.CharField(source="author.username", read_only=True)
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
     image = serializers.SerializerMethodField()
@@ -12,6 +18,7 @@ class PostSerializer(serializers.ModelSerializer):
         model = Post
         fields = ["id", "title", "content", "tags", "image", "author", "created_at"]
         read_only_fields = ["id", "author", "created_at"]
+        projection_sources = {"image": ["image"]}
 
     def get_image(self, obj):
         request = self.context.get("request")
@@ -24,9 +31,9 @@ class PostSerializer(serializers.ModelSerializer):
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
-    title = serializers.CharField(required=True, allow_null=False)
+    title = serializers.CharField(required=True, allow_null=False, max_length=255)
     content = serializers.CharField(required=True, allow_null=False)
-    tags = serializers.CharField(required=False, allow_null=True)
+    tags = serializers.CharField(required=False, allow_null=True, max_length=100)
     image = serializers.ImageField(required=False, allow_null=True)
 
     class Meta:
@@ -45,9 +52,9 @@ class PostCreateSerializer(serializers.ModelSerializer):
 
 
 class PostUpdateSerializer(serializers.ModelSerializer):
-    title = serializers.CharField(required=False, allow_null=True)
+    title = serializers.CharField(required=False, allow_null=True, max_length=255)
     content = serializers.CharField(required=False, allow_null=True)
-    tags = serializers.CharField(required=False, allow_null=True)
+    tags = serializers.CharField(required=False, allow_null=True, max_length=100)
     image = serializers.ImageField(required=False, allow_null=True)
 
     class Meta:
@@ -55,6 +62,20 @@ class PostUpdateSerializer(serializers.ModelSerializer):
         fields = ["title", "content", "tags", "image"]
 
 
+class PostBulkUpdateSerializer(BulkIdsSerializer):
+    title = serializers.CharField(required=False, help_text="標題")
+    content = serializers.CharField(required=False, help_text="內容")
+    tags = serializers.CharField(required=False, allow_blank=True, help_text="標籤")
+
+
+class PostListQuerySerializer(ListQuerySerializer):
+    sort = serializers.ChoiceField(
+        choices=list(POST_ORDERINGS),
+        required=False,
+        help_text="排序方式；有關鍵字時預設為 relevance，否則為 latest",
+    )
+
+
 PostSuccessResponseSerializer = SuccessSerializer(
     PostSerializer(), "PostSuccessResponseSerializer"
 )
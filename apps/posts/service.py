@@ -1,6 +1,7 @@
+from apps.posts.filters import PostListFilter
 from apps.posts.repository import PostRepository
-from apps.posts.serializers import PostCreateSerializer
-from rest_framework.exceptions import NotFound, PermissionDenied
+from apps.posts.serializers import PostCreateSerializer, PostUpdateSerializer
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
 
 class PostService:
@@ -22,26 +23,30 @@ class PostService:
         return post
 
     @classmethod
-    def list_posts(cls, page=1, size=10, keyword=None, tags=None):
-        posts = cls.repository_class.get_posts_with_filters(
-            page, size, keyword, tags or ""
+    def list_posts(cls, params=None, projection=None):
+        filters = PostListFilter.validate(params or {})
+        return PostListFilter.apply(
+            cls.repository_class.get_list_queryset(projection), filters
         )
-        return posts
 
     @classmethod
-    def get_post(cls, post_id):
-        post = cls.repository_class.get_by_id(post_id)
+    def get_post(cls, post_id, projection=None):
+        post = cls.repository_class.get_by_id(post_id, projection)
         if not post:
             raise NotFound("貼文不存在")
         return post
 
+    @classmethod
+    def _raise_unavailable(cls, post_id, message):
+        if cls.repository_class.exists(post_id):
+            raise PermissionDenied(message)
+        raise NotFound("貼文不存在")
+
     @classmethod
     def update_post(cls, post_id, user, data, partial=False, files=None):
-        post = cls.repository_class.get_by_id(post_id)
+        post = cls.repository_class.get_manageable_by_id(post_id, user)
         if not post:
-            raise NotFound("貼文不存在")
-        if post.author != user:
-            raise PermissionDenied("您沒有權限修改此貼文")
+            cls._raise_unavailable(post_id, "您沒有權限修改此貼文")
         # 直接將 image 欄位設為檔案物件
         if files and "image" in files:
             data["image"] = files["image"]
@@ -52,10 +57,24 @@ class PostService:
 
     @classmethod
     def delete_post(cls, post_id, user):
-        post = cls.repository_class.get_by_id(post_id)
-        if not post:
-            raise NotFound("貼文不存在")
-        if post.author != user:
-            raise PermissionDenied("您沒有權限刪除此貼文")
+        if not cls.repository_class.delete_posts(user, [post_id]):
+            cls._raise_unavailable(post_id, "您沒有權限刪除此貼文")
+        return True
 
-        return cls.repository_class.delete_post(post)
+    @classmethod
+    def bulk_update_posts(cls, post_ids, user, data):
+        serializer = PostUpdateSerializer(data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        # 批次更新不處理圖片，null 視為未提供
+        fields = {
+            field: serializer.validated_data[field]
+            for field in ("title", "content", "tags")
+            if serializer.validated_data.get(field) is not None
+        }
+        if not fields:
+            raise ValidationError({"fields": ["沒有可批次更新的欄位"]})
+        return cls.repository_class.update_posts(user, post_ids, fields)
+
+    @classmethod
+    def bulk_delete_posts(cls, post_ids, user):
+        return cls.repository_class.delete_posts(user, post_ids)
@@ -1,3 +1,435 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+
+from apps.posts.models import Post
+from apps.posts.repository import PostRepository
+from apps.posts.search import cjk_bigrams, strip_cjk
+from apps.posts.service import PostService
+from apps.rbac.models import Permission, Role
+from apps.rbac.repositories import invalidate_local_caches
+from core.app.base.pagination import KeysetPagination
+from core.app.base.testing import find_select, selected_columns
+
+User = get_user_model()
+
+
+class PostOwnershipTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_local_caches({"scope": "global"})
+        self.author = User.objects.create_user(
+            email="author@example.com", password="pw", nickname="author"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", password="pw", nickname="other"
+        )
+        self.post = Post.objects.create(title="t1", content="c1", author=self.author)
+        self.other_post = Post.objects.create(
+            title="t2", content="c2", author=self.other
+        )
+
+    def test_owner_can_delete(self):
+        """測試作者可刪除自己的貼文"""
+        # Act
+        result = PostService.delete_post(self.post.id, self.author)
+
+        # Assert
+        self.assertTrue(result)
+        self.assertFalse(Post.objects.filter(id=self.post.id).exists())
+
+    def test_non_owner_delete_is_denied(self):
+        """測試非作者刪除時回傳 403，不存在時回傳 404"""
+        # Act & Assert
+        with self.assertRaises(PermissionDenied):
+            PostService.delete_post(self.post.id, self.other)
+        with self.assertRaises(NotFound):
+            PostService.delete_post(999999, self.author)
+        self.assertTrue(Post.objects.filter(id=self.post.id).exists())
+
+    def test_bulk_delete_only_affects_own_posts(self):
+        """測試批次刪除只刪除自己的貼文並回傳實際筆數"""
+        # Act
+        count = PostService.bulk_delete_posts(
+            [self.post.id, self.other_post.id], self.author
+        )
+
+        # Assert
+        self.assertEqual(count, 1)
+        self.assertTrue(Post.objects.filter(id=self.other_post.id).exists())
+
+    def test_moderator_can_bulk_update_all_posts(self):
+        """測試持有 post.moderate 權限者可批次更新所有貼文"""
+        # Arrange
+        permission = Permission.objects.create(
+            code="post.moderate",
+            name="Moderate Posts",
+            action="moderate",
+            resource="posts",
+            category="posts",
+        )
+        role = Role.objects.create(code="moderator", name="Moderator")
+        role.permissions.add(permission)
+        self.other.roles.add(role)
+
+        # Act
+        count = PostService.bulk_update_posts(
+            [self.post.id, self.other_post.id], self.other, {"tags": "hidden"}
+        )
+
+        # Assert
+        self.assertEqual(count, 2)
+        self.assertEqual(Post.objects.filter(tags="hidden").count(), 2)
+
+    def test_bulk_update_refreshes_only_manageable_posts(self):
+        """測試批次更新只處理通過權限篩選的貼文"""
+        # Act
+        with patch.object(PostRepository, "refresh_search_vectors") as refresh:
+            count = PostService.bulk_update_posts(
+                [self.post.id, self.other_post.id], self.author, {"title": "new"}
+            )
+
+        # Assert
+        self.assertEqual(count, 1)
+        refresh.assert_called_once_with([self.post.id])
+        self.assertEqual(Post.objects.get(id=self.other_post.id).title, "t2")
+
+    def test_bulk_update_validates_fields(self):
+        """測試批次更新沿用 PostUpdateSerializer 的欄位驗證"""
+        # Act & Assert
+        with self.assertRaises(ValidationError):
+            PostService.bulk_update_posts(
+                [self.post.id], self.author, {"tags": "x" * 101}
+            )
+        self.assertIsNone(Post.objects.get(id=self.post.id).tags)
+
+    def test_bulk_update_endpoint_requires_permission(self):
+        """測試未持有 post.bulk_update 的使用者呼叫批次更新端點時回傳 403"""
+        # Arrange
+        permission = Permission.objects.create(
+            code="post.bulk_update",
+            name="Bulk Update Posts",
+            action="update",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/bulk-update/",
+            route_name="posts:post_bulk_update",
+            method="POST",
+        )
+        role = Role.objects.create(code="editor", name="Editor")
+        role.permissions.add(permission)
+        cache.clear()
+        invalidate_local_caches({"scope": "global"})
+        client = APIClient()
+        client.force_authenticate(self.author)
+        url = reverse("posts:post_bulk_update")
+        body = {"ids": [self.post.id], "title": "new"}
+
+        # Act
+        denied = client.post(url, body, format="json")
+        self.author.roles.add(role)
+        cache.clear()
+        invalidate_local_caches({"scope": "global"})
+        allowed = client.post(url, body, format="json")
+
+        # Assert
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(Post.objects.get(id=self.post.id).title, "new")
+
+
+class PostSearchTokenizerTest(SimpleTestCase):
+    def test_cjk_bigrams(self):
+        """測試連續中文切成重疊二字詞，段尾補單字"""
+        # Act
+        tokens = cjk_bigrams("Django 全文檢索，快")
+
+        # Assert
+        self.assertEqual(tokens, ["全文", "文檢", "檢索", "索", "快"])
+
+    def test_strip_cjk_keeps_words(self):
+        """測試移除中日韓文字後保留一般詞彙"""
+        # Act & Assert
+        self.assertEqual(strip_cjk("用 Django 寫API").split(), ["Django", "API"])
+
+    def test_search_filters_on_search_vector(self):
+        """測試全文檢索以 search_vector 的 @@ 條件過濾，不掃描 content"""
+        # Act
+        with patch("apps.posts.repository.search_enabled", return_value=True):
+            queryset = PostRepository.search(Post.objects.all(), "django 快取")
+        sql, params = queryset.query.sql_with_params()
+
+        # Assert
+        where = sql.split(" WHERE ", 1)[1]
+        self.assertIn('"posts_post"."search_vector" @@', where)
+        self.assertIn("phraseto_tsquery", where)
+        self.assertNotIn("LIKE", where)
+        self.assertIn("快取", params)
+
+
+class PostCursorPaginationTest(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(
+            email="cursor@example.com", password="pw", nickname="cursor"
+        )
+        self.posts = [
+            Post.objects.create(title=f"t{index}", content="c", author=author)
+            for index in range(5)
+        ]
+        # 建立時間相同時以 id 決定順序，確保翻頁不重複也不遺漏
+        Post.objects.update(created_at=timezone.now())
+        self.client = APIClient()
+
+    def test_walk_pages_with_cursor(self):
+        """測試游標分頁逐頁取得所有貼文且不計算總數"""
+        # Arrange
+        url = reverse("posts:post_list") + "?pagination=cursor&size=2"
+        seen = []
+
+        # Act
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(item["id"] for item in body["data"])
+            self.assertNotIn("count", body["pagination"])
+            url = body["pagination"]["next"]
+
+        # Assert
+        self.assertEqual(seen, [post.id for post in reversed(self.posts)])
+        self.assertFalse(body["pagination"]["has_next"])
+
+    def test_invalid_cursor(self):
+        """測試無法解析的游標回傳 404"""
+        # Act
+        response = self.client.get(reverse("posts:post_list") + "?cursor=bad")
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values(self):
+        """測試游標值型別不符時回傳 404 而非 500"""
+        # Arrange
+        cursors = [
+            ["not-a-date", "x"],
+            [1, 2],
+            ["2024-01-01T00:00:00", "abc"],
+            [None, 1],
+        ]
+
+        for values in cursors:
+            with self.subTest(values=values):
+                # Act
+                response = self.client.get(
+                    reverse("posts:post_list"),
+                    {"cursor": KeysetPagination.encode_cursor(values)},
+                )
+
+                # Assert
+                self.assertEqual(response.status_code, 404)
+
+    def test_naive_datetime_cursor(self):
+        """測試不含時區的游標時間仍可正常翻頁"""
+        # Arrange
+        newest = self.posts[-1]
+        cursor = KeysetPagination.encode_cursor(
+            [newest.created_at.replace(tzinfo=None).isoformat(), newest.id]
+        )
+
+        # Act
+        response = self.client.get(reverse("posts:post_list"), {"cursor": cursor})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+
+
+class PostListCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="count@example.com", password="pw", nickname="count"
+        )
+        self.client = APIClient()
+        self.url = reverse("posts:post_list")
+
+    def create_post(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return PostRepository.create_post(title, "c", self.author)
+
+    def test_table_count_is_maintained_on_write(self):
+        """測試未篩選的總數由快取提供，並在新增與刪除時同步增減"""
+        # Arrange
+        self.create_post("t1")
+        self.client.get(self.url)
+        self.create_post("t2")
+        removed = self.create_post("t3")
+        with self.captureOnCommitCallbacks(execute=True):
+            PostRepository.delete_posts(self.author, [removed.id])
+
+        # Act
+        response = self.client.get(self.url)
+
+        # Assert
+        pagination = response.json()["pagination"]
+        self.assertEqual(pagination["count"], 2)
+        self.assertFalse(pagination["count_exact"])
+
+    def test_exact_count_bypasses_cache(self):
+        """測試 count=exact 時不使用快取的總數"""
+        # Arrange
+        self.create_post("t1")
+        self.client.get(self.url)
+        Post.objects.create(title="t2", content="c", author=self.author)
+
+        # Act
+        cached = self.client.get(self.url).json()["pagination"]
+        exact = self.client.get(self.url + "?count=exact").json()["pagination"]
+
+        # Assert
+        self.assertEqual(cached["count"], 1)
+        self.assertEqual(exact["count"], 2)
+        self.assertTrue(exact["count_exact"])
+
+    def test_cascade_delete_marks_cached_count_inexact(self):
+        """測試串聯刪除未經 adjust 時，快取總數標示為非精確，count=exact 取得實際筆數"""
+        # Arrange
+        self.create_post("t1")
+        self.client.get(self.url)
+        self.author.delete()
+
+        # Act
+        cached = self.client.get(self.url).json()
+        exact = self.client.get(self.url, {"count": "exact"}).json()
+
+        # Assert
+        self.assertEqual(cached["data"], [])
+        self.assertFalse(cached["pagination"]["count_exact"])
+        self.assertEqual(exact["pagination"]["count"], 0)
+        self.assertTrue(exact["pagination"]["count_exact"])
+
+    def test_stale_count_does_not_limit_pages(self):
+        """測試快取總數過時時，實際存在的最後一頁仍可取得且不會回傳超出範圍的空頁"""
+        # Arrange
+        self.create_post("t1")
+        self.client.get(self.url, {"size": 1})
+        Post.objects.create(title="t2", content="c", author=self.author)
+
+        # Act
+        first = self.client.get(self.url, {"size": 1})
+        last = self.client.get(self.url, {"size": 1, "page": 2})
+        beyond = self.client.get(self.url, {"size": 1, "page": 3})
+
+        # Assert
+        self.assertEqual(first.json()["pagination"]["count"], 1)
+        self.assertIsNotNone(first.json()["pagination"]["next"])
+        self.assertEqual([item["title"] for item in last.json()["data"]], ["t1"])
+        self.assertIsNone(last.json()["pagination"]["next"])
+        self.assertEqual(beyond.status_code, 404)
+
+
+@override_settings(LAZY_LOAD_GUARD=True)
+class PostProjectionTest(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(
+            email="projection@example.com", password="pw", nickname="projection"
+        )
+        Post.objects.create(title="t1", content="c1", author=author)
+        self.client = APIClient()
+
+    def test_list_selects_serializer_columns(self):
+        """測試列表只讀取 PostSerializer 需要的欄位，作者以 JOIN 取得"""
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("posts:post_list"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        sql = find_select(context.captured_queries, "posts_post")
+        self.assertCountEqual(
+            selected_columns(sql),
+            [
+                "posts_post.id",
+                "posts_post.title",
+                "posts_post.content",
+                "posts_post.tags",
+                "posts_post.image",
+                "posts_post.created_at",
+                "posts_post.author_id",
+                "users_user.id",
+                "users_user.username",
+            ],
+        )
+        self.assertEqual(len(context.captured_queries), 2)
+
+
+@override_settings(LAZY_LOAD_GUARD=True)
+class PostSparseFieldsTest(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(
+            email="sparse@example.com", password="pw", nickname="sparse"
+        )
+        self.post = Post.objects.create(title="t1", content="c1", author=author)
+        self.client = APIClient()
+        self.url = reverse("posts:post_list")
+
+    def test_fields_limit_response_and_columns(self):
+        """測試 ?fields= 只輸出並只讀取指定欄位，不再 JOIN 作者"""
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"fields": "id,title"})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], [{"id": self.post.id, "title": "t1"}])
+        sql = find_select(context.captured_queries, "posts_post")
+        self.assertCountEqual(
+            selected_columns(sql), ["posts_post.id", "posts_post.title"]
+        )
+
+    def test_exclude_on_detail(self):
+        """測試 ?exclude= 移除指定欄位"""
+        # Act
+        response = self.client.get(
+            reverse("posts:post_detail", args=[self.post.id]),
+            {"exclude": "content,image"},
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            response.json()["data"], ["id", "title", "tags", "author", "created_at"]
+        )
+
+    def test_cursor_page_reads_ordering_columns(self):
+        """測試游標分頁在欄位子集下仍一次查詢取得產生游標所需的排序欄位"""
+        # Arrange
+        Post.objects.create(title="t2", content="c2", author=self.post.author)
+
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url, {"fields": "title", "pagination": "cursor", "size": 1}
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["data"], [{"title": "t2"}])
+        self.assertTrue(body["pagination"]["has_next"])
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_unknown_field_rejected(self):
+        """測試不存在的欄位回傳 400"""
+        # Act
+        response = self.client.get(self.url, {"fields": "id,password"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
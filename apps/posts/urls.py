@@ -1,9 +1,16 @@
 from django.urls import path
-from .views import PostCreateListView, PostDetailView
+from .views import (
+    PostBulkDeleteView,
+    PostBulkUpdateView,
+    PostCreateListView,
+    PostDetailView,
+)
 
 app_name = "posts"
 
 urlpatterns = [
     path("", PostCreateListView.as_view(), name="post_list"),
+    path("bulk-update/", PostBulkUpdateView.as_view(), name="post_bulk_update"),
+    path("bulk-delete/", PostBulkDeleteView.as_view(), name="post_bulk_delete"),
     path("<int:post_id>/", PostDetailView.as_view(), name="post_detail"),
 ]
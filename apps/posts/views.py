@@ -7,18 +7,32 @@ from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import OpenApiParameter
 
 from apps.posts.serializers import (
+    PostBulkUpdateSerializer,
     PostSerializer,
     PostCreateSerializer,
     PostUpdateSerializer,
     PostSuccessResponseSerializer,
     PostListResponseSerializer,
+    PostListQuerySerializer,
 )
 from apps.posts.service import PostService
-from core.app.base.serializer import BaseErrorSerializer, DeleteSuccessSerializer
-from core.app.base.pagination import CustomPageNumberPagination
+from core.app.base.serializer import (
+    BaseErrorSerializer,
+    BulkIdsSerializer,
+    BulkResultResponseSerializer,
+    DeleteSuccessSerializer,
+    sparse_fields,
+    sparse_fields_parameters,
+)
+from core.app.base.lazyload import render
+from core.app.base.projection import projection_for
+from core.app.base.pagination import (
+    CustomPageNumberPagination,
+    SwitchablePaginationMixin,
+)
 
 
-class PostCreateListView(GenericAPIView):
+class PostCreateListView(SwitchablePaginationMixin, GenericAPIView):
     parser_classes = (FormParser,)
     pagination_class = CustomPageNumberPagination
 
@@ -35,6 +49,7 @@ class PostCreateListView(GenericAPIView):
         summary="取得所有貼文",
         tags=["Posts"],
         parameters=[
+            PostListQuerySerializer,
             OpenApiParameter(
                 name="page",
                 type=int,
@@ -49,13 +64,39 @@ class PostCreateListView(GenericAPIView):
                 description="每頁筆數",
                 default=10,
             ),
+            OpenApiParameter(
+                name="count",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="exact 時回傳精確總數，否則可能為快取或估計值",
+                enum=["exact"],
+            ),
+            OpenApiParameter(
+                name="pagination",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="傳入 cursor 改用游標分頁（不計算總數）",
+                enum=["page", "cursor"],
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="游標分頁的位置，使用上一頁回傳的 next 連結",
+            ),
+            *sparse_fields_parameters(PostSerializer),
         ],
     )
     def get(self, request):
-        queryset = PostService.list_posts()
+        fields = sparse_fields(request.query_params, PostSerializer)
+        queryset = PostService.list_posts(
+            request.query_params, projection=projection_for(PostSerializer, fields)
+        )
         page = self.paginate_queryset(queryset)
-        serializer = PostSerializer(page, many=True, context={"request": request})
-        return self.get_paginated_response(serializer.data)
+        serializer = PostSerializer(
+            page, many=True, fields=fields, context={"request": request}
+        )
+        return self.get_paginated_response(render(serializer))
 
     @extend_schema(
         request=PostCreateSerializer,
@@ -96,11 +137,17 @@ class PostDetailView(GenericAPIView):
         },
         summary="查詢貼文",
         tags=["Posts"],
+        parameters=sparse_fields_parameters(PostSerializer),
     )
     def get(self, request, post_id=None):
-        post = PostService.get_post(post_id)
+        fields = sparse_fields(request.query_params, PostSerializer)
+        post = PostService.get_post(post_id, projection_for(PostSerializer, fields))
         return Response(
-            {"success": True, "message": "查詢成功", "data": PostSerializer(post).data}
+            {
+                "success": True,
+                "message": "查詢成功",
+                "data": render(PostSerializer(post, fields=fields)),
+            }
         )
 
     @extend_schema(
@@ -144,3 +191,47 @@ class PostDetailView(GenericAPIView):
     def delete(self, request, post_id=None):
         PostService.delete_post(post_id, request.user)
         return Response()
+
+
+class PostBulkUpdateView(GenericAPIView):
+    @extend_schema(
+        request=PostBulkUpdateSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次更新貼文",
+        tags=["Posts"],
+    )
+    def post(self, request):
+        serializer = PostBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = PostService.bulk_update_posts(
+            serializer.validated_data["ids"], request.user, request.data
+        )
+        return Response(
+            {"success": True, "message": "貼文批次更新成功", "data": {"count": count}}
+        )
+
+
+class PostBulkDeleteView(GenericAPIView):
+    @extend_schema(
+        request=BulkIdsSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次刪除貼文",
+        tags=["Posts"],
+    )
+    def post(self, request):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = PostService.bulk_delete_posts(
+            serializer.validated_data["ids"], request.user
+        )
+        return Response(
+            {"success": True, "message": "貼文批次刪除成功", "data": {"count": count}}
+        )
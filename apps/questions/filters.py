@@ -0,0 +1,21 @@
+from apps.questions.repository import QUESTION_ORDERINGS
+from apps.questions.serializers import QuestionListQuerySerializer
+from apps.tags.repository import QuestionTagRepository
+from core.app.base.filters import FilterPipeline
+
+
+class QuestionListFilter(FilterPipeline):
+    query_serializer_class = QuestionListQuerySerializer
+    filters = {
+        # 沿用原本只比對標題的關鍵字搜尋，不掃描 content 欄位
+        "keyword": "title__icontains",
+        "tags": "filter_tags",
+        "author": "author_id",
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lt",
+    }
+    orderings = QUESTION_ORDERINGS
+
+    @classmethod
+    def filter_tags(cls, queryset, value, params):
+        return QuestionTagRepository.filter(queryset, value, params["tag_match"])
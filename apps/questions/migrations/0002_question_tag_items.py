@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0001_initial"),
+        ("tags", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="tag_items",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="questions",
+                through="tags.QuestionTag",
+                to="tags.tag",
+            ),
+        ),
+    ]
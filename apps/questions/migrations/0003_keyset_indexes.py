@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0002_question_tag_items"),
+        ("tags", "0002_backfill_tags"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="question_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(fields=["-views", "-id"], name="question_views_id_idx"),
+        ),
+    ]
@@ -15,6 +15,17 @@ class Question(models.Model):
     views = models.IntegerField(default=0)
     likes = models.IntegerField(default=0)
     answer_count = models.IntegerField(default=0)
+    # tags 保留原始字串供顯示，篩選與計數以 tag_items 為準
+    tag_items = models.ManyToManyField(
+        "tags.Tag", through="tags.QuestionTag", related_name="questions", blank=True
+    )
+
+    class Meta:
+        # 游標分頁的兩種排序：latest 為 (created_at, id)、hot 為 (views, id)
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="question_created_id_idx"),
+            models.Index(fields=["-views", "-id"], name="question_views_id_idx"),
+        ]
 
     @classmethod
     def get_questions(cls, page, size, keyword, order_field, tags=None):
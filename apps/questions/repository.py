@@ -1,11 +1,62 @@
 from apps.questions.models import Question, QuestionLike
-from django.core.paginator import Paginator
+from apps.tags.repository import QuestionTagRepository
+from core.app.base.counting import CountStrategy
+from core.app.base.ownership import OwnershipPolicy
+from core.app.base.projection import apply_projection
+from django.db import transaction
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.utils import timezone
+
+
+QUESTION_ORDERINGS = {
+    "latest": ("-created_at", "-id"),
+    "oldest": ("created_at", "id"),
+    "hot": ("-views", "-id"),
+}
+
+
+class QuestionPolicy(OwnershipPolicy):
+    manage_permission = "question.moderate"
 
 
 class QuestionRepository:
     @staticmethod
-    def get_by_id(question_id):
-        return Question.objects.filter(id=question_id).first()
+    def get_by_id(question_id, projection=None, user=None):
+        questions = apply_projection(Question.objects.all(), projection, user)
+        return questions.filter(id=question_id).first()
+
+    @staticmethod
+    def exists(question_id):
+        return Question.objects.filter(id=question_id).exists()
+
+    @staticmethod
+    def get_manageable(user):
+        return QuestionPolicy.scope(Question.objects.all(), user)
+
+    @staticmethod
+    def get_manageable_by_id(question_id, user):
+        return QuestionRepository.get_manageable(user).filter(id=question_id).first()
+
+    @staticmethod
+    @transaction.atomic
+    def update_questions(user, question_ids, fields):
+        questions = QuestionRepository.get_manageable(user).filter(id__in=question_ids)
+        count = questions.update(updated_at=timezone.now(), **fields)
+        if count and "tags" in fields:
+            QuestionTagRepository.set_tags(
+                questions.values_list("id", flat=True), fields["tags"]
+            )
+        return count
+
+    @staticmethod
+    @transaction.atomic
+    def delete_questions(user, question_ids):
+        questions = QuestionRepository.get_manageable(user).filter(id__in=question_ids)
+        QuestionTagRepository.release(questions.values_list("id", flat=True))
+        _, deleted = questions.delete()
+        count = deleted.get(Question._meta.label, 0)
+        CountStrategy.adjust(Question, -count)
+        return count
 
     @staticmethod
     def toggle_like(question, user):
@@ -26,27 +77,42 @@ class QuestionRepository:
     def is_liked_by_user(question, user):
         return QuestionLike.objects.filter(user=user, question=question).exists()
 
+    @staticmethod
+    def liked_by(user):
+        """供 annotate 使用的「使用者是否按讚」，未登入一律為 False"""
+        if user is None or not user.is_authenticated:
+            return Value(False, output_field=BooleanField())
+        return Exists(QuestionLike.objects.filter(user=user, question=OuterRef("pk")))
+
     @staticmethod
     def increment_views(question):
         question.views += 1
         question.save()
 
     @staticmethod
-    def get_questions_with_filters(page=1, size=10, keyword=None, tags=None):
-        qs = Question.objects.all()
-        if keyword:
-            qs = qs.filter(title__icontains=keyword)
-        if tags:
-            qs = qs.filter(tags__icontains=tags)
-        paginator = Paginator(qs, size)
-        return paginator.get_page(page)
+    def get_list_queryset(projection=None, user=None):
+        """列表的基礎 queryset，篩選與排序交給 QuestionListFilter，分頁交給 view"""
+        return apply_projection(Question.objects.all(), projection, user)
+
+    @staticmethod
+    @transaction.atomic
+    def create_question(title, content, author, tags=""):
+        question = Question.objects.create(
+            title=title, content=content, author=author, tags=tags
+        )
+        QuestionTagRepository.set_tags([question.id], tags)
+        CountStrategy.adjust(Question, 1)
+        return question
 
     @staticmethod
+    @transaction.atomic
     def update_question(question, data, partial=False):
         for field, value in data.items():
             if hasattr(question, field):
                 setattr(question, field, value)
         question.save()
+        if "tags" in data:
+            QuestionTagRepository.set_tags([question.id], data["tags"])
         return question
 
     @staticmethod
@@ -1,9 +1,15 @@
 from rest_framework import serializers
 from apps.questions.models import Question, QuestionLike
-from core.app.base.serializer import SuccessSerializer
+from apps.questions.repository import QUESTION_ORDERINGS, QuestionRepository
+from core.app.base.serializer import (
+    BulkIdsSerializer,
+    ListQuerySerializer,
+    SparseFieldsMixin,
+    SuccessSerializer,
+)
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.CharField(source="author.username", read_only=True)
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
     is_liked = serializers.SerializerMethodField()
@@ -30,8 +36,12 @@ class QuestionSerializer(serializers.ModelSerializer):
             "likes",
             "answer_count",
         ]
+        # 列表與查詢時以 Exists 子查詢一併取得，不必每列查一次按讚紀錄
+        projection_annotations = {"is_liked": QuestionRepository.liked_by}
 
     def get_is_liked(self, obj):
+        if hasattr(obj, "is_liked"):
+            return obj.is_liked
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return QuestionLike.objects.filter(user=request.user, question=obj).exists()
@@ -56,6 +66,20 @@ class QuestionCreateSerializer(serializers.ModelSerializer):
     # 移除 create 方法，移到 service 層處理
 
 
+class QuestionBulkUpdateSerializer(BulkIdsSerializer):
+    title = serializers.CharField(required=False, help_text="標題")
+    content = serializers.CharField(required=False, help_text="內容")
+    tags = serializers.CharField(required=False, allow_blank=True, help_text="標籤")
+
+
+class QuestionListQuerySerializer(ListQuerySerializer):
+    sort = serializers.ChoiceField(
+        choices=list(QUESTION_ORDERINGS),
+        default="latest",
+        help_text="排序方式：latest 最新、oldest 最舊、hot 最多瀏覽",
+    )
+
+
 # 成功回應序列化器
 QuestionSuccessResponseSerializer = SuccessSerializer(
     QuestionSerializer(), "QuestionSuccessResponseSerializer"
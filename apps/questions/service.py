@@ -1,15 +1,15 @@
+from apps.questions.filters import QuestionListFilter
 from apps.questions.repository import QuestionRepository
 from apps.questions.serializers import QuestionCreateSerializer
-from rest_framework.exceptions import NotFound, PermissionDenied
-from .models import Question
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
 
 class QuestionService:
     repository_class = QuestionRepository
 
-    @staticmethod
-    def create_question(data, user):
-        question = Question.objects.create(
+    @classmethod
+    def create_question(cls, data, user):
+        question = cls.repository_class.create_question(
             title=data.get("title"),
             content=data.get("content"),
             author=user,
@@ -18,41 +18,57 @@ class QuestionService:
         return question
 
     @classmethod
-    def list_questions(cls, page=1, size=10, keyword=None, tags=None):
-        questions = cls.repository_class.get_questions_with_filters(
-            page, size, keyword, tags or ""
+    def list_questions(cls, params=None, projection=None, user=None):
+        filters = QuestionListFilter.validate(params or {})
+        return QuestionListFilter.apply(
+            cls.repository_class.get_list_queryset(projection, user), filters
         )
-        return questions
 
     @classmethod
-    def get_question(cls, question_id):
-        question = cls.repository_class.get_by_id(question_id)
+    def get_question(cls, question_id, projection=None, user=None):
+        question = cls.repository_class.get_by_id(question_id, projection, user)
         if not question:
             raise NotFound("問題不存在")
         return question
 
+    @classmethod
+    def _raise_unavailable(cls, question_id, message):
+        if cls.repository_class.exists(question_id):
+            raise PermissionDenied(message)
+        raise NotFound("問題不存在")
+
     @classmethod
     def update_question(cls, question_id, user, data, partial=False):
-        question = cls.repository_class.get_by_id(question_id)
+        question = cls.repository_class.get_manageable_by_id(question_id, user)
         if not question:
-            raise NotFound("問題不存在")
-        if question.author != user:
-            raise PermissionDenied("您沒有權限修改此問題")
+            cls._raise_unavailable(question_id, "您沒有權限修改此問題")
 
         question = cls.repository_class.update_question(question, data, partial=partial)
         return question
 
     @classmethod
     def delete_question(cls, question_id, user):
-        question = cls.repository_class.get_by_id(question_id)
-        if not question:
-            raise NotFound("問題不存在")
-        if question.author != user:
-            raise PermissionDenied("您沒有權限刪除此問題")
-
-        cls.repository_class.delete_question(question)
+        if not cls.repository_class.delete_questions(user, [question_id]):
+            cls._raise_unavailable(question_id, "您沒有權限刪除此問題")
         return True
 
+    @classmethod
+    def bulk_update_questions(cls, question_ids, user, data):
+        serializer = QuestionCreateSerializer(data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        fields = {
+            field: serializer.validated_data[field]
+            for field in ("title", "content", "tags")
+            if field in serializer.validated_data
+        }
+        if not fields:
+            raise ValidationError({"fields": ["沒有可批次更新的欄位"]})
+        return cls.repository_class.update_questions(user, question_ids, fields)
+
+    @classmethod
+    def bulk_delete_questions(cls, question_ids, user):
+        return cls.repository_class.delete_questions(user, question_ids)
+
     @classmethod
     def toggle_like(cls, question_id, user):
         question = cls.repository_class.get_by_id(question_id)
@@ -1,3 +1,187 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.answers.serializers import AnswerSerializer
+from apps.questions.models import Question, QuestionLike
+from apps.questions.repository import QuestionRepository
+from apps.questions.serializers import QuestionSerializer
+from core.app.base.counting import CountStrategy
+from core.app.base.lazyload import LazyLoadError, render
+from core.app.base.projection import apply_projection, projection_for
+
+User = get_user_model()
+
+
+class QuestionListFilterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(
+            email="alice@example.com", password="pw", nickname="alice"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", password="pw", nickname="bob"
+        )
+        self.old = QuestionRepository.create_question(
+            "Django ORM", "如何使用 select_related", self.alice, tags="django,orm"
+        )
+        self.new = QuestionRepository.create_question(
+            "Redis 快取", "快取失效策略", self.bob, tags="redis"
+        )
+        Question.objects.filter(id=self.old.id).update(
+            created_at=timezone.now() - timedelta(days=10), views=50
+        )
+        self.client = APIClient()
+        self.url = reverse("questions:question_list")
+
+    def ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.json()["data"]]
+
+    def test_filters_are_applied_in_sql(self):
+        """測試關鍵字、標籤、作者與日期區間都會套用到查詢"""
+        # Arrange
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        # Act & Assert
+        self.assertEqual(self.ids(keyword="orm"), [self.old.id])
+        self.assertEqual(self.ids(keyword="select_related"), [])
+        self.assertEqual(self.ids(tags="django,orm", tag_match="all"), [self.old.id])
+        self.assertEqual(self.ids(author=self.bob.id), [self.new.id])
+        self.assertEqual(self.ids(created_after=since), [self.new.id])
+
+    def test_sort_allowlist(self):
+        """測試排序只接受白名單中的值"""
+        # Act & Assert
+        self.assertEqual(self.ids(), [self.new.id, self.old.id])
+        self.assertEqual(self.ids(sort="hot"), [self.old.id, self.new.id])
+        response = self.client.get(self.url, {"sort": "title"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_date_range(self):
+        """測試結束時間早於開始時間時回傳 400"""
+        # Act
+        response = self.client.get(
+            self.url,
+            {"created_after": "2025-02-01T00:00:00", "created_before": "2025-01-01"},
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+
+class QuestionWithRelationsSerializer(QuestionSerializer):
+    tag_items = serializers.SlugRelatedField(
+        many=True, slug_field="name", read_only=True
+    )
+    answers = AnswerSerializer(many=True, read_only=True)
+
+    class Meta(QuestionSerializer.Meta):
+        fields = QuestionSerializer.Meta.fields + ["tag_items", "answers"]
+
+
+@override_settings(LAZY_LOAD_GUARD=True)
+class QuestionQueryPlanTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="plan@example.com", password="pw", nickname="plan"
+        )
+        for index in range(100):
+            QuestionRepository.create_question(f"q{index}", "c", self.user, tags="a,b")
+        self.liked = Question.objects.order_by("-id").first()
+        QuestionLike.objects.create(user=self.user, question=self.liked)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("questions:question_list")
+
+    def count_queries(self, size):
+        # 每次都重新計算總數，兩次請求的查詢組成才一致
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"size": size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), size)
+        return len(context.captured_queries), response.json()["data"]
+
+    def test_page_size_does_not_change_query_count(self):
+        """測試 100 筆的頁面與 5 筆的頁面查詢次數相同，is_liked 以 annotate 取得"""
+        # Act
+        small, _ = self.count_queries(5)
+        large, data = self.count_queries(100)
+
+        # Assert
+        self.assertEqual(small, large)
+        liked = {item["id"]: item["is_liked"] for item in data}
+        self.assertTrue(liked.pop(self.liked.id))
+        self.assertFalse(any(liked.values()))
+
+    def test_filtered_count_cache_shared_across_users(self):
+        """測試篩選後的總數快取鍵不含每位使用者不同的 is_liked 子查詢"""
+        # Arrange
+        other = User.objects.create_user(
+            email="other-plan@example.com", password="pw", nickname="other"
+        )
+        queryset = QuestionRepository.get_list_queryset(
+            projection_for(QuestionSerializer), self.user
+        ).filter(title__startswith="q1")
+        other_queryset = QuestionRepository.get_list_queryset(
+            projection_for(QuestionSerializer), other
+        ).filter(title__startswith="q1")
+
+        # Act & Assert
+        self.assertEqual(
+            CountStrategy.query_key(queryset.order_by("-id")),
+            CountStrategy.query_key(other_queryset),
+        )
+
+    def test_lazy_load_during_render_raises(self):
+        """測試未經查詢計畫的資料在序列化時讀取作者會拋出 LazyLoadError"""
+        # Arrange
+        questions = list(Question.objects.all()[:3])
+
+        # Act & Assert
+        with self.assertRaises(LazyLoadError):
+            render(QuestionSerializer(questions, many=True))
+
+    @override_settings(LAZY_LOAD_GUARD=False)
+    def test_guard_disabled_allows_lazy_load(self):
+        """測試關閉 LAZY_LOAD_GUARD 時延遲載入照常執行"""
+        # Arrange
+        questions = list(Question.objects.all()[:3])
+
+        # Act
+        data = render(QuestionSerializer(questions, many=True))
+
+        # Assert
+        self.assertEqual(len(data), 3)
+
+    def test_plan_prefetches_many_relations(self):
+        """測試多對多與反向外鍵欄位會被規劃成 prefetch_related"""
+        # Arrange
+        Answer.objects.create(content="a", author=self.user, question=self.liked)
+        projection = projection_for(QuestionWithRelationsSerializer)
+
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            questions = list(
+                apply_projection(Question.objects.all(), projection, self.user)
+            )
+            data = render(QuestionWithRelationsSerializer(questions, many=True))
+
+        # Assert
+        self.assertEqual(len(context.captured_queries), 3)
+        item = next(item for item in data if item["id"] == self.liked.id)
+        self.assertEqual(item["tag_items"], ["a", "b"])
+        self.assertEqual([answer["content"] for answer in item["answers"]], ["a"])
+        self.assertTrue(item["is_liked"])
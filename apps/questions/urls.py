@@ -1,5 +1,7 @@
 from django.urls import path
 from .views import (
+    QuestionBulkDeleteView,
+    QuestionBulkUpdateView,
     QuestionCreateListView,
     QuestionDetailView,
     QuestionLikeView,
@@ -11,6 +13,8 @@ app_name = "questions"
 
 urlpatterns = [
     path("", QuestionCreateListView.as_view(), name="question_list"),
+    path("bulk-update/", QuestionBulkUpdateView.as_view(), name="question_bulk_update"),
+    path("bulk-delete/", QuestionBulkDeleteView.as_view(), name="question_bulk_delete"),
     path("<int:question_id>/", QuestionDetailView.as_view(), name="question_detail"),
     path("<int:question_id>/answers/", AnswerListView.as_view(), name="answer_list"),
     path("<int:question_id>/like/", QuestionLikeView.as_view(), name="question_like"),
@@ -7,17 +7,31 @@ from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import OpenApiParameter
 
 from apps.questions.serializers import (
+    QuestionBulkUpdateSerializer,
     QuestionSerializer,
     QuestionCreateSerializer,
     QuestionSuccessResponseSerializer,
     QuestionListResponseSerializer,
+    QuestionListQuerySerializer,
 )
 from apps.questions.service import QuestionService
-from core.app.base.serializer import BaseErrorSerializer, DeleteSuccessSerializer
-from core.app.base.pagination import CustomPageNumberPagination
+from core.app.base.serializer import (
+    BaseErrorSerializer,
+    BulkIdsSerializer,
+    BulkResultResponseSerializer,
+    DeleteSuccessSerializer,
+    sparse_fields,
+    sparse_fields_parameters,
+)
+from core.app.base.lazyload import render
+from core.app.base.projection import projection_for
+from core.app.base.pagination import (
+    CustomPageNumberPagination,
+    SwitchablePaginationMixin,
+)
 
 
-class QuestionCreateListView(GenericAPIView):
+class QuestionCreateListView(SwitchablePaginationMixin, GenericAPIView):
     permission_classes = [AllowAny]
     parser_classes = (FormParser,)
     pagination_class = CustomPageNumberPagination
@@ -31,6 +45,7 @@ class QuestionCreateListView(GenericAPIView):
         summary="取得所有問題",
         tags=["Questions"],
         parameters=[
+            QuestionListQuerySerializer,
             OpenApiParameter(
                 name="page",
                 type=int,
@@ -45,13 +60,41 @@ class QuestionCreateListView(GenericAPIView):
                 description="每頁筆數",
                 default=10,
             ),
+            OpenApiParameter(
+                name="count",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="exact 時回傳精確總數，否則可能為快取或估計值",
+                enum=["exact"],
+            ),
+            OpenApiParameter(
+                name="pagination",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="傳入 cursor 改用游標分頁（不計算總數）",
+                enum=["page", "cursor"],
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="游標分頁的位置，使用上一頁回傳的 next 連結",
+            ),
+            *sparse_fields_parameters(QuestionSerializer),
         ],
     )
     def get(self, request):
-        queryset = QuestionService.list_questions()
+        fields = sparse_fields(request.query_params, QuestionSerializer)
+        queryset = QuestionService.list_questions(
+            request.query_params,
+            projection=projection_for(QuestionSerializer, fields),
+            user=request.user,
+        )
         page = self.paginate_queryset(queryset)
-        serializer = QuestionSerializer(page, many=True, context={"request": request})
-        return self.get_paginated_response(serializer.data)
+        serializer = QuestionSerializer(
+            page, many=True, fields=fields, context={"request": request}
+        )
+        return self.get_paginated_response(render(serializer))
 
     @extend_schema(
         request=QuestionCreateSerializer,
@@ -91,15 +134,18 @@ class QuestionDetailView(GenericAPIView):
         },
         summary="查詢問題",
         tags=["Questions"],
+        parameters=sparse_fields_parameters(QuestionSerializer),
     )
     def get(self, request, question_id=None):
-        question = QuestionService.get_question(question_id)
+        fields = sparse_fields(request.query_params, QuestionSerializer)
+        question = QuestionService.get_question(
+            question_id, projection_for(QuestionSerializer, fields), request.user
+        )
+        serializer = QuestionSerializer(
+            question, fields=fields, context={"request": request}
+        )
         return Response(
-            {
-                "success": True,
-                "message": "查詢成功",
-                "data": QuestionSerializer(question).data,
-            }
+            {"success": True, "message": "查詢成功", "data": render(serializer)}
         )
 
     @extend_schema(
@@ -185,3 +231,47 @@ class QuestionViewView(GenericAPIView):
                 "data": {"views": question.views},
             }
         )
+
+
+class QuestionBulkUpdateView(GenericAPIView):
+    @extend_schema(
+        request=QuestionBulkUpdateSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次更新問題",
+        tags=["Questions"],
+    )
+    def post(self, request):
+        serializer = QuestionBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = QuestionService.bulk_update_questions(
+            serializer.validated_data["ids"], request.user, request.data
+        )
+        return Response(
+            {"success": True, "message": "問題批次更新成功", "data": {"count": count}}
+        )
+
+
+class QuestionBulkDeleteView(GenericAPIView):
+    @extend_schema(
+        request=BulkIdsSerializer,
+        responses={
+            200: BulkResultResponseSerializer,
+            400: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次刪除問題",
+        tags=["Questions"],
+    )
+    def post(self, request):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = QuestionService.bulk_delete_questions(
+            serializer.validated_data["ids"], request.user
+        )
+        return Response(
+            {"success": True, "message": "問題批次刪除成功", "data": {"count": count}}
+        )
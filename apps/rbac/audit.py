@@ -0,0 +1,118 @@
+import atexit
+import logging
+import random
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger("django")
+
+
+class AuditBuffer:
+    """
+    RBAC 判定紀錄的環形緩衝區，由背景執行緒批次寫入資料庫。
+
+    緩衝區滿時直接丟棄新紀錄並計數，請求端永遠不會等待資料庫；
+    拒絕一律記錄，允許則依 allow_sample_rate 取樣。
+    """
+
+    def __init__(self, capacity, allow_sample_rate, batch_size, flush_interval):
+        self.capacity = capacity
+        self.allow_sample_rate = allow_sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {"recorded": 0, "sampled_out": 0, "dropped": 0, "flushed": 0}
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def record(self, user_id, method, path, route_name, allowed):
+        if allowed and random.random() >= self.allow_sample_rate:
+            with self._lock:
+                self.stats["sampled_out"] += 1
+            return False
+        with self._lock:
+            if len(self._records) >= self.capacity:
+                self.stats["dropped"] += 1
+                return False
+            self._records.append(
+                (user_id, method, path[:255], route_name or "", allowed, timezone.now())
+            )
+            self.stats["recorded"] += 1
+            pending = len(self._records)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _drain(self):
+        with self._lock:
+            count = min(len(self._records), self.batch_size)
+            return [self._records.popleft() for _ in range(count)]
+
+    def flush(self):
+        from apps.rbac.repositories import PermissionAuditLogRepository
+
+        flushed = 0
+        while True:
+            records = self._drain()
+            if not records:
+                return flushed
+            try:
+                PermissionAuditLogRepository.bulk_create(records)
+            except Exception:
+                # 寫入失敗的批次計入 dropped，不放回緩衝區以免記憶體無限成長
+                with self._lock:
+                    self.stats["dropped"] += len(records)
+                logger.exception("RBAC 稽核紀錄寫入失敗")
+                return flushed
+            flushed += len(records)
+            with self._lock:
+                self.stats["flushed"] += len(records)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="rbac-audit-flusher", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_audit_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                buffer = AuditBuffer(
+                    capacity=settings.RBAC_AUDIT_BUFFER_SIZE,
+                    allow_sample_rate=settings.RBAC_AUDIT_ALLOW_SAMPLE_RATE,
+                    batch_size=settings.RBAC_AUDIT_BATCH_SIZE,
+                    flush_interval=settings.RBAC_AUDIT_FLUSH_INTERVAL,
+                )
+                buffer.start()
+                _buffer = buffer
+    return _buffer
+
+
+def audit_decision(request, route_name, allowed):
+    if not settings.RBAC_AUDIT_ENABLED:
+        return
+    get_audit_buffer().record(
+        request.user.id, request.method, request.path, route_name, allowed
+    )
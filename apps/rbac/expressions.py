@@ -0,0 +1,47 @@
+from django.db.models import BooleanField, Func, JSONField
+
+
+class _JSONArrayFunc(Func):
+    """以單一 SQL 運算式處理「整數 JSON 陣列」欄位，讓 UPDATE 不必先讀出整個列"""
+
+    arity = 2
+
+    def _compile_args(self, compiler, connection):
+        array, value = self.get_source_expressions()
+        array_sql, array_params = compiler.compile(array)
+        value_sql, value_params = compiler.compile(value)
+        return array_sql, value_sql, (*array_params, *value_params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        array_sql, value_sql, params = self._compile_args(compiler, connection)
+        template = getattr(self, f"{connection.vendor}_template", None)
+        if template is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} 不支援資料庫 {connection.vendor}"
+            )
+        return template.format(array=array_sql, value=value_sql), params
+
+
+class JSONArrayAppend(_JSONArrayFunc):
+    output_field = JSONField()
+    postgresql_template = "({array} || jsonb_build_array({value}::integer))"
+    sqlite_template = "json_insert({array}, '$[#]', {value})"
+
+
+class JSONArrayRemove(_JSONArrayFunc):
+    output_field = JSONField()
+    postgresql_template = (
+        "(SELECT COALESCE(jsonb_agg(elem ORDER BY position), '[]'::jsonb) "
+        "FROM jsonb_array_elements({array}) WITH ORDINALITY AS t(elem, position) "
+        "WHERE elem <> to_jsonb({value}::integer))"
+    )
+    sqlite_template = (
+        "(SELECT json_group_array(value) FROM json_each({array}) "
+        "WHERE value <> {value})"
+    )
+
+
+class JSONArrayContains(_JSONArrayFunc):
+    output_field = BooleanField()
+    postgresql_template = "({array} @> jsonb_build_array({value}::integer))"
+    sqlite_template = "EXISTS(SELECT 1 FROM json_each({array}) WHERE value = {value})"
@@ -0,0 +1,69 @@
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger("django")
+
+INVALIDATION_CHANNEL = "rbac:invalidate"
+
+
+class LocalInvalidationBus:
+    """單一 process 內的失效通知，未設定 REDIS_URL 或測試時使用，同步呼叫訂閱者"""
+
+    def __init__(self):
+        self._handlers = []
+
+    def publish(self, message):
+        for handler in list(self._handlers):
+            handler(message)
+
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+
+
+class RedisInvalidationBus:
+    """
+    以 Redis pub/sub 廣播失效通知，每個 process 起一條背景執行緒接收。
+
+    斷線期間的訊息會遺失，因此每次（重新）訂閱成功時都先送出一次全域失效，
+    讓本機快取重新向共用快取驗證。
+    """
+
+    def __init__(self, url, channel=INVALIDATION_CHANNEL):
+        import redis
+
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        self._client.publish(self.channel, json.dumps(message))
+
+    def subscribe(self, handler):
+        thread = threading.Thread(
+            target=self._listen, args=(handler,), name="rbac-invalidation", daemon=True
+        )
+        thread.start()
+
+    def _listen(self, handler):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                handler({"scope": "global"})
+                for item in pubsub.listen():
+                    handler(json.loads(item["data"]))
+            except Exception:
+                logger.exception("RBAC 失效通知訂閱中斷，稍後重試")
+                handler({"scope": "global"})
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_invalidation_bus():
+    if settings.REDIS_URL:
+        return RedisInvalidationBus(settings.REDIS_URL)
+    return LocalInvalidationBus()
@@ -0,0 +1,117 @@
+import re
+
+_REGEX_CHARS = frozenset("\\.^$*+?{}[]|()")
+
+
+def to_mask(bit_indexes):
+    mask = 0
+    for bit_index in bit_indexes:
+        mask |= 1 << bit_index
+    return mask
+
+
+def iter_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class _Node:
+    __slots__ = ("literals", "patterns", "values", "mask")
+
+    def __init__(self):
+        self.literals = {}
+        self.patterns = []
+        self.values = []
+        self.mask = 0
+
+
+class PermissionMatcher:
+    """
+    以 HTTP method 分組的路徑片段 trie。
+
+    權限的 api_url 以 "/" 切成片段：不含正規表示式字元的片段走 dict 查找，
+    其餘片段編譯成 regex 後以 fullmatch 比對，因此一次比對只需走過路徑長度。
+    值為權限的 bit_index 時，match_mask 直接回傳可與使用者遮罩做 AND 的整數。
+    """
+
+    def __init__(self, permissions=()):
+        self._roots = {}
+        self._routes = {}
+        self.codes = {}
+        for value, api_url, method in permissions:
+            self.add(api_url, method, value)
+
+    @staticmethod
+    def _split(path):
+        return path.split("/")
+
+    def add(self, api_url, method, value):
+        if not api_url or not method:
+            return
+        node = self._roots.setdefault(method.upper(), _Node())
+        for segment in self._split(api_url):
+            if _REGEX_CHARS.isdisjoint(segment):
+                node = node.literals.setdefault(segment, _Node())
+                continue
+            for pattern, child in node.patterns:
+                if pattern.pattern == segment:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.patterns.append((re.compile(segment), child))
+                node = child
+        node.values.append(value)
+        node.mask |= 1 << value
+
+    def _terminals(self, path, method):
+        root = self._roots.get(method.upper())
+        if root is None:
+            return
+        segments = self._split(path)
+        depth_end = len(segments)
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == depth_end:
+                yield node
+                continue
+            segment = segments[depth]
+            child = node.literals.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1))
+            for pattern, child in node.patterns:
+                if pattern.fullmatch(segment):
+                    stack.append((child, depth + 1))
+
+    def add_route(self, route_name, method, mask):
+        key = (route_name, method.upper())
+        self._routes[key] = self._routes.get(key, 0) | mask
+
+    def match_route(self, route_name, method):
+        """回傳路由的權限遮罩；路由未登記時回傳 None，由呼叫端改用路徑比對"""
+        return self._routes.get((route_name, method.upper()))
+
+    def resolve_mask(self, path, method, route_name=None):
+        if route_name:
+            route_mask = self.match_route(route_name, method)
+            if route_mask is not None:
+                return route_mask
+        return self.match_mask(path, method)
+
+    def get_codes(self, mask):
+        return [self.codes[bit] for bit in iter_bits(mask) if bit in self.codes]
+
+    def match(self, path, method):
+        matched = []
+        for node in self._terminals(path, method):
+            matched.extend(node.values)
+        return matched
+
+    def match_mask(self, path, method):
+        mask = 0
+        for node in self._terminals(path, method):
+            mask |= node.mask
+        return mask
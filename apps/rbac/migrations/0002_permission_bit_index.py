@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:37
+
+from django.db import migrations, models
+
+
+def assign_bit_indexes(apps, schema_editor):
+    Permission = apps.get_model("rbac", "Permission")
+    permissions = list(Permission.objects.order_by("id"))
+    for index, permission in enumerate(permissions):
+        permission.bit_index = index
+    Permission.objects.bulk_update(permissions, ["bit_index"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="permission",
+            name="bit_index",
+            field=models.PositiveIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_bit_indexes, migrations.RunPython.noop),
+    ]
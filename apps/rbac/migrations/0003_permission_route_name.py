@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0002_permission_bit_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="permission",
+            name="route_name",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
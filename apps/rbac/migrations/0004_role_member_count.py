@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:45
+
+from django.db import migrations, models
+
+
+def backfill_member_counts(apps, schema_editor):
+    Role = apps.get_model("rbac", "Role")
+    roles = list(Role.objects.annotate(total=models.Count("users")))
+    for role in roles:
+        role.member_count = role.total
+    Role.objects.bulk_update(roles, ["member_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0003_permission_route_name"),
+        ("users", "0002_alter_user_options_user_permissions_user_roles_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="role",
+            name="member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_member_counts, migrations.RunPython.noop),
+    ]
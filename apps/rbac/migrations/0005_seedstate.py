@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0004_role_member_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeedState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_effective_permissions(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Permission = apps.get_model("rbac", "Permission")
+    UserEffectivePermission = apps.get_model("rbac", "UserEffectivePermission")
+    permission_ids = set(Permission.objects.values_list("id", flat=True))
+    user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(user_ids), 1000):
+        batch = user_ids[start : start + 1000]
+        pairs = set(
+            User.roles.through.objects.filter(
+                user_id__in=batch, role__permissions__isnull=False
+            ).values_list("user_id", "role__permissions")
+        )
+        overrides = User.objects.filter(id__in=batch).values_list(
+            "id", "enabled_permissions", "disabled_permissions"
+        )
+        for user_id, enabled, disabled in overrides:
+            pairs |= {(user_id, pid) for pid in enabled or [] if pid in permission_ids}
+            pairs -= {(user_id, pid) for pid in disabled or []}
+        UserEffectivePermission.objects.bulk_create(
+            [
+                UserEffectivePermission(user_id=user_id, permission_id=permission_id)
+                for user_id, permission_id in pairs
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0005_seedstate"),
+        ("users", "0002_alter_user_options_user_permissions_user_roles_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserEffectivePermission",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "permission",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="effective_users",
+                        to="rbac.permission",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="effective_permissions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "user_effective_permission",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("permission", "user"),
+                        name="unique_effective_permission",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_effective_permissions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0006_user_effective_permission"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PermissionAuditLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.CharField(max_length=255)),
+                ("route_name", models.CharField(blank=True, max_length=100)),
+                ("allowed", models.BooleanField()),
+                ("created_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="permission_audit_logs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "permission_audit_log",
+                "indexes": [
+                    models.Index(fields=["created_at"], name="perm_audit_created_idx"),
+                    models.Index(
+                        fields=["user", "created_at"], name="perm_audit_user_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
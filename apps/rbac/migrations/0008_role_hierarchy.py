@@ -0,0 +1,82 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_self_links(apps, schema_editor):
+    Role = apps.get_model("rbac", "Role")
+    RoleClosure = apps.get_model("rbac", "RoleClosure")
+    RoleClosure.objects.bulk_create(
+        [
+            RoleClosure(ancestor_id=role_id, descendant_id=role_id, depth=0)
+            for role_id in Role.objects.values_list("id", flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0007_permission_audit_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="role",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="children",
+                to="rbac.role",
+            ),
+        ),
+        migrations.CreateModel(
+            name="RoleClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="rbac.role",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="rbac.role",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "rbac_role_closure",
+                "indexes": [
+                    models.Index(
+                        fields=["ancestor", "descendant"], name="role_closure_anc_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("descendant", "ancestor"), name="unique_role_closure"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_self_links, migrations.RunPython.noop),
+    ]
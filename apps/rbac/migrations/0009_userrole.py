@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0008_role_hierarchy"),
+        ("users", "0002_alter_user_options_user_permissions_user_roles_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # users_user_roles 原為 User.roles 自動建立的中介表，只在 state 登記為模型，
+        # 資料表沿用，再加上 expires_at 欄位與部分索引
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="UserRole",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "role",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="grants",
+                                to="rbac.role",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="role_grants",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "users_user_roles",
+                        "unique_together": {("user", "role")},
+                    },
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="userrole",
+            name="expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(
+                condition=models.Q(("expires_at__isnull", False)),
+                fields=["expires_at"],
+                name="user_role_expires_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 
 
 class Permission(models.Model):
@@ -10,10 +11,23 @@ class Permission(models.Model):
     resource = models.CharField(max_length=50)
     category = models.CharField(max_length=50)
     api_url = models.CharField(max_length=255, blank=True)
+    route_name = models.CharField(max_length=100, blank=True)
     method = models.CharField(max_length=10, blank=True)
+    bit_index = models.PositiveIntegerField(unique=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        if self.bit_index is None:
+            self.bit_index = Permission.next_bit_index()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def next_bit_index(cls):
+        # 只往後配發，不回收已刪除權限的位元，避免舊快取誤授權
+        current = cls.objects.aggregate(models.Max("bit_index"))["bit_index__max"]
+        return 0 if current is None else current + 1
+
 
 class Role(models.Model):
     code = models.CharField(max_length=50, unique=True)
@@ -22,6 +36,14 @@ class Role(models.Model):
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     category = models.CharField(max_length=50, blank=True)
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     permissions = models.ManyToManyField(
@@ -33,6 +55,89 @@ class Role(models.Model):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_parent_id = instance.__dict__.get("parent_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # 階層異動時同步維護 RoleClosure，讀取端只需一次 JOIN
+        adding = self._state.adding
+        loaded_parent_id = getattr(self, "_loaded_parent_id", self.parent_id)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                RoleClosure.insert_node(self)
+            elif loaded_parent_id != self.parent_id:
+                RoleClosure.move_node(self)
+        self._loaded_parent_id = self.parent_id
+
+
+class RoleClosure(models.Model):
+    """角色階層的遞移閉包：每個角色對自己（depth 0）與每個祖先各有一列"""
+
+    ancestor = models.ForeignKey(
+        Role, on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        Role, on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "rbac_role_closure"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["descendant", "ancestor"], name="unique_role_closure"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["ancestor", "descendant"], name="role_closure_anc_idx")
+        ]
+
+    @classmethod
+    def insert_node(cls, role):
+        rows = [cls(ancestor_id=role.id, descendant_id=role.id, depth=0)]
+        if role.parent_id:
+            rows += [
+                cls(ancestor_id=ancestor_id, descendant_id=role.id, depth=depth + 1)
+                for ancestor_id, depth in cls.objects.filter(
+                    descendant_id=role.parent_id
+                ).values_list("ancestor_id", "depth")
+            ]
+        cls.objects.bulk_create(rows)
+
+    @classmethod
+    def move_node(cls, role):
+        subtree = list(
+            cls.objects.filter(ancestor_id=role.id).values_list(
+                "descendant_id", "depth"
+            )
+        )
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        if role.parent_id in subtree_ids:
+            raise ValueError("角色階層不可形成循環")
+        # 切斷子樹與原祖先的連結，再接到新上層角色的所有祖先之下
+        cls.objects.filter(descendant_id__in=subtree_ids).exclude(
+            ancestor_id__in=subtree_ids
+        ).delete()
+        if role.parent_id:
+            ancestors = cls.objects.filter(descendant_id=role.parent_id).values_list(
+                "ancestor_id", "depth"
+            )
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        ancestor_id=ancestor_id,
+                        descendant_id=descendant_id,
+                        depth=ancestor_depth + descendant_depth + 1,
+                    )
+                    for ancestor_id, ancestor_depth in ancestors
+                    for descendant_id, descendant_depth in subtree
+                ]
+            )
+
 
 class RolePermission(models.Model):
     role = models.ForeignKey(
@@ -51,3 +156,86 @@ class RolePermission(models.Model):
 
     def __str__(self):
         return f"{self.role.name} - {self.permission.name}"
+
+
+class UserRole(models.Model):
+    """使用者與角色的綁定；expires_at 為空表示永久，過期的綁定在讀取時忽略"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="role_grants"
+    )
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name="grants")
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "users_user_roles"
+        unique_together = ("user", "role")
+        indexes = [
+            # 只索引有期限的綁定，清除程式依到期時間找出過期列
+            models.Index(
+                fields=["expires_at"],
+                name="user_role_expires_idx",
+                condition=models.Q(expires_at__isnull=False),
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.role_id}"
+
+
+class UserEffectivePermission(models.Model):
+    """使用者有效權限的投影：角色權限 ∪ 個別啟用 − 個別停用，供反查權限持有者"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="effective_permissions",
+    )
+    permission = models.ForeignKey(
+        Permission, on_delete=models.CASCADE, related_name="effective_users"
+    )
+
+    class Meta:
+        db_table = "user_effective_permission"
+        constraints = [
+            # 以 permission 開頭，同時作為「誰持有權限 X」的反查索引
+            models.UniqueConstraint(
+                fields=["permission", "user"], name="unique_effective_permission"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.permission_id}"
+
+
+class PermissionAuditLog(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="permission_audit_logs",
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    route_name = models.CharField(max_length=100, blank=True)
+    allowed = models.BooleanField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "permission_audit_log"
+        indexes = [
+            models.Index(fields=["created_at"], name="perm_audit_created_idx"),
+            models.Index(fields=["user", "created_at"], name="perm_audit_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.method} {self.path} {self.allowed}"
+
+
+class SeedState(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.fingerprint[:12]})"
@@ -1,6 +1,7 @@
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import BasePermission
 
+from apps.rbac.audit import audit_decision
 from apps.rbac.services.user_permissions_service import UserPermissionService
 
 
@@ -8,12 +9,26 @@ class IsRBACAllowed(BasePermission):
     def has_permission(self, request, view):
         if not self._should_check_permission(request):
             return True
-        if not UserPermissionService.has_permission(
-            request.user, request.path, request.method
-        ):
+        route_name = self._get_route_name(request)
+        allowed = UserPermissionService.has_permission_from_token(
+            request.auth, request.path, request.method, route_name
+        )
+        if allowed is None:
+            allowed = UserPermissionService.has_permission(
+                request.user, request.path, request.method, route_name
+            )
+        audit_decision(request, route_name, allowed)
+        if not allowed:
             raise PermissionDenied("權限不足")
         return True
 
+    @staticmethod
+    def _get_route_name(request):
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None or not resolver_match.url_name:
+            return None
+        return resolver_match.view_name
+
     def _should_check_permission(self, request):
 
         if not request.user.is_authenticated:
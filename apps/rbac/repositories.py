@@ -1,8 +1,217 @@
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from core.app.base.projection import apply_projection
+
+from .expressions import JSONArrayAppend, JSONArrayContains, JSONArrayRemove
+from .invalidation import get_invalidation_bus
+from .matcher import PermissionMatcher, iter_bits, to_mask
+from .models import (
+    Permission,
+    PermissionAuditLog,
+    Role,
+    RoleClosure,
+    RolePermission,
+    UserEffectivePermission,
+    UserRole,
+)
+from .routes import get_api_routes
+
+
+class RBACVersionRepository:
+    """
+    RBAC 世代計數器：全域一個、每個角色一個、每個使用者一個，存在共用快取中。
+
+    使用者權限快取與 token 快照都記錄計算當下的計數器（stamp），讀取時比對，
+    任一計數器前進即視為過期，因此異動只需遞增對應計數器，不必掃描快取 key。
+    """
+
+    GLOBAL_VERSION_KEY = "rbac:gen:global"
+    # 權限或角色定義（不含成員）任何異動都會遞增，供角色權限矩陣的 ETag 使用
+    REVISION_KEY = "rbac:gen:revision"
+
+    @staticmethod
+    def role_version_key(role_id):
+        return f"rbac:gen:role:{role_id}"
+
+    @staticmethod
+    def user_version_key(user_id):
+        return f"rbac:gen:user:{user_id}"
+
+    @staticmethod
+    def _get_versions(keys):
+        versions = cache.get_many(keys)
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            # 以微秒時間戳初始化，快取被清除後重建的計數器不會與舊值重複
+            initial = time.time_ns() // 1000
+            for key in missing:
+                cache.add(key, initial, None)
+            versions.update(cache.get_many(missing))
+        return [versions[key] for key in keys]
+
+    @staticmethod
+    def _bump_versions(keys, message=None):
+        def bump():
+            for key in keys:
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.add(key, time.time_ns() // 1000, None)
+            # 先遞增再廣播，收到通知的 worker 回頭驗證時必定看到新計數器
+            if message is not None:
+                get_invalidation_bus().publish(message)
+
+        # 交易提交後才遞增，避免其他 worker 以新版本快取到舊資料
+        transaction.on_commit(bump)
+
+    @classmethod
+    def get_global_version(cls):
+        return cls._get_versions([cls.GLOBAL_VERSION_KEY])[0]
+
+    @classmethod
+    def bump_global_version(cls):
+        cls._bump_versions(
+            [cls.GLOBAL_VERSION_KEY, cls.REVISION_KEY], {"scope": "global"}
+        )
+
+    @classmethod
+    def bump_role_versions(cls, role_ids):
+        role_ids = list(role_ids)
+        keys = [cls.role_version_key(role_id) for role_id in role_ids]
+        cls._bump_versions(
+            keys + [cls.REVISION_KEY], {"scope": "role", "ids": role_ids}
+        )
+
+    @classmethod
+    def get_revision(cls):
+        return cls._get_versions([cls.REVISION_KEY])[0]
+
+    @classmethod
+    def bump_user_versions(cls, user_ids):
+        user_ids = list(user_ids)
+        cls._bump_versions(
+            [cls.user_version_key(user_id) for user_id in user_ids],
+            {"scope": "user", "ids": user_ids},
+        )
+
+    @classmethod
+    def get_user_versions(cls, user_id):
+        return cls._get_versions(
+            [cls.GLOBAL_VERSION_KEY, cls.user_version_key(user_id)]
+        )
+
+    @classmethod
+    def get_role_versions(cls, role_ids):
+        versions = cls._get_versions(
+            [cls.role_version_key(role_id) for role_id in role_ids]
+        )
+        return [[role_id, version] for role_id, version in zip(role_ids, versions)]
+
+    @classmethod
+    def is_current(cls, user_id, stamp):
+        global_version, user_version, role_versions = stamp
+        keys = [cls.GLOBAL_VERSION_KEY, cls.user_version_key(user_id)]
+        keys += [cls.role_version_key(role_id) for role_id, _ in role_versions]
+        expected = [global_version, user_version]
+        expected += [version for _, version in role_versions]
+        return cls._get_versions(keys) == expected
+
+
+_subscribe_lock = threading.Lock()
+_subscribed = False
+
+
+def ensure_local_cache_subscription():
+    global _subscribed
+    if _subscribed:
+        return
+    with _subscribe_lock:
+        if not _subscribed:
+            get_invalidation_bus().subscribe(invalidate_local_caches)
+            _subscribed = True
+
+
+def invalidate_local_caches(message):
+    PermissionMatcherRepository.invalidate_local(message)
+    UserPermissionRepository.invalidate_local(message)
+
+
+class PermissionMatcherRepository:
+    # (全域版本, 比對器, 上次向共用快取確認版本的時間)
+    _state = (None, None, 0.0)
+    _generation = 0
+    _lock = threading.Lock()
 
-from .models import Permission, Role, RolePermission
+    @classmethod
+    def get_matcher(cls):
+        ensure_local_cache_subscription()
+        cached_version, matcher, checked_at = cls._state
+        if (
+            matcher is not None
+            and time.monotonic() - checked_at < settings.RBAC_LOCAL_CACHE_TTL
+        ):
+            return matcher
+        generation = cls._generation
+        version = RBACVersionRepository.get_global_version()
+        with cls._lock:
+            cached_version, matcher, _ = cls._state
+            if cached_version != version or matcher is None:
+                matcher = cls.build_matcher()
+            # 建置期間收到失效通知時不更新確認時間，下次呼叫會再比對版本
+            checked_at = time.monotonic() if generation == cls._generation else 0.0
+            cls._state = (version, matcher, checked_at)
+        return matcher
+
+    @classmethod
+    def invalidate_local(cls, message):
+        if message.get("scope") != "global":
+            return
+        with cls._lock:
+            cls._generation += 1
+            cls._state = (None, None, 0.0)
+
+    @staticmethod
+    def build_matcher():
+        permissions = list(
+            Permission.objects.filter(
+                is_active=True, bit_index__isnull=False
+            ).values_list("bit_index", "api_url", "route_name", "method", "code")
+        )
+        matcher = PermissionMatcher(
+            (bit_index, api_url, method)
+            for bit_index, api_url, _, method, _ in permissions
+        )
+        matcher.codes = {permission[0]: permission[4] for permission in permissions}
+        # 以路由名稱綁定的權限，加上 api_url 能比對到路由範例路徑的權限
+        route_masks = {}
+        for bit_index, _, route_name, method, _ in permissions:
+            if route_name and method:
+                key = (route_name, method.upper())
+                route_masks[key] = route_masks.get(key, 0) | (1 << bit_index)
+        for route in get_api_routes():
+            for method in route.methods:
+                mask = route_masks.pop((route.name, method), 0)
+                mask |= matcher.match_mask(route.sample_path, method)
+                matcher.add_route(route.name, method, mask)
+        for (route_name, method), mask in route_masks.items():
+            matcher.add_route(route_name, method, mask)
+        return matcher
+
+    @classmethod
+    def match_mask(cls, api_url, method, route_name=None):
+        return cls.get_matcher().resolve_mask(api_url, method, route_name)
 
 
 class PermissionRepository:
@@ -13,29 +222,45 @@ class PermissionRepository:
         return cls.model_class.objects.get(id=permission_id)
 
     @classmethod
-    def get_active(cls):
-        return cls.model_class.objects.filter(is_active=True)
+    def get_active(cls, projection=None):
+        return apply_projection(
+            cls.model_class.objects.filter(is_active=True), projection
+        )
 
     @classmethod
     def create(cls, **kwargs):
-        return cls.model_class.objects.create(**kwargs)
+        permission = cls.model_class.objects.create(**kwargs)
+        RBACVersionRepository.bump_global_version()
+        return permission
 
     @classmethod
     def update(cls, permission, **kwargs):
         for key, value in kwargs.items():
             setattr(permission, key, value)
         permission.save()
+        RBACVersionRepository.bump_global_version()
         return permission
 
     @classmethod
     def delete(cls, permission):
         permission.delete()
+        RBACVersionRepository.bump_global_version()
+
+    @classmethod
+    def get_matrix_permissions(cls):
+        return (
+            cls.model_class.objects.filter(is_active=True)
+            .order_by("category", "bit_index")
+            .values("id", "code", "function_zh", "category", "bit_index")
+        )
 
     @classmethod
     def batch_update_permissions(cls, permission_ids, is_active):
-        return cls.model_class.objects.filter(id__in=permission_ids).update(
+        count = cls.model_class.objects.filter(id__in=permission_ids).update(
             is_active=is_active
         )
+        RBACVersionRepository.bump_global_version()
+        return count
 
 
 class RoleRepository:
@@ -46,23 +271,55 @@ class RoleRepository:
         return cls.model_class.objects.get(id=role_id)
 
     @classmethod
-    def get_active(cls):
-        return cls.model_class.objects.filter(is_active=True)
+    def get_active(cls, projection=None):
+        return apply_projection(
+            cls.model_class.objects.filter(is_active=True), projection
+        )
 
     @classmethod
     def create(cls, **kwargs):
-        return cls.model_class.objects.create(**kwargs)
+        role = cls.model_class.objects.create(**kwargs)
+        RBACVersionRepository.bump_role_versions([role.id])
+        return role
 
     @staticmethod
     def update(role, **kwargs):
+        parent_id = role.parent_id
         for key, value in kwargs.items():
             setattr(role, key, value)
         role.save()
+        if role.parent_id != parent_id:
+            RoleRepository.invalidate_roles([role.id])
+        else:
+            RBACVersionRepository.bump_role_versions([role.id])
         return role
 
     @staticmethod
+    @transaction.atomic
     def delete(role):
+        affected_ids = RoleClosureRepository.get_descendant_ids([role.id])
+        # 子角色改接到被刪除角色的上層，維持閉包一致
+        for child in Role.objects.filter(parent_id=role.id):
+            child.parent_id = role.parent_id
+            child.save()
+        member_ids = RoleRepository.get_member_ids(role)
         role.delete()
+        EffectivePermissionRepository.sync_roles(affected_ids - {role.id})
+        EffectivePermissionRepository.sync_users(member_ids)
+        RBACVersionRepository.bump_role_versions(affected_ids)
+
+    @staticmethod
+    def is_descendant(role_id, ancestor_id):
+        return RoleClosure.objects.filter(
+            ancestor_id=ancestor_id, descendant_id=role_id
+        ).exists()
+
+    @staticmethod
+    def invalidate_roles(role_ids):
+        """角色權限或階層異動時，只對該角色與其子孫角色重算投影並遞增計數器"""
+        affected_ids = RoleClosureRepository.get_descendant_ids(role_ids)
+        EffectivePermissionRepository.sync_roles(affected_ids)
+        RBACVersionRepository.bump_role_versions(affected_ids)
 
     @classmethod
     def set_role_permissions(cls, role_id, permission_ids):
@@ -71,8 +328,96 @@ class RoleRepository:
         if permission_ids:
             permissions = Permission.objects.filter(id__in=permission_ids)
             role.permissions.set(permissions)
+        cls.invalidate_roles([role.id])
         return role
 
+    @classmethod
+    def get_matrix_rows(cls):
+        # 經由閉包以 LEFT JOIN 一次取回角色與其（含繼承的）權限位元，
+        # 沒有權限的角色 bit_index 為 None
+        return (
+            cls.model_class.objects.filter(is_active=True)
+            .order_by("id")
+            .values_list(
+                "id",
+                "code",
+                "name_zh",
+                "ancestor_links__ancestor__permissions__bit_index",
+            )
+        )
+
+    @staticmethod
+    def get_member_ids(role, user_ids=None, active=False):
+        memberships = Role.users.through.objects.filter(role_id=role.id)
+        if user_ids is not None:
+            memberships = memberships.filter(user_id__in=user_ids)
+        if active:
+            # 過期但尚未被清除的綁定不算成員
+            memberships = memberships.filter(
+                Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+            )
+        return set(memberships.values_list("user_id", flat=True))
+
+    @staticmethod
+    @transaction.atomic
+    def apply_membership_diff(role, grant_ids, remove_ids, expires_at=None):
+        """
+        grant_ids 以 (user, role) upsert 寫入並更新 expires_at，可重新授予過期的綁定、
+        延長期限或改為永久；member_count 只計入原本沒有綁定列的使用者。
+        回傳新增的成員 ID。
+        """
+        through = Role.users.through
+        # 鎖定角色列，確保同時異動時 member_count 的增減值正確
+        Role.objects.select_for_update().filter(id=role.id).exists()
+        grant_ids = set(grant_ids)
+        added_ids = grant_ids - RoleRepository.get_member_ids(role, grant_ids)
+        if grant_ids:
+            through.objects.bulk_create(
+                [
+                    through(role_id=role.id, user_id=user_id, expires_at=expires_at)
+                    for user_id in grant_ids
+                ],
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["user", "role"],
+                update_fields=["expires_at"],
+            )
+        removed = 0
+        if remove_ids:
+            removed, _ = through.objects.filter(
+                role_id=role.id, user_id__in=remove_ids
+            ).delete()
+        if added_ids or removed:
+            Role.objects.filter(id=role.id).update(
+                member_count=F("member_count") + len(added_ids) - removed
+            )
+        affected_ids = grant_ids | set(remove_ids)
+        EffectivePermissionRepository.sync_users(affected_ids)
+        RBACVersionRepository.bump_user_versions(affected_ids)
+        return added_ids
+
+    @staticmethod
+    def get_members_page(role, after_id=None, size=10):
+        members = (
+            Role.users.through.objects.filter(role_id=role.id)
+            .order_by("user_id")
+            .values("user_id", "user__nickname", "user__email", "user__is_active")
+        )
+        if after_id is not None:
+            members = members.filter(user_id__gt=after_id)
+        rows = list(members[: size + 1])
+        users = [
+            {
+                "id": row["user_id"],
+                "nickname": row["user__nickname"],
+                "email": row["user__email"],
+                "is_active": row["user__is_active"],
+            }
+            for row in rows[:size]
+        ]
+        next_cursor = users[-1]["id"] if len(rows) > size else None
+        return users, next_cursor
+
 
 class RolePermissionRepository:
     model_class = RolePermission
@@ -89,45 +434,390 @@ class RolePermissionRepository:
             RolePermission(role=role, permission=permission)
             for permission in permissions
         ]
-        return cls.model_class.objects.bulk_create(role_permissions)
+        created = cls.model_class.objects.bulk_create(role_permissions)
+        RoleRepository.invalidate_roles([role.id])
+        return created
+
+
+class UserRoleRepository:
+    model_class = UserRole
+
+    @classmethod
+    def active_grants(cls):
+        return cls.model_class.objects.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        )
+
+    @classmethod
+    def get_active_grants(cls, user_id):
+        return list(
+            cls.active_grants()
+            .filter(user_id=user_id)
+            .values_list("role_id", "expires_at")
+        )
+
+    @classmethod
+    @transaction.atomic
+    def delete_expired(cls, now, limit):
+        """刪除一批已過期的綁定，回傳受影響的使用者 ID"""
+        grants = list(
+            cls.model_class.objects.select_for_update(skip_locked=True)
+            .filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", "user_id", "role_id")[:limit]
+        )
+        if not grants:
+            return set()
+        cls.model_class.objects.filter(id__in=[grant[0] for grant in grants]).delete()
+        for role_id, count in Counter(grant[2] for grant in grants).items():
+            Role.objects.filter(id=role_id).update(
+                member_count=Greatest(F("member_count") - count, 0)
+            )
+        user_ids = {grant[1] for grant in grants}
+        EffectivePermissionRepository.sync_users(user_ids)
+        cache.delete_many(
+            [UserPermissionRepository.cache_key(user_id) for user_id in user_ids]
+        )
+        RBACVersionRepository.bump_user_versions(user_ids)
+        return user_ids
+
+
+class RoleClosureRepository:
+    model_class = RoleClosure
+
+    @classmethod
+    def get_descendant_ids(cls, role_ids):
+        return set(
+            cls.model_class.objects.filter(ancestor_id__in=role_ids).values_list(
+                "descendant_id", flat=True
+            )
+        )
+
+    @classmethod
+    def create_self_links(cls, role_ids):
+        cls.model_class.objects.bulk_create(
+            [
+                cls.model_class(ancestor_id=role_id, descendant_id=role_id, depth=0)
+                for role_id in role_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class EffectivePermissionRepository:
+    """
+    維護 user_effective_permission 投影表，角色權限包含經由閉包繼承自上層角色的權限。
+
+    只重算受影響使用者的權限集合，與現有列比對後寫入差異，
+    呼叫端需與角色、成員或個別權限的異動放在同一個交易中。
+    """
+
+    model_class = UserEffectivePermission
+    batch_size = 1000
+
+    @classmethod
+    def sync_roles(cls, role_ids):
+        member_ids = Role.users.through.objects.filter(role_id__in=role_ids)
+        cls.sync_users(set(member_ids.values_list("user_id", flat=True)))
+
+    @classmethod
+    def sync_users(cls, user_ids):
+        user_ids = sorted(user_ids)
+        for start in range(0, len(user_ids), cls.batch_size):
+            cls._sync_batch(user_ids[start : start + cls.batch_size])
+
+    @classmethod
+    def _sync_batch(cls, user_ids):
+        desired = set(
+            UserRoleRepository.active_grants()
+            .filter(
+                user_id__in=user_ids,
+                role__ancestor_links__ancestor__permissions__isnull=False,
+            )
+            .values_list("user_id", "role__ancestor_links__ancestor__permissions")
+        )
+        overrides = list(
+            get_user_model()
+            .objects.filter(id__in=user_ids)
+            .values_list("id", "enabled_permissions", "disabled_permissions")
+        )
+        enabled_ids = {pid for _, enabled, _ in overrides for pid in enabled or []}
+        existing_ids = set(
+            Permission.objects.filter(id__in=enabled_ids).values_list("id", flat=True)
+        )
+        for user_id, enabled, disabled in overrides:
+            desired |= {(user_id, pid) for pid in enabled or [] if pid in existing_ids}
+            desired -= {(user_id, pid) for pid in disabled or []}
+
+        current = set(
+            cls.model_class.objects.filter(user_id__in=user_ids).values_list(
+                "user_id", "permission_id"
+            )
+        )
+        stale = current - desired
+        # 依權限分組刪除，撤銷角色權限時每個權限只需一個 user_id IN 條件
+        stale_users = defaultdict(list)
+        for user_id, permission_id in stale:
+            stale_users[permission_id].append(user_id)
+        for permission_id, stale_user_ids in stale_users.items():
+            cls.model_class.objects.filter(
+                permission_id=permission_id, user_id__in=stale_user_ids
+            ).delete()
+        cls.model_class.objects.bulk_create(
+            [
+                cls.model_class(user_id=user_id, permission_id=permission_id)
+                for user_id, permission_id in desired - current
+            ],
+            batch_size=cls.batch_size,
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def get_holders_page(cls, permission_id, after_id=None, size=10):
+        holders = (
+            cls.model_class.objects.filter(permission_id=permission_id)
+            .order_by("user_id")
+            .values("user_id", "user__nickname", "user__email", "user__is_active")
+        )
+        if after_id is not None:
+            holders = holders.filter(user_id__gt=after_id)
+        rows = list(holders[: size + 1])
+        users = [
+            {
+                "id": row["user_id"],
+                "nickname": row["user__nickname"],
+                "email": row["user__email"],
+                "is_active": row["user__is_active"],
+            }
+            for row in rows[:size]
+        ]
+        next_cursor = users[-1]["id"] if len(rows) > size else None
+        return users, next_cursor
 
 
 class UserPermissionRepository:
+    """
+    使用者權限遮罩的兩層快取：L1 為 process 內的 dict，L2 為共用快取。
+
+    L1 命中時不經網路；異動經失效通知（Redis pub/sub）廣播後各 worker 立即丟棄
+    對應的 L1 項目，RBAC_LOCAL_CACHE_TTL 則限制通知遺失時的最長延遲。
+    """
+
     model_class = get_user_model()
+    # user_id -> (到期的 monotonic 時間, (mask, stamp))
+    _local = {}
+    _local_generation = 0
+    _local_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"rbac:user_permissions:{user_id}"
+
+    @classmethod
+    def _get_local(cls, user_id):
+        item = cls._local.get(user_id)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return item[1]
+
+    @classmethod
+    def _set_local(cls, user_id, entry, generation):
+        ttl = settings.RBAC_LOCAL_CACHE_TTL
+        if entry[2] is not None:
+            ttl = min(ttl, entry[2] - time.time())
+        if ttl <= 0:
+            return
+        with cls._local_lock:
+            # 計算期間收到失效通知時不寫入，避免舊結果覆蓋剛清掉的項目
+            if generation == cls._local_generation:
+                cls._local[user_id] = (time.monotonic() + ttl, entry)
+
+    @classmethod
+    def invalidate_local(cls, message):
+        scope = message.get("scope")
+        ids = set(message.get("ids", []))
+        with cls._local_lock:
+            cls._local_generation += 1
+            if scope == "user":
+                for user_id in ids:
+                    cls._local.pop(user_id, None)
+            elif scope == "role":
+                cls._local = {
+                    user_id: item
+                    for user_id, item in cls._local.items()
+                    if ids.isdisjoint(role_id for role_id, _ in item[1][1][2])
+                }
+            else:
+                cls._local = {}
+
+    @classmethod
+    def get_user_permission_entry(cls, user):
+        ensure_local_cache_subscription()
+        entry = cls._get_local(user.id)
+        if entry is not None:
+            return entry
+        generation = cls._local_generation
+        entry = cls._get_shared_entry(user)
+        cls._set_local(user.id, entry, generation)
+        return entry
+
+    @staticmethod
+    def is_expired(expires_at):
+        return expires_at is not None and expires_at <= time.time()
+
+    @classmethod
+    def _get_shared_entry(cls, user):
+        """回傳 (mask, stamp, expires_at)，expires_at 為最早到期角色綁定的 epoch 秒數"""
+        cache_key = cls.cache_key(user.id)
+        entry = cache.get(cache_key)
+        # 舊格式 (mask, stamp) 的項目視為未命中
+        if (
+            entry is not None
+            and len(entry) == 3
+            and not cls.is_expired(entry[2])
+            and RBACVersionRepository.is_current(user.id, entry[1])
+        ):
+            return entry
+
+        # 先讀計數器再查資料庫，查詢期間若有異動，寫入的 stamp 必然已過期
+        global_version, user_version = RBACVersionRepository.get_user_versions(user.id)
+        grants = UserRoleRepository.get_active_grants(user.id)
+        role_ids = sorted(role_id for role_id, _ in grants)
+        expiries = [expires_at for _, expires_at in grants if expires_at is not None]
+        expires_at = min(expiries).timestamp() if expiries else None
+        role_versions = RBACVersionRepository.get_role_versions(role_ids)
+        # 遮罩不過濾 is_active，停用的權限由比對器排除，重新啟用時不必重算遮罩
+        bits = (
+            Permission.objects.filter(
+                Q(roles__descendant_links__descendant_id__in=role_ids)
+                | Q(id__in=user.enabled_permissions or [])
+            )
+            .exclude(id__in=user.disabled_permissions or [])
+            .filter(bit_index__isnull=False)
+            .values_list("bit_index", flat=True)
+            .distinct()
+        )
+        entry = (
+            to_mask(bits),
+            [global_version, user_version, role_versions],
+            expires_at,
+        )
+        # 快取在最早到期的角色綁定失效時一併過期，不必等待清除程式
+        timeout = 3600
+        if expires_at is not None:
+            timeout = max(1, min(timeout, math.ceil(expires_at - time.time())))
+        cache.set(cache_key, entry, timeout=timeout)
+        return entry
+
+    @classmethod
+    def get_user_permission_mask(cls, user):
+        return cls.get_user_permission_entry(user)[0]
 
     @classmethod
     def get_user_permissions(cls, user):
-        model_name = cls.model_class.__name__
-        cache_key = f"{model_name}_permissions:{user.id}"
-        cached_permissions = cache.get(cache_key)
-        if cached_permissions:
-            return Permission.objects.filter(id__in=cached_permissions)
-
-        role_permissions = Permission.objects.filter(
-            roles__users=user, is_active=True
-        ).distinct()
-        enabled_permissions = Permission.objects.filter(
-            id__in=user.enabled_permissions, is_active=True
-        )
-        all_permissions = set(role_permissions) | set(enabled_permissions)
-        if user.disabled_permissions:
-            all_permissions = [
-                p for p in all_permissions if p.id not in user.disabled_permissions
-            ]
-        cache.set(cache_key, [p.id for p in all_permissions], timeout=3600)
-        return Permission.objects.filter(id__in=[p.id for p in all_permissions])
+        return Permission.objects.filter(
+            bit_index__in=list(iter_bits(cls.get_user_permission_mask(user))),
+            is_active=True,
+        )
+
+    @classmethod
+    def add_permission_override(cls, user_ids, field, permission_id):
+        contains = JSONArrayContains(field, Value(permission_id))
+        users = cls.model_class.objects.filter(id__in=user_ids).exclude(contains)
+        return cls._update_overrides(
+            users, user_ids, field, JSONArrayAppend(field, Value(permission_id))
+        )
+
+    @classmethod
+    def remove_permission_override(cls, user_ids, field, permission_id):
+        contains = JSONArrayContains(field, Value(permission_id))
+        users = cls.model_class.objects.filter(id__in=user_ids).filter(contains)
+        return cls._update_overrides(
+            users, user_ids, field, JSONArrayRemove(field, Value(permission_id))
+        )
+
+    @classmethod
+    @transaction.atomic
+    def _update_overrides(cls, users, user_ids, field, expression):
+        # 單一 UPDATE 在資料庫端增刪陣列元素，WHERE 已排除不需變更的列，
+        # 不會覆寫其他欄位，也不會與同時進行的異動互相蓋掉
+        count = users.update(**{field: expression, "updated_at": timezone.now()})
+        if count:
+            EffectivePermissionRepository.sync_users(user_ids)
+            cache.delete_many([cls.cache_key(user_id) for user_id in user_ids])
+            RBACVersionRepository.bump_user_versions(user_ids)
+        return count
+
+    @classmethod
+    def refresh_user_permissions(cls, user_id):
+        EffectivePermissionRepository.sync_users([user_id])
+        cls.clear_user_permissions_cache(user_id)
+
+    @classmethod
+    def clear_user_permissions_cache(cls, user_id):
+        cache.delete(cls.cache_key(user_id))
+        RBACVersionRepository.bump_user_versions([user_id])
+
+    @classmethod
+    def get_token_claims(cls, user):
+        mask, stamp, expires_at = cls.get_user_permission_entry(user)
+        claims = {"rbac_mask": format(mask, "x"), "rbac_stamp": stamp}
+        if expires_at is not None:
+            claims["rbac_expires"] = expires_at
+        return claims
 
     @staticmethod
-    def clear_user_permissions_cache(user_id):
-        cache.delete(f"user_permissions:{user_id}")
+    def has_permission_from_claims(claims, api_url, method, route_name=None):
+        mask = claims.get("rbac_mask")
+        stamp = claims.get("rbac_stamp")
+        user_id = claims.get(api_settings.USER_ID_CLAIM)
+        if mask is None or stamp is None:
+            return None
+        if UserPermissionRepository.is_expired(claims.get("rbac_expires")):
+            return None
+        if not RBACVersionRepository.is_current(user_id, stamp):
+            return None
+        route_mask = PermissionMatcherRepository.match_mask(api_url, method, route_name)
+        return bool(int(mask, 16) & route_mask)
 
     @classmethod
-    def has_permission(cls, user, api_url, method):
+    def has_permission(cls, user, api_url, method, route_name=None):
         if user.is_superuser:
             return True
-        permissions = cls.get_user_permissions(user)
-        result = any(p.api_url == api_url and p.method == method for p in permissions)
-        return result
+        route_mask = PermissionMatcherRepository.match_mask(api_url, method, route_name)
+        if not route_mask:
+            return False
+        return bool(cls.get_user_permission_mask(user) & route_mask)
+
+    @classmethod
+    def check_permissions(cls, user, checks):
+        if user.is_superuser:
+            return [True] * len(checks)
+        mask = cls.get_user_permission_mask(user)
+        matcher = PermissionMatcherRepository.get_matcher()
+        return [
+            bool(
+                mask
+                & matcher.resolve_mask(
+                    check.get("path", ""), check["method"], check.get("route_name")
+                )
+            )
+            for check in checks
+        ]
+
+    @classmethod
+    def has_permission_code(cls, user, code):
+        if user.is_superuser:
+            return True
+        matcher = PermissionMatcherRepository.get_matcher()
+        return code in matcher.get_codes(cls.get_user_permission_mask(user))
+
+    @classmethod
+    def get_permission_codes(cls, user):
+        matcher = PermissionMatcherRepository.get_matcher()
+        if user.is_superuser:
+            return sorted(matcher.codes.values())
+        return sorted(matcher.get_codes(cls.get_user_permission_mask(user)))
 
 
 class UserRepository:
@@ -140,3 +830,29 @@ class UserRepository:
     @classmethod
     def get_users_by_role(cls, role):
         return cls.model_class.objects.filter(roles=role, is_active=True)
+
+    @classmethod
+    def get_existing_ids(cls, user_ids):
+        return set(
+            cls.model_class.objects.filter(id__in=user_ids).values_list("id", flat=True)
+        )
+
+
+class PermissionAuditLogRepository:
+    model_class = PermissionAuditLog
+
+    @classmethod
+    def bulk_create(cls, records):
+        return cls.model_class.objects.bulk_create(
+            [
+                cls.model_class(
+                    user_id=user_id,
+                    method=method,
+                    path=path,
+                    route_name=route_name,
+                    allowed=allowed,
+                    created_at=created_at,
+                )
+                for user_id, method, path, route_name, allowed, created_at in records
+            ]
+        )
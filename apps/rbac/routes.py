@@ -0,0 +1,64 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+_CONVERTER_RE = re.compile(r"<(?:(?P<converter>[^>:]+):)?(?P<parameter>[^>]+)>")
+_SAMPLE_VALUES = {
+    "int": "1",
+    "uuid": "00000000-0000-0000-0000-000000000000",
+}
+_IGNORED_METHODS = {"options", "head"}
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    sample_path: str
+    methods: tuple
+
+
+def _sample_segment(route):
+    def replace(match):
+        return _SAMPLE_VALUES.get(match.group("converter"), "sample")
+
+    return _CONVERTER_RE.sub(replace, route)
+
+
+def _view_methods(callback):
+    # DRF 的 as_view() 會在 callback 上掛 cls，一般 Django view 沒有
+    view_class = getattr(callback, "cls", None)
+    if view_class is None:
+        return ()
+    return tuple(
+        method.upper()
+        for method in view_class.http_method_names
+        if method not in _IGNORED_METHODS and hasattr(view_class, method)
+    )
+
+
+def _walk(patterns, prefix, namespaces):
+    for pattern in patterns:
+        route = _sample_segment(str(pattern.pattern))
+        if isinstance(pattern, URLResolver):
+            scope = (
+                namespaces + [pattern.namespace] if pattern.namespace else namespaces
+            )
+            yield from _walk(pattern.url_patterns, prefix + route, scope)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            methods = _view_methods(pattern.callback)
+            if methods:
+                name = ":".join(namespaces + [pattern.name])
+                yield Route(name, "/" + prefix + route, methods)
+
+
+@lru_cache(maxsize=1)
+def get_api_routes():
+    """
+    由 ROOT_URLCONF 列出所有具名的 DRF 路由與其支援的 HTTP method。
+
+    sample_path 以範例參數代入路由轉換器，供既有以 api_url 正規表示式
+    定義的權限在啟動時對應到路由名稱。
+    """
+    return tuple(_walk(get_resolver().url_patterns, "", []))
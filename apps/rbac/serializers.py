@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from .models import Permission, Role
 from django.contrib.auth import get_user_model
-from core.app.base.serializer import SuccessSerializer
+from django.utils import timezone
+from core.app.base.serializer import SparseFieldsMixin, SuccessSerializer
 
 User = get_user_model()
 
 
-class PermissionSerializer(serializers.ModelSerializer):
+class PermissionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Permission
         fields = [
@@ -19,6 +20,7 @@ class PermissionSerializer(serializers.ModelSerializer):
             "resource",
             "category",
             "api_url",
+            "route_name",
             "method",
             "created_at",
             "updated_at",
@@ -37,18 +39,45 @@ class PermissionSimpleSerializer(serializers.ModelSerializer):
         return obj.is_active
 
 
-class RoleSimpleSerializer(serializers.ModelSerializer):
+class RoleSimpleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ["id", "name_zh", "is_active"]
 
 
+class RoleCreateSerializer(serializers.ModelSerializer):
+    # 上層角色的存在與循環檢查由 RoleService 處理
+    parent_id = serializers.IntegerField(
+        required=False, allow_null=True, help_text="上層角色ID"
+    )
+    permissions = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        write_only=True,
+        help_text="權限ID列表",
+    )
+
+    class Meta:
+        model = Role
+        fields = [
+            "code",
+            "name",
+            "name_zh",
+            "description",
+            "is_active",
+            "category",
+            "parent_id",
+            "permissions",
+        ]
+
+
 class RoleDetailSerializer(serializers.ModelSerializer):
+    parent_id = serializers.IntegerField(read_only=True, allow_null=True)
     permission_groups = serializers.SerializerMethodField()
 
     class Meta:
         model = Role
-        fields = ["id", "code", "name_zh", "permission_groups"]
+        fields = ["id", "code", "name_zh", "parent_id", "permission_groups"]
 
     def get_permission_groups(self, obj):
         permissions = obj.permissions.all()
@@ -57,7 +86,33 @@ class RoleDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class RoleUserSerializer(serializers.Serializer):
+class RoleMatrixRoleSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    name_zh = serializers.CharField()
+    grants = serializers.CharField(
+        help_text="十六進位權限位元遮罩，第 n 位代表 bit_index 為 n 的權限"
+    )
+
+
+class RoleMatrixPermissionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    function_zh = serializers.CharField()
+    bit_index = serializers.IntegerField()
+
+
+class RoleMatrixPermissionGroupSerializer(serializers.Serializer):
+    category = serializers.CharField()
+    permissions = RoleMatrixPermissionSerializer(many=True)
+
+
+class RoleMatrixSerializer(serializers.Serializer):
+    roles = RoleMatrixRoleSerializer(many=True)
+    permission_groups = RoleMatrixPermissionGroupSerializer(many=True)
+
+
+class RoleUserSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.IntegerField()
     nickname = serializers.CharField()
     email = serializers.EmailField()
@@ -69,6 +124,27 @@ class RoleUsersDetailSerializer(serializers.Serializer):
     name_zh = serializers.CharField()
     total_user = serializers.IntegerField()
     users = RoleUserSerializer(many=True)
+    next_cursor = serializers.IntegerField(
+        allow_null=True, help_text="下一頁的 cursor，沒有下一頁時為 null"
+    )
+
+
+class PermissionUsersSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    users = RoleUserSerializer(
+        many=True, help_text="持有此權限的使用者（不含超級使用者）"
+    )
+    next_cursor = serializers.IntegerField(
+        allow_null=True, help_text="下一頁的 cursor，沒有下一頁時為 null"
+    )
+
+
+class RoleUsersQuerySerializer(serializers.Serializer):
+    cursor = serializers.IntegerField(required=False, min_value=0)
+    size = serializers.IntegerField(
+        required=False, default=10, min_value=1, max_value=100
+    )
 
 
 class RoleUsersUpdateSerializer(serializers.Serializer):
@@ -77,6 +153,64 @@ class RoleUsersUpdateSerializer(serializers.Serializer):
     )
 
 
+class RoleUsersBulkUpdateSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(
+        choices=["add", "remove", "replace"],
+        help_text="add 加入、remove 移除、replace 取代",
+    )
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(), help_text="使用者ID列表", allow_empty=True
+    )
+    expires_at = serializers.DateTimeField(
+        required=False,
+        allow_null=True,
+        help_text="新加入成員的到期時間，未提供表示永久",
+    )
+
+    def validate_expires_at(self, value):
+        if value is not None and value <= timezone.now():
+            raise serializers.ValidationError("到期時間必須晚於現在")
+        return value
+
+
+class RoleUsersBulkUpdateResultSerializer(serializers.Serializer):
+    added = serializers.IntegerField(help_text="新增的成員數")
+    removed = serializers.IntegerField(help_text="移除的成員數")
+
+
+class PermissionCheckItemSerializer(serializers.Serializer):
+    path = serializers.CharField(required=False, help_text="API 路徑")
+    route_name = serializers.CharField(
+        required=False, help_text="路由名稱，例如 posts:post_list"
+    )
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE"], help_text="HTTP method"
+    )
+
+    def validate(self, attrs):
+        if not attrs.get("path") and not attrs.get("route_name"):
+            raise serializers.ValidationError("path 與 route_name 至少需提供一項")
+        return attrs
+
+
+class PermissionCheckSerializer(serializers.Serializer):
+    checks = PermissionCheckItemSerializer(
+        many=True, max_length=200, help_text="要檢查的路徑或路由列表"
+    )
+
+
+class PermissionCheckResultSerializer(serializers.Serializer):
+    results = serializers.ListField(
+        child=serializers.BooleanField(), help_text="依輸入順序回傳是否允許"
+    )
+
+
+class MyPermissionCodesSerializer(serializers.Serializer):
+    codes = serializers.ListField(
+        child=serializers.CharField(), help_text="目前使用者的有效權限代碼"
+    )
+
+
 class PermissionBatchUpdateSerializer(serializers.Serializer):
     permission_ids = serializers.ListField(
         child=serializers.IntegerField(), help_text="權限ID列表", allow_empty=True
@@ -90,13 +224,31 @@ PermissionListResponseSerializer = SuccessSerializer(
 PermissionSuccessResponseSerializer = SuccessSerializer(
     PermissionSerializer(), "PermissionSuccessResponseSerializer"
 )
+PermissionUsersResponseSerializer = SuccessSerializer(
+    PermissionUsersSerializer(), "PermissionUsersResponseSerializer"
+)
 RoleListResponseSerializer = SuccessSerializer(
     serializers.SerializerMethodField(), "RoleListResponseSerializer"
 )
 RoleDetailResponseSerializer = SuccessSerializer(
     RoleDetailSerializer(), "RoleDetailResponseSerializer"
 )
+RoleMatrixResponseSerializer = SuccessSerializer(
+    RoleMatrixSerializer(), "RoleMatrixResponseSerializer"
+)
+RoleUsersDetailResponseSerializer = SuccessSerializer(
+    RoleUsersDetailSerializer(), "RoleUsersDetailResponseSerializer"
+)
 RoleUserListResponseSerializer = SuccessSerializer(
     RoleUserSerializer(many=True), "RoleUserListResponseSerializer"
 )
+RoleUsersBulkUpdateResponseSerializer = SuccessSerializer(
+    RoleUsersBulkUpdateResultSerializer(), "RoleUsersBulkUpdateResponseSerializer"
+)
+PermissionCheckResponseSerializer = SuccessSerializer(
+    PermissionCheckResultSerializer(), "PermissionCheckResponseSerializer"
+)
+MyPermissionCodesResponseSerializer = SuccessSerializer(
+    MyPermissionCodesSerializer(), "MyPermissionCodesResponseSerializer"
+)
 BaseSuccessResponseSerializer = SuccessSerializer(None, "BaseSuccessResponseSerializer")
@@ -1,14 +1,14 @@
-from apps.rbac.repositories import PermissionRepository
+from apps.rbac.repositories import EffectivePermissionRepository, PermissionRepository
 from django.db import IntegrityError
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 
 
 class PermissionService:
     repository_class = PermissionRepository
 
     @classmethod
-    def list_permissions(cls):
-        return cls.repository_class.get_active()
+    def list_permissions(cls, projection=None):
+        return cls.repository_class.get_active(projection)
 
     @classmethod
     def create_permission(cls, data):
@@ -34,3 +34,19 @@ class PermissionService:
     @classmethod
     def batch_update_permissions(cls, ids, is_active):
         return cls.repository_class.batch_update_permissions(ids, is_active)
+
+    @classmethod
+    def list_permission_users(cls, pk, cursor=None, size=10):
+        try:
+            permission = cls.repository_class.get_by_id(pk)
+        except cls.repository_class.model_class.DoesNotExist:
+            raise NotFound("權限不存在")
+        users, next_cursor = EffectivePermissionRepository.get_holders_page(
+            permission.id, cursor, size
+        )
+        return {
+            "id": permission.id,
+            "code": permission.code,
+            "users": users,
+            "next_cursor": next_cursor,
+        }
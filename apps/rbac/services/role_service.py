@@ -1,17 +1,35 @@
+from django.utils import timezone
 from rest_framework.exceptions import NotFound, ValidationError
-from apps.users.models import User
-from apps.rbac.repositories import RoleRepository, UserRepository
+from apps.rbac.repositories import (
+    PermissionRepository,
+    RBACVersionRepository,
+    RoleRepository,
+    UserRepository,
+    UserRoleRepository,
+)
 
 
 class RoleService:
     repository_class = RoleRepository
 
     @classmethod
-    def list_roles(cls):
-        return cls.repository_class.get_active()
+    def list_roles(cls, projection=None):
+        return cls.repository_class.get_active(projection)
+
+    @classmethod
+    def _validate_parent(cls, parent_id, role=None):
+        if parent_id is None:
+            return
+        try:
+            cls.repository_class.get_by_id(parent_id)
+        except cls.repository_class.model_class.DoesNotExist:
+            raise ValidationError({"parent_id": ["上層角色不存在"]})
+        if role is not None and cls.repository_class.is_descendant(parent_id, role.id):
+            raise ValidationError({"parent_id": ["不可將角色設為自身或子孫角色的下層"]})
 
     @classmethod
     def create_role(cls, data, permissions):
+        cls._validate_parent(data.get("parent_id"))
         role = cls.repository_class.create(**data)
         if permissions:
             cls.repository_class.set_role_permissions(role.id, permissions)
@@ -24,6 +42,7 @@ class RoleService:
     @classmethod
     def update_role(cls, pk, data, permissions):
         role = cls.repository_class.get_by_id(pk)
+        cls._validate_parent(data.get("parent_id"), role)
         cls.repository_class.update(role, **data)
         if permissions is not None:
             cls.repository_class.set_role_permissions(role.id, permissions)
@@ -45,16 +64,99 @@ class RoleService:
 
     @staticmethod
     def set_role_users(role_id, user_ids):
+        role, _, _ = RoleService.update_role_users(role_id, user_ids, "replace")
+        return role
+
+    @staticmethod
+    def update_role_users(role_id, user_ids, mode, expires_at=None):
         try:
             role = RoleRepository.get_by_id(role_id)
         except RoleRepository.model_class.DoesNotExist:
             raise NotFound("角色不存在")
-        valid_user_ids = [
-            uid for uid in user_ids if User.objects.filter(id=uid).exists()
-        ]
-        if len(valid_user_ids) != len(user_ids):
-            raise ValidationError(
-                {"invalid_ids": list(set(user_ids) - set(valid_user_ids))}
+        requested_ids = set(user_ids)
+        valid_ids = UserRepository.get_existing_ids(requested_ids)
+        if len(valid_ids) != len(requested_ids):
+            raise ValidationError({"invalid_ids": sorted(requested_ids - valid_ids)})
+
+        if mode == "replace":
+            current_ids = RoleRepository.get_member_ids(role)
+            # 過期但尚未清除的綁定需重新寫入，仍有效的成員維持原期限
+            grant_ids = requested_ids - RoleRepository.get_member_ids(
+                role, requested_ids, active=True
             )
-        role.users.set(valid_user_ids)
-        return role
+            remove_ids = current_ids - requested_ids
+        elif mode == "add":
+            # 已是成員者一併 upsert，以更新 expires_at
+            grant_ids = requested_ids
+            remove_ids = set()
+        elif mode == "remove":
+            grant_ids = set()
+            remove_ids = RoleRepository.get_member_ids(role, requested_ids)
+        else:
+            raise ValidationError({"mode": [f"不支援的模式: {mode}"]})
+
+        add_ids = RoleRepository.apply_membership_diff(
+            role, grant_ids, remove_ids, expires_at
+        )
+        return role, add_ids, remove_ids
+
+    @staticmethod
+    def list_role_users(role_id, cursor=None, size=10):
+        try:
+            role = RoleRepository.get_by_id(role_id)
+        except RoleRepository.model_class.DoesNotExist:
+            raise NotFound("角色不存在")
+        users, next_cursor = RoleRepository.get_members_page(role, cursor, size)
+        return {
+            "id": role.id,
+            "name_zh": role.name_zh,
+            "total_user": role.member_count,
+            "users": users,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def sweep_expired_grants(chunk_size=1000):
+        """分批刪除過期的角色綁定，回傳受影響的使用者數"""
+        now = timezone.now()
+        affected = set()
+        while True:
+            user_ids = UserRoleRepository.delete_expired(now, chunk_size)
+            if not user_ids:
+                return len(affected)
+            affected |= user_ids
+
+    @staticmethod
+    def get_role_matrix_etag():
+        return f'"rbac-matrix-{RBACVersionRepository.get_revision()}"'
+
+    @staticmethod
+    def get_role_matrix():
+        permission_groups = {}
+        for permission in PermissionRepository.get_matrix_permissions():
+            category = permission.pop("category")
+            permission_groups.setdefault(category, []).append(permission)
+
+        roles = {}
+        for role_id, code, name_zh, bit_index in RoleRepository.get_matrix_rows():
+            role = roles.setdefault(
+                role_id, {"id": role_id, "code": code, "name_zh": name_zh, "mask": 0}
+            )
+            if bit_index is not None:
+                role["mask"] |= 1 << bit_index
+
+        return {
+            "roles": [
+                {
+                    "id": role["id"],
+                    "code": role["code"],
+                    "name_zh": role["name_zh"],
+                    "grants": format(role["mask"], "x"),
+                }
+                for role in roles.values()
+            ],
+            "permission_groups": [
+                {"category": category, "permissions": permissions}
+                for category, permissions in permission_groups.items()
+            ],
+        }
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework.exceptions import ValidationError
 
 from apps.rbac.repositories import UserPermissionRepository
@@ -21,28 +22,101 @@ class UserPermissionService:
             raise ValidationError(f"清除用戶權限快取失敗: {str(e)}")
 
     @classmethod
-    def has_permission(cls, user, api_url, method):
+    def has_permission(cls, user, api_url, method, route_name=None):
         try:
-            return cls.repository_class.has_permission(user, api_url, method)
+            return cls.repository_class.has_permission(
+                user, api_url, method, route_name
+            )
         except Exception as e:
             raise ValidationError(f"檢查用戶權限失敗: {str(e)}")
 
+    @classmethod
+    def check_permissions(cls, user, checks):
+        try:
+            return cls.repository_class.check_permissions(user, checks)
+        except Exception as e:
+            raise ValidationError(f"批次檢查用戶權限失敗: {str(e)}")
+
+    @classmethod
+    def has_permission_code(cls, user, code):
+        try:
+            return cls.repository_class.has_permission_code(user, code)
+        except Exception as e:
+            raise ValidationError(f"檢查用戶權限失敗: {str(e)}")
+
+    @classmethod
+    def get_permission_codes(cls, user):
+        try:
+            return cls.repository_class.get_permission_codes(user)
+        except Exception as e:
+            raise ValidationError(f"獲取用戶權限代碼失敗: {str(e)}")
+
+    @classmethod
+    def get_token_claims(cls, user):
+        if not settings.RBAC_TOKEN_PERMISSIONS or user.is_superuser:
+            return {}
+        try:
+            return cls.repository_class.get_token_claims(user)
+        except Exception as e:
+            raise ValidationError(f"產生權限快照失敗: {str(e)}")
+
+    @classmethod
+    def has_permission_from_token(cls, token, api_url, method, route_name=None):
+        if not settings.RBAC_TOKEN_PERMISSIONS or token is None:
+            return None
+        try:
+            return cls.repository_class.has_permission_from_claims(
+                token, api_url, method, route_name
+            )
+        except Exception as e:
+            raise ValidationError(f"檢查權限快照失敗: {str(e)}")
+
     @classmethod
     def enable_permission(cls, user, permission_id):
         try:
-            if permission_id not in user.enabled_permissions:
-                user.enabled_permissions.append(permission_id)
-                user.save()
-                cls.repository_class.clear_user_permissions_cache(user.id)
+            cls.repository_class.add_permission_override(
+                [user.id], "enabled_permissions", permission_id
+            )
+            user.refresh_from_db(fields=["enabled_permissions"])
         except Exception as e:
             raise ValidationError(f"啟用用戶權限失敗: {str(e)}")
 
     @classmethod
     def disable_permission(cls, user, permission_id):
         try:
-            if permission_id not in user.disabled_permissions:
-                user.disabled_permissions.append(permission_id)
-                user.save()
-                cls.repository_class.clear_user_permissions_cache(user.id)
+            cls.repository_class.add_permission_override(
+                [user.id], "disabled_permissions", permission_id
+            )
+            user.refresh_from_db(fields=["disabled_permissions"])
         except Exception as e:
             raise ValidationError(f"停用用戶權限失敗: {str(e)}")
+
+    @classmethod
+    def bulk_enable_permission(cls, user_ids, permission_id):
+        try:
+            return cls.repository_class.add_permission_override(
+                user_ids, "enabled_permissions", permission_id
+            )
+        except Exception as e:
+            raise ValidationError(f"批次啟用用戶權限失敗: {str(e)}")
+
+    @classmethod
+    def bulk_disable_permission(cls, user_ids, permission_id):
+        try:
+            return cls.repository_class.add_permission_override(
+                user_ids, "disabled_permissions", permission_id
+            )
+        except Exception as e:
+            raise ValidationError(f"批次停用用戶權限失敗: {str(e)}")
+
+    @classmethod
+    def bulk_reset_permission(cls, user_ids, permission_id):
+        """移除使用者對此權限的個別啟用與停用，回到由角色決定"""
+        try:
+            return cls.repository_class.remove_permission_override(
+                user_ids, "enabled_permissions", permission_id
+            ) + cls.repository_class.remove_permission_override(
+                user_ids, "disabled_permissions", permission_id
+            )
+        except Exception as e:
+            raise ValidationError(f"批次重設用戶權限失敗: {str(e)}")
@@ -1,3 +1,1066 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+import threading
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.app.base.testing import find_select, selected_columns
+
+from .audit import AuditBuffer
+from .matcher import PermissionMatcher
+from .models import (
+    Permission,
+    PermissionAuditLog,
+    Role,
+    RoleClosure,
+    RolePermission,
+    UserEffectivePermission,
+    UserRole,
+)
+from .repositories import (
+    EffectivePermissionRepository,
+    PermissionRepository,
+    RBACVersionRepository,
+    RoleRepository,
+    UserPermissionRepository,
+    invalidate_local_caches,
+)
+from .services.role_service import RoleService
+from .services.user_permissions_service import UserPermissionService
+
+User = get_user_model()
+
+
+def clear_rbac_caches():
+    cache.clear()
+    invalidate_local_caches({"scope": "global"})
+
+
+class PermissionMatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.matcher = PermissionMatcher(
+            [
+                (1, r"/api/v1/posts/", "GET"),
+                (2, r"/api/v1/posts/\d+/", "GET"),
+                (3, r"/api/v1/posts/\d+/", "DELETE"),
+                (4, r"/api/v1/questions/\d+/like/", "POST"),
+            ]
+        )
+
+    def test_match_literal_path(self):
+        """測試完全相同的路徑比對"""
+        # Act
+        matched = self.matcher.match("/api/v1/posts/", "GET")
+
+        # Assert
+        self.assertEqual(matched, [1])
+
+    def test_match_regex_segment(self):
+        """測試含正規表示式片段的路徑比對"""
+        # Act
+        matched = self.matcher.match("/api/v1/posts/42/", "DELETE")
+
+        # Assert
+        self.assertEqual(matched, [3])
+
+    def test_no_match(self):
+        """測試 method、片段或長度不符時不比對"""
+        # Act & Assert
+        self.assertEqual(self.matcher.match("/api/v1/posts/42/", "POST"), [])
+        self.assertEqual(self.matcher.match("/api/v1/posts/abc/", "GET"), [])
+        self.assertEqual(self.matcher.match("/api/v1/posts/42/like/", "GET"), [])
+        self.assertEqual(self.matcher.match("/api/v1/posts", "GET"), [])
+
+
+class UserPermissionRepositoryTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        self.permission = Permission.objects.create(
+            code="post.delete",
+            name="Delete Post",
+            action="delete",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/\d+/",
+            method="DELETE",
+        )
+        self.role = Role.objects.create(code="editor", name="Editor")
+        self.role.permissions.add(self.permission)
+        self.user = User.objects.create_user(
+            email="rbac@example.com", password="pw", nickname="rbac"
+        )
+
+    def test_has_permission_by_role(self):
+        """測試透過角色取得的權限可通過路徑比對"""
+        # Arrange
+        self.user.roles.add(self.role)
+
+        # Act & Assert
+        self.assertTrue(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "GET"
+            )
+        )
+
+    def test_has_permission_without_role(self):
+        """測試未持有權限的使用者被拒絕"""
+        # Act & Assert
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+    def test_deactivated_permission_is_not_matched(self):
+        """測試停用權限後比對器重建，不再允許存取"""
+        # Arrange
+        self.user.roles.add(self.role)
+        UserPermissionRepository.has_permission(self.user, "/api/v1/posts/1/", "DELETE")
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            PermissionRepository.batch_update_permissions([self.permission.id], False)
+
+        # Assert
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+    def test_permission_mask_applies_overrides(self):
+        """測試遮罩套用個別啟用與停用的權限"""
+        # Arrange
+        extra = Permission.objects.create(
+            code="post.list",
+            name="List Posts",
+            action="list",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/",
+            method="GET",
+        )
+        self.user.roles.add(self.role)
+        self.user.enabled_permissions = [extra.id]
+        self.user.disabled_permissions = [self.permission.id]
+        self.user.save()
+
+        # Act
+        mask = UserPermissionRepository.get_user_permission_mask(self.user)
+
+        # Assert
+        self.assertEqual(mask, 1 << extra.bit_index)
+
+    def test_role_permission_change_invalidates_members(self):
+        """測試角色權限異動後，成員的權限快取隨角色計數器失效"""
+        # Arrange
+        self.user.roles.add(self.role)
+        self.assertTrue(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleRepository.set_role_permissions(self.role.id, [])
+
+        # Assert
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+    def test_role_membership_change_invalidates_added_users(self):
+        """測試加入角色的使用者，其權限快取立即失效"""
+        # Arrange
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleService.set_role_users(self.role.id, [self.user.id])
+
+        # Assert
+        self.assertTrue(
+            UserPermissionRepository.has_permission(
+                self.user, "/api/v1/posts/1/", "DELETE"
+            )
+        )
+
+    def test_has_permission_by_route_name(self):
+        """測試以路由名稱判斷權限，不依賴請求路徑"""
+        # Arrange
+        by_route = Permission.objects.create(
+            code="post.list",
+            name="List Posts",
+            action="list",
+            resource="posts",
+            category="posts",
+            route_name="posts:post_list",
+            method="GET",
+        )
+        self.role.permissions.add(by_route)
+        self.user.roles.add(self.role)
+
+        # Act & Assert
+        self.assertTrue(
+            UserPermissionRepository.has_permission(
+                self.user, "/any/prefix/posts/", "GET", "posts:post_list"
+            )
+        )
+        self.assertTrue(
+            UserPermissionRepository.has_permission(
+                self.user, "/any/prefix/posts/1/", "DELETE", "posts:post_detail"
+            )
+        )
+        self.assertFalse(
+            UserPermissionRepository.has_permission(
+                self.user, "/any/prefix/posts/1/", "GET", "posts:post_detail"
+            )
+        )
+
+    def test_check_permissions_in_one_pass(self):
+        """測試批次檢查只讀取一次使用者遮罩，並依輸入順序回傳結果"""
+        # Arrange
+        self.user.roles.add(self.role)
+        checks = [
+            {"path": "/api/v1/posts/1/", "method": "DELETE"},
+            {"path": "/api/v1/posts/1/", "method": "GET"},
+            {
+                "route_name": "unknown:route",
+                "path": "/api/v1/posts/2/",
+                "method": "DELETE",
+            },
+        ]
+        UserPermissionRepository.check_permissions(self.user, checks)
+
+        # Act
+        with self.assertNumQueries(0):
+            results = UserPermissionRepository.check_permissions(self.user, checks)
+
+        # Assert
+        self.assertEqual(results, [True, False, True])
+
+    def test_my_permission_codes_endpoint(self):
+        """測試持有 get-my-permissions 者可取得自己的有效權限代碼，未持有者回傳 403"""
+        # Arrange
+        self.role.permissions.add(
+            Permission.objects.create(
+                code="get-my-permissions",
+                name="Get My Permissions",
+                action="list",
+                resource="my-permissions",
+                category="rbac",
+                api_url=r"/api/v1/rbac/me/permissions/",
+                route_name="rbac:my-permissions",
+                method="GET",
+            )
+        )
+        clear_rbac_caches()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        denied = client.get(reverse("rbac:my-permissions"))
+        self.user.roles.add(self.role)
+        clear_rbac_caches()
+
+        # Act
+        response = client.get(reverse("rbac:my-permissions"))
+
+        # Assert
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"]["codes"], ["get-my-permissions", "post.delete"]
+        )
+
+    def test_local_cache_skips_shared_cache(self):
+        """測試 L1 命中時不讀取共用快取與資料庫"""
+        # Arrange
+        self.user.roles.add(self.role)
+        UserPermissionRepository.get_user_permission_mask(self.user)
+        cache.clear()
+
+        # Act
+        with self.assertNumQueries(0):
+            mask = UserPermissionRepository.get_user_permission_mask(self.user)
+
+        # Assert
+        self.assertEqual(mask, 1 << self.permission.bit_index)
+
+    def test_role_invalidation_drops_only_members(self):
+        """測試角色失效通知只丟棄持有該角色的使用者 L1 項目"""
+        # Arrange
+        other = User.objects.create_user(
+            email="other@example.com", password="pw", nickname="other"
+        )
+        self.user.roles.add(self.role)
+        UserPermissionRepository.get_user_permission_mask(self.user)
+        UserPermissionRepository.get_user_permission_mask(other)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleRepository.set_role_permissions(self.role.id, [])
+
+        # Assert
+        self.assertIsNone(UserPermissionRepository._get_local(self.user.id))
+        self.assertIsNotNone(UserPermissionRepository._get_local(other.id))
+
+
+class RoleHierarchyTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        self.permission = Permission.objects.create(
+            code="post.delete",
+            name="Delete Post",
+            action="delete",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/\d+/",
+            method="DELETE",
+        )
+        self.root = Role.objects.create(code="staff", name="Staff")
+        self.middle = Role.objects.create(
+            code="editor", name="Editor", parent=self.root
+        )
+        self.leaf = Role.objects.create(
+            code="intern", name="Intern", parent=self.middle
+        )
+        self.other = Role.objects.create(code="guest", name="Guest")
+        self.user = User.objects.create_user(
+            email="leaf@example.com", password="pw", nickname="leaf"
+        )
+        self.user.roles.add(self.leaf)
+
+    def can_delete(self):
+        return UserPermissionRepository.has_permission(
+            self.user, "/api/v1/posts/1/", "DELETE"
+        )
+
+    def test_descendant_inherits_ancestor_permissions(self):
+        """測試子孫角色經由閉包繼承上層角色的權限，並只對子孫角色失效"""
+        # Arrange
+        self.assertFalse(self.can_delete())
+        other_versions = RBACVersionRepository.get_role_versions([self.other.id])
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleRepository.set_role_permissions(self.root.id, [self.permission.id])
+
+        # Assert
+        self.assertTrue(self.can_delete())
+        self.assertEqual(
+            RBACVersionRepository.get_role_versions([self.other.id]), other_versions
+        )
+
+    def test_move_subtree_updates_closure(self):
+        """測試搬移子樹後，閉包只保留新的祖先"""
+        # Act
+        RoleRepository.update(self.middle, parent=self.other)
+
+        # Assert
+        self.assertEqual(
+            set(
+                RoleClosure.objects.filter(descendant=self.leaf).values_list(
+                    "ancestor__code", "depth"
+                )
+            ),
+            {("intern", 0), ("editor", 1), ("guest", 2)},
+        )
+
+    def test_cycle_is_rejected(self):
+        """測試不可將角色設為自己子孫角色的下層"""
+        # Act & Assert
+        with self.assertRaises(ValidationError):
+            RoleService.update_role(self.root.id, {"parent_id": self.leaf.id}, None)
+
+    def test_delete_reparents_children(self):
+        """測試刪除中間角色後，子角色改接到上層並保留繼承"""
+        # Arrange
+        RoleRepository.set_role_permissions(self.root.id, [self.permission.id])
+
+        # Act
+        RoleRepository.delete(self.middle)
+
+        # Assert
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.parent_id, self.root.id)
+        self.assertEqual(
+            UserEffectivePermission.objects.filter(user=self.user).count(), 1
+        )
+
+    def test_put_validates_parent_id(self):
+        """測試以 GET 回傳的內容更新角色時，parent_id 經過循環檢查，未宣告的欄位被忽略"""
+        # Arrange
+        admin = User.objects.create_user(
+            email="hierarchy-admin@example.com", password="pw", is_superuser=True
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = reverse("rbac:role-detail", args=[self.middle.id])
+        body = client.get(url).json()["data"]
+
+        # Act
+        round_trip = client.put(url, {**body, "parent": self.leaf.id}, format="json")
+        cycle = client.put(url, {**body, "parent_id": self.leaf.id}, format="json")
+
+        # Assert
+        self.middle.refresh_from_db()
+        self.assertEqual(body["parent_id"], self.root.id)
+        self.assertEqual(round_trip.status_code, 200)
+        self.assertEqual(round_trip.json()["data"]["parent_id"], self.root.id)
+        self.assertEqual(cycle.status_code, 400)
+        self.assertEqual(self.middle.parent_id, self.root.id)
+
+
+class TimeBoundRoleGrantTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        permission = Permission.objects.create(
+            code="post.delete",
+            name="Delete Post",
+            action="delete",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/\d+/",
+            method="DELETE",
+        )
+        self.role = Role.objects.create(code="on-call", name="On Call")
+        self.role.permissions.add(permission)
+        self.user = User.objects.create_user(
+            email="oncall@example.com", password="pw", nickname="oncall"
+        )
+
+    def can_delete(self):
+        return UserPermissionRepository.has_permission(
+            self.user, "/api/v1/posts/1/", "DELETE"
+        )
+
+    def test_expired_grant_is_ignored(self):
+        """測試過期的角色綁定在讀取時即被忽略，快取隨最早到期時間失效"""
+        # Arrange
+        RoleService.update_role_users(
+            self.role.id,
+            [self.user.id],
+            "add",
+            timezone.now() + timedelta(hours=1),
+        )
+        self.assertTrue(self.can_delete())
+        _, _, expires_at = UserPermissionRepository.get_user_permission_entry(self.user)
+
+        # Act
+        UserRole.objects.filter(user=self.user).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        clear_rbac_caches()
+
+        # Assert
+        self.assertIsNotNone(expires_at)
+        self.assertFalse(self.can_delete())
+
+    def test_sweeper_deletes_only_expired(self):
+        """測試清除程式只刪除過期綁定，並更新成員數與投影"""
+        # Arrange
+        other = User.objects.create_user(
+            email="permanent@example.com", password="pw", nickname="permanent"
+        )
+        RoleService.update_role_users(self.role.id, [other.id], "add")
+        RoleService.update_role_users(
+            self.role.id, [self.user.id], "add", timezone.now() + timedelta(hours=1)
+        )
+        UserRole.objects.filter(user=self.user).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            affected = RoleService.sweep_expired_grants(chunk_size=1)
+
+        # Assert
+        self.role.refresh_from_db()
+        self.assertEqual(affected, 1)
+        self.assertEqual(RoleRepository.get_member_ids(self.role), {other.id})
+        self.assertEqual(self.role.member_count, 1)
+        self.assertFalse(
+            UserEffectivePermission.objects.filter(user=self.user).exists()
+        )
+
+    def test_regrant_expired_unswept_grant(self):
+        """測試重新授予已過期但尚未清除的綁定時更新期限並恢復權限，成員數不變"""
+        # Arrange
+        RoleService.update_role_users(
+            self.role.id, [self.user.id], "add", timezone.now() + timedelta(hours=1)
+        )
+        UserRole.objects.filter(user=self.user).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        clear_rbac_caches()
+        self.assertFalse(self.can_delete())
+        expires_at = timezone.now() + timedelta(days=1)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            _, added, _ = RoleService.update_role_users(
+                self.role.id, [self.user.id], "add", expires_at
+            )
+
+        # Assert
+        self.role.refresh_from_db()
+        self.assertEqual(added, set())
+        self.assertEqual(UserRole.objects.get(user=self.user).expires_at, expires_at)
+        self.assertEqual(self.role.member_count, 1)
+        self.assertTrue(self.can_delete())
+        self.assertTrue(UserEffectivePermission.objects.filter(user=self.user).exists())
+
+    def test_extend_active_grant(self):
+        """測試對仍有效的綁定再次授予可延長期限，或改為永久"""
+        # Arrange
+        RoleService.update_role_users(
+            self.role.id, [self.user.id], "add", timezone.now() + timedelta(hours=1)
+        )
+        extended = timezone.now() + timedelta(days=7)
+
+        # Act
+        RoleService.update_role_users(self.role.id, [self.user.id], "add", extended)
+        extended_at = UserRole.objects.get(user=self.user).expires_at
+        RoleService.update_role_users(self.role.id, [self.user.id], "add")
+
+        # Assert
+        self.role.refresh_from_db()
+        self.assertEqual(extended_at, extended)
+        self.assertIsNone(UserRole.objects.get(user=self.user).expires_at)
+        self.assertEqual(self.role.member_count, 1)
+        _, _, expires_at = UserPermissionRepository.get_user_permission_entry(self.user)
+        self.assertIsNone(expires_at)
+
+
+class RoleMembershipServiceTest(TestCase):
+    def setUp(self):
+        self.role = Role.objects.create(code="member", name="Member")
+        self.users = [
+            User.objects.create_user(
+                email=f"member{i}@example.com", password="pw", nickname=f"m{i}"
+            )
+            for i in range(3)
+        ]
+        self.role.users.add(self.users[0])
+
+    def test_add_and_remove_apply_only_diff(self):
+        """測試 add/remove 模式只套用差異"""
+        # Act
+        _, added, _ = RoleService.update_role_users(
+            self.role.id, [self.users[0].id, self.users[1].id], "add"
+        )
+        _, _, removed = RoleService.update_role_users(
+            self.role.id, [self.users[0].id, self.users[2].id], "remove"
+        )
+
+        # Assert
+        self.assertEqual(added, {self.users[1].id})
+        self.assertEqual(removed, {self.users[0].id})
+        self.assertEqual(RoleRepository.get_member_ids(self.role), {self.users[1].id})
+
+    def test_replace_validates_ids_in_one_query(self):
+        """測試 replace 模式以單一查詢驗證 ID，並回報不存在的 ID"""
+        # Act & Assert
+        with self.assertNumQueries(2):
+            with self.assertRaises(ValidationError) as context:
+                RoleService.update_role_users(
+                    self.role.id, [self.users[1].id, 999999], "replace"
+                )
+        self.assertEqual(context.exception.detail["invalid_ids"], ["999999"])
+
+    def test_member_count_and_keyset_page(self):
+        """測試成員數隨異動增減，且成員列表依使用者 ID 以 cursor 分頁"""
+        # Arrange
+        Role.objects.filter(id=self.role.id).update(member_count=1)
+
+        # Act
+        RoleService.update_role_users(
+            self.role.id, [user.id for user in self.users], "add"
+        )
+        first_page = RoleService.list_role_users(self.role.id, size=2)
+        second_page = RoleService.list_role_users(
+            self.role.id, first_page["next_cursor"], size=2
+        )
+
+        # Assert
+        self.assertEqual(first_page["total_user"], 3)
+        self.assertEqual(
+            [user["id"] for user in first_page["users"] + second_page["users"]],
+            [user.id for user in self.users],
+        )
+        self.assertIsNone(second_page["next_cursor"])
+
+
+class EffectivePermissionProjectionTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        self.permissions = [
+            Permission.objects.create(
+                code=f"perm-{i}",
+                name=f"Perm {i}",
+                action="get",
+                resource="items",
+                category="items",
+                method="GET",
+            )
+            for i in range(2)
+        ]
+        self.role = Role.objects.create(code="reviewer", name="Reviewer")
+        self.role.permissions.add(self.permissions[0])
+        self.users = [
+            User.objects.create_user(
+                email=f"holder{i}@example.com", password="pw", nickname=f"h{i}"
+            )
+            for i in range(3)
+        ]
+
+    def holders(self, permission):
+        return set(
+            UserEffectivePermission.objects.filter(permission=permission).values_list(
+                "user_id", flat=True
+            )
+        )
+
+    def test_projection_follows_membership_and_overrides(self):
+        """測試投影表隨角色成員、角色權限與個別權限增量更新"""
+        # Act
+        RoleService.update_role_users(
+            self.role.id, [self.users[0].id, self.users[1].id], "add"
+        )
+        UserPermissionService.disable_permission(self.users[1], self.permissions[0].id)
+        UserPermissionService.enable_permission(self.users[2], self.permissions[1].id)
+        RoleRepository.set_role_permissions(
+            self.role.id, [self.permissions[0].id, self.permissions[1].id]
+        )
+
+        # Assert
+        self.assertEqual(self.holders(self.permissions[0]), {self.users[0].id})
+        self.assertEqual(
+            self.holders(self.permissions[1]),
+            {user.id for user in self.users},
+        )
+
+    def test_holders_page_in_one_query(self):
+        """測試反查持有者以單一查詢依使用者 ID 分頁"""
+        # Arrange
+        RoleService.update_role_users(
+            self.role.id, [user.id for user in self.users], "add"
+        )
+
+        # Act
+        with self.assertNumQueries(1):
+            users, next_cursor = EffectivePermissionRepository.get_holders_page(
+                self.permissions[0].id, size=2
+            )
+
+        # Assert
+        self.assertEqual(
+            [user["id"] for user in users], [self.users[0].id, self.users[1].id]
+        )
+        self.assertEqual(next_cursor, self.users[1].id)
+
+    def test_bulk_override_is_deduplicated(self):
+        """測試批次個別權限以單一 UPDATE 套用，已持有的使用者不重複加入"""
+        # Arrange
+        UserPermissionService.enable_permission(self.users[0], self.permissions[1].id)
+        User.objects.filter(id=self.users[1].id).update(nickname="renamed")
+        user_ids = [user.id for user in self.users]
+
+        # Act
+        updated = UserPermissionService.bulk_enable_permission(
+            user_ids, self.permissions[1].id
+        )
+
+        # Assert
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            list(
+                User.objects.filter(id__in=user_ids)
+                .order_by("id")
+                .values_list("enabled_permissions", flat=True)
+            ),
+            [[self.permissions[1].id]] * 3,
+        )
+        self.assertEqual(User.objects.get(id=self.users[1].id).nickname, "renamed")
+        self.assertEqual(self.holders(self.permissions[1]), set(user_ids))
+
+    def test_bulk_reset_removes_overrides(self):
+        """測試批次重設只移除指定權限，保留其他個別權限"""
+        # Arrange
+        UserPermissionService.enable_permission(self.users[0], self.permissions[0].id)
+        UserPermissionService.enable_permission(self.users[0], self.permissions[1].id)
+        UserPermissionService.disable_permission(self.users[1], self.permissions[1].id)
+
+        # Act
+        updated = UserPermissionService.bulk_reset_permission(
+            [self.users[0].id, self.users[1].id], self.permissions[1].id
+        )
+
+        # Assert
+        self.users[0].refresh_from_db()
+        self.users[1].refresh_from_db()
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.users[0].enabled_permissions, [self.permissions[0].id])
+        self.assertEqual(self.users[1].disabled_permissions, [])
+        self.assertEqual(self.holders(self.permissions[1]), set())
+
+    def test_revoke_deletes_per_permission(self):
+        """測試撤銷角色權限時，每個權限只以一個 user_id IN 條件刪除投影列"""
+        # Arrange
+        RoleService.update_role_users(
+            self.role.id, [user.id for user in self.users], "add"
+        )
+
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            RoleRepository.set_role_permissions(self.role.id, [])
+
+        # Assert
+        deletes = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('DELETE FROM "user_effective_permission"')
+        ]
+        self.assertEqual(len(deletes), 1)
+        self.assertNotIn(" OR ", deletes[0])
+        self.assertEqual(self.holders(self.permissions[0]), set())
+
+    def test_role_delete_removes_projection(self):
+        """測試刪除角色後，成員經由該角色取得的投影列一併移除"""
+        # Arrange
+        RoleService.update_role_users(self.role.id, [self.users[0].id], "add")
+
+        # Act
+        RoleRepository.delete(self.role)
+
+        # Assert
+        self.assertEqual(self.holders(self.permissions[0]), set())
+
+
+class RoleMatrixTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        self.permissions = [
+            Permission.objects.create(
+                code=f"perm-{i}",
+                name=f"Perm {i}",
+                action="get",
+                resource="items",
+                category=category,
+                method="GET",
+            )
+            for i, category in enumerate(["posts", "posts", "rbac"])
+        ]
+        self.editor = Role.objects.create(code="editor", name="Editor")
+        self.editor.permissions.add(self.permissions[0], self.permissions[2])
+        Role.objects.create(code="guest", name="Guest")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="pw", is_superuser=True
+        )
+
+    def test_matrix_in_two_queries(self):
+        """測試矩陣以兩次查詢組出角色與分類後的權限"""
+        # Act
+        with self.assertNumQueries(2):
+            matrix = RoleService.get_role_matrix()
+
+        # Assert
+        grants = {role["code"]: role["grants"] for role in matrix["roles"]}
+        expected = (1 << self.permissions[0].bit_index) | (
+            1 << self.permissions[2].bit_index
+        )
+        self.assertEqual(grants, {"editor": format(expected, "x"), "guest": "0"})
+        self.assertEqual(
+            [group["category"] for group in matrix["permission_groups"]],
+            ["posts", "rbac"],
+        )
+
+    def test_matrix_etag_not_modified(self):
+        """測試 ETag 未變時回傳 304，角色權限異動後 ETag 改變"""
+        # Arrange
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        url = reverse("rbac:role-matrix")
+        etag = client.get(url)["ETag"]
+
+        # Act
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleRepository.set_role_permissions(self.editor.id, [])
+        modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(modified.status_code, 200)
+
+
+class RBACAdminEndpointAccessTest(TestCase):
+    def setUp(self):
+        Permission.objects.create(
+            code="bulk-update-role-users",
+            name="Bulk Update Role Users",
+            action="bulk-update",
+            resource="role-users",
+            category="rbac",
+            api_url=r"/api/v1/rbac/roles/\d+/users/bulk/",
+            route_name="rbac:role-users-bulk",
+            method="POST",
+        )
+        self.admin_role = Role.objects.create(code="admin", name="Admin")
+        self.operator = Role.objects.create(code="operator", name="Operator")
+        self.operator.permissions.add(
+            Permission.objects.get(code="bulk-update-role-users")
+        )
+        clear_rbac_caches()
+        self.user = User.objects.create_user(
+            email="plain@example.com", password="pw", nickname="plain"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk_add_self(self):
+        return self.client.post(
+            reverse("rbac:role-users-bulk", args=[self.admin_role.id]),
+            {"mode": "add", "user_ids": [self.user.id]},
+            format="json",
+        )
+
+    def test_admin_endpoints_require_rbac_permission(self):
+        """測試未持有對應權限的使用者無法呼叫 RBAC 管理端點"""
+        # Act
+        responses = {
+            "bulk": self.bulk_add_self(),
+            "matrix": self.client.get(reverse("rbac:role-matrix")),
+            "role_users": self.client.get(reverse("rbac:role-users-list")),
+            "permission_users": self.client.get(
+                reverse("rbac:permission-users", args=[1])
+            ),
+        }
+
+        # Assert
+        for name, response in responses.items():
+            with self.subTest(name):
+                self.assertEqual(response.status_code, 403)
+        self.assertFalse(self.user.roles.filter(id=self.admin_role.id).exists())
+
+    def test_bulk_allowed_with_seeded_permission(self):
+        """測試持有 route_name 對應權限的角色可批次調整成員"""
+        # Arrange
+        self.user.roles.add(self.operator)
+
+        # Act
+        response = self.bulk_add_self()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.user.roles.filter(id=self.admin_role.id).exists())
+
+
+class RBACSparseFieldsTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        Permission.objects.create(
+            code="post.list",
+            name="List Posts",
+            action="get",
+            resource="posts",
+            category="posts",
+        )
+        Role.objects.create(code="editor", name="Editor", name_zh="編輯")
+        admin = User.objects.create_user(
+            email="sparse-admin@example.com", password="pw", is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_permission_list_fields(self):
+        """測試權限列表的 ?fields= 只輸出並只讀取指定欄位"""
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("rbac:permission-list"), {"fields": "code"}
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], [{"code": "post.list"}])
+        table = Permission._meta.db_table
+        sql = find_select(context.captured_queries, table)
+        self.assertCountEqual(selected_columns(sql), [f"{table}.id", f"{table}.code"])
+
+    def test_role_list_exclude(self):
+        """測試角色列表的 ?exclude= 移除指定欄位"""
+        # Act
+        response = self.client.get(reverse("rbac:role-list"), {"exclude": "is_active"})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        roles = response.json()["data"]["roles"]
+        self.assertEqual([sorted(role) for role in roles], [["id", "name_zh"]])
+
+
+class AuditBufferTest(TestCase):
+    def setUp(self):
+        self.buffer = AuditBuffer(
+            capacity=2, allow_sample_rate=0, batch_size=100, flush_interval=60
+        )
+
+    def test_sampling_and_drop_counters(self):
+        """測試允許的判定依比例取樣，緩衝區滿時丟棄並計數"""
+        # Act
+        self.buffer.record(1, "GET", "/api/v1/posts/", "posts:post_list", True)
+        for _ in range(3):
+            self.buffer.record(1, "DELETE", "/api/v1/posts/1/", "", False)
+
+        # Assert
+        self.assertEqual(
+            self.buffer.stats,
+            {"recorded": 2, "sampled_out": 1, "dropped": 1, "flushed": 0},
+        )
+
+    def test_sampled_out_counted_under_lock(self):
+        """測試取樣略過的計數也在緩衝區鎖內更新"""
+        # Arrange
+        worker = threading.Thread(
+            target=self.buffer.record, args=(1, "GET", "/api/v1/posts/", "", True)
+        )
+
+        # Act
+        with self.buffer._lock:
+            worker.start()
+            worker.join(0.1)
+            blocked = worker.is_alive()
+        worker.join()
+
+        # Assert
+        self.assertTrue(blocked)
+        self.assertEqual(self.buffer.stats["sampled_out"], 1)
+
+    def test_flush_in_one_insert(self):
+        """測試緩衝區以單一 bulk_create 寫入後清空"""
+        # Arrange
+        user = User.objects.create_user(
+            email="audit@example.com", password="pw", nickname="audit"
+        )
+        self.buffer.record(user.id, "DELETE", "/api/v1/posts/1/", "", False)
+        self.buffer.record(user.id, "PUT", "/api/v1/posts/1/", "", False)
+
+        # Act
+        with self.assertNumQueries(1):
+            flushed = self.buffer.flush()
+
+        # Assert
+        self.assertEqual(flushed, 2)
+        self.assertEqual(
+            PermissionAuditLog.objects.filter(user=user, allowed=False).count(), 2
+        )
+        self.assertEqual(self.buffer.flush(), 0)
+
+
+class SeedDataTest(TestCase):
+    def test_init_data_is_idempotent(self):
+        """測試種子資料指紋未變時直接略過，不再逐筆寫入"""
+        # Arrange
+        call_command("init_data", stdout=StringIO())
+        bit_indexes = list(Permission.objects.values_list("bit_index", flat=True))
+
+        # Act
+        with self.assertNumQueries(1):
+            call_command("init_data", stdout=StringIO())
+
+        # Assert
+        self.assertNotIn(None, bit_indexes)
+        self.assertEqual(len(set(bit_indexes)), len(bit_indexes))
+        self.assertEqual(
+            RolePermission.objects.filter(role__code="admin").count(),
+            len(bit_indexes),
+        )
+
+    def test_force_reapplies_only_diff(self):
+        """測試強制套用時只補回被改動的種子資料，既有 bit_index 不變"""
+        # Arrange
+        call_command("init_data", stdout=StringIO())
+        permission = Permission.objects.get(code="list-permissions")
+        Permission.objects.filter(id=permission.id).update(is_active=False)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("init_data", "--force", stdout=StringIO())
+
+        # Assert
+        reapplied = Permission.objects.get(id=permission.id)
+        self.assertTrue(reapplied.is_active)
+        self.assertEqual(reapplied.bit_index, permission.bit_index)
+
+
+@override_settings(RBAC_TOKEN_PERMISSIONS=True)
+class TokenPermissionSnapshotTest(TestCase):
+    def setUp(self):
+        clear_rbac_caches()
+        permission = Permission.objects.create(
+            code="post.create",
+            name="Create Post",
+            action="create",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/",
+            method="POST",
+        )
+        role = Role.objects.create(code="writer", name="Writer")
+        role.permissions.add(permission)
+        self.user = User.objects.create_user(
+            email="token@example.com", password="pw", nickname="token"
+        )
+        self.user.roles.add(role)
+        self.token = AccessToken.for_user(self.user)
+        for claim, value in UserPermissionService.get_token_claims(self.user).items():
+            self.token[claim] = value
+
+    def test_authorize_from_claims(self):
+        """測試 access token 內的權限快照可直接判斷權限"""
+        # Act & Assert
+        self.assertTrue(
+            UserPermissionService.has_permission_from_token(
+                self.token, "/api/v1/posts/", "POST"
+            )
+        )
+        self.assertFalse(
+            UserPermissionService.has_permission_from_token(
+                self.token, "/api/v1/posts/", "GET"
+            )
+        )
+
+    def test_stale_snapshot_falls_back(self):
+        """測試權限異動後，舊版本快照回傳 None 以改走一般檢查"""
+        # Arrange
+        with self.captureOnCommitCallbacks(execute=True):
+            UserPermissionRepository.clear_user_permissions_cache(self.user.id)
+
+        # Act
+        result = UserPermissionService.has_permission_from_token(
+            self.token, "/api/v1/posts/", "POST"
+        )
+
+        # Assert
+        self.assertIsNone(result)
@@ -4,10 +4,15 @@ from .views import (
     PermissionCreateListView,
     PermissionDetailView,
     PermissionBatchUpdateView,
+    PermissionUsersView,
     RoleCreateListView,
     RoleDetailView,
+    RoleMatrixView,
     RoleUsersDetailView,
+    RoleUsersBulkView,
     RoleUsersListView,
+    MyPermissionsView,
+    MyPermissionsCheckView,
 )
 
 app_name = "rbac"
@@ -19,17 +24,34 @@ urlpatterns = [
         PermissionDetailView.as_view(),
         name="permission-detail",
     ),
+    path(
+        "permissions/<int:pk>/users/",
+        PermissionUsersView.as_view(),
+        name="permission-users",
+    ),
     path(
         "permissions/batch-update/",
         PermissionBatchUpdateView.as_view(),
         name="permission-batch-update",
     ),
     path("roles/", RoleCreateListView.as_view(), name="role-list"),
+    path("roles/matrix/", RoleMatrixView.as_view(), name="role-matrix"),
     path("roles/<int:pk>/", RoleDetailView.as_view(), name="role-detail"),
     path(
         "roles/<int:role_id>/users/",
         RoleUsersDetailView.as_view(),
         name="role-users-detail",
     ),
+    path(
+        "roles/<int:role_id>/users/bulk/",
+        RoleUsersBulkView.as_view(),
+        name="role-users-bulk",
+    ),
     path("roles/users/", RoleUsersListView.as_view(), name="role-users-list"),
+    path("me/permissions/", MyPermissionsView.as_view(), name="my-permissions"),
+    path(
+        "me/permissions/check/",
+        MyPermissionsCheckView.as_view(),
+        name="my-permissions-check",
+    ),
 ]
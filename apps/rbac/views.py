@@ -2,13 +2,19 @@ from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema
-from apps.rbac.models import Role
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
-from core.app.base.serializer import BaseErrorSerializer, DeleteSuccessSerializer
+from core.app.base.projection import projection_for
+from core.app.base.serializer import (
+    BaseErrorSerializer,
+    DeleteSuccessSerializer,
+    sparse_fields,
+    sparse_fields_parameters,
+)
 from .serializers import (
     PermissionSerializer,
     RoleSimpleSerializer,
+    RoleCreateSerializer,
     RoleDetailSerializer,
     RoleUserSerializer,
     PermissionSuccessResponseSerializer,
@@ -18,11 +24,22 @@ from .serializers import (
     RoleUserListResponseSerializer,
     BaseSuccessResponseSerializer,
     RoleUsersDetailSerializer,
+    RoleUsersDetailResponseSerializer,
+    RoleUsersQuerySerializer,
     RoleUsersUpdateSerializer,
+    RoleUsersBulkUpdateSerializer,
+    RoleUsersBulkUpdateResponseSerializer,
+    RoleMatrixResponseSerializer,
     PermissionBatchUpdateSerializer,
+    PermissionUsersSerializer,
+    PermissionUsersResponseSerializer,
+    PermissionCheckSerializer,
+    PermissionCheckResponseSerializer,
+    MyPermissionCodesResponseSerializer,
 )
 from apps.rbac.services.role_service import RoleService
 from apps.rbac.services.permission_service import PermissionService
+from apps.rbac.services.user_permissions_service import UserPermissionService
 
 
 class PermissionCreateListView(GenericAPIView):
@@ -35,10 +52,14 @@ class PermissionCreateListView(GenericAPIView):
         },
         summary="取得所有權限",
         tags=["RBAC: Permission"],
+        parameters=sparse_fields_parameters(PermissionSerializer),
     )
     def get(self, request):
-        permissions = PermissionService.list_permissions()
-        serializer = PermissionSerializer(permissions, many=True)
+        fields = sparse_fields(request.query_params, PermissionSerializer)
+        permissions = PermissionService.list_permissions(
+            projection_for(PermissionSerializer, fields)
+        )
+        serializer = PermissionSerializer(permissions, many=True, fields=fields)
         return Response(
             {
                 "success": True,
@@ -123,6 +144,51 @@ class PermissionDetailView(GenericAPIView):
         return Response()
 
 
+# 持有權限的使用者
+class PermissionUsersView(GenericAPIView):
+    @extend_schema(
+        summary="取得持有權限的使用者",
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="上一頁最後一位使用者的 ID",
+            ),
+            OpenApiParameter(
+                name="size",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="每頁筆數",
+                default=10,
+            ),
+        ],
+        responses={
+            200: PermissionUsersResponseSerializer,
+            400: BaseErrorSerializer,
+            401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+            404: BaseErrorSerializer,
+        },
+        tags=["RBAC: Permission"],
+    )
+    def get(self, request, pk):
+        query = RoleUsersQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = PermissionService.list_permission_users(
+            pk,
+            query.validated_data.get("cursor"),
+            query.validated_data["size"],
+        )
+        return Response(
+            {
+                "success": True,
+                "message": "查詢成功",
+                "data": PermissionUsersSerializer(data).data,
+            }
+        )
+
+
 # 批次更新權限
 class PermissionBatchUpdateView(GenericAPIView):
     permission_classes = [IsAuthenticated]
@@ -159,10 +225,12 @@ class RoleCreateListView(GenericAPIView):
         },
         summary="取得所有角色",
         tags=["RBAC: Role"],
+        parameters=sparse_fields_parameters(RoleSimpleSerializer),
     )
     def get(self, request):
-        roles = RoleService.list_roles()
-        serializer = RoleSimpleSerializer(roles, many=True)
+        fields = sparse_fields(request.query_params, RoleSimpleSerializer)
+        roles = RoleService.list_roles(projection_for(RoleSimpleSerializer, fields))
+        serializer = RoleSimpleSerializer(roles, many=True, fields=fields)
         return Response(
             {
                 "success": True,
@@ -172,17 +240,21 @@ class RoleCreateListView(GenericAPIView):
         )
 
     @extend_schema(
-        request=RoleSimpleSerializer,
+        request=RoleCreateSerializer,
         responses={
             201: RoleDetailResponseSerializer,
+            400: BaseErrorSerializer,
             401: BaseErrorSerializer,
         },
         summary="建立角色",
         tags=["RBAC: Role"],
     )
     def post(self, request):
-        permissions = request.data.pop("permissions", [])
-        role = RoleService.create_role(request.data, permissions)
+        serializer = RoleCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        permissions = data.pop("permissions", [])
+        role = RoleService.create_role(data, permissions)
         serializer = RoleDetailSerializer(role)
         return Response(
             {
@@ -194,6 +266,33 @@ class RoleCreateListView(GenericAPIView):
         )
 
 
+# 角色權限矩陣
+class RoleMatrixView(GenericAPIView):
+    @extend_schema(
+        responses={
+            200: RoleMatrixResponseSerializer,
+            304: None,
+            401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="取得角色權限矩陣",
+        tags=["RBAC: Role"],
+    )
+    def get(self, request):
+        etag = RoleService.get_role_matrix_etag()
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(
+            {
+                "success": True,
+                "message": "查詢成功",
+                "data": RoleService.get_role_matrix(),
+            },
+            headers={"ETag": etag},
+        )
+
+
 # 角色細節
 class RoleDetailView(GenericAPIView):
     permission_classes = [IsAuthenticated]
@@ -218,17 +317,23 @@ class RoleDetailView(GenericAPIView):
         )
 
     @extend_schema(
-        request=RoleSimpleSerializer,
+        request=RoleCreateSerializer,
         responses={
             200: RoleDetailResponseSerializer,
+            400: BaseErrorSerializer,
             401: BaseErrorSerializer,
         },
         summary="更新角色",
         tags=["RBAC: Role"],
     )
     def put(self, request, pk):
-        permissions = request.data.pop("permissions", [])
-        role = RoleService.update_role(pk, request.data, permissions)
+        serializer = RoleCreateSerializer(
+            RoleService.get_role(pk), data=request.data, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        permissions = data.pop("permissions", [])
+        role = RoleService.update_role(pk, data, permissions)
         serializer = RoleDetailSerializer(role)
         return Response(
             {
@@ -257,8 +362,23 @@ class RoleUsersDetailView(GenericAPIView):
 
     @extend_schema(
         summary="取得角色使用者詳情",
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="上一頁最後一位使用者的 ID",
+            ),
+            OpenApiParameter(
+                name="size",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="每頁筆數",
+                default=10,
+            ),
+        ],
         responses={
-            200: RoleUsersDetailSerializer,
+            200: RoleUsersDetailResponseSerializer,
             400: BaseErrorSerializer,
             401: BaseErrorSerializer,
             404: BaseErrorSerializer,
@@ -266,38 +386,18 @@ class RoleUsersDetailView(GenericAPIView):
         tags=["RBAC: Role Users"],
     )
     def get(self, request, role_id):
-        try:
-            role = Role.objects.get(pk=role_id)
-        except Role.DoesNotExist:
-            return Response(
-                {"success": False, "message": "角色不存在", "data": None}, status=404
-            )
-        users = role.users.all()
-        serializer = RoleUsersDetailSerializer(
-            {
-                "id": role.id,
-                "name_zh": role.name_zh,
-                "total_user": users.count(),
-                "users": [
-                    {
-                        "id": u.id,
-                        "nickname": u.nickname,
-                        "email": u.email,
-                        "is_active": u.is_active,
-                    }
-                    for u in users
-                ],
-            }
+        query = RoleUsersQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = RoleService.list_role_users(
+            role_id,
+            query.validated_data.get("cursor"),
+            query.validated_data["size"],
         )
         return Response(
             {
                 "success": True,
                 "message": "查詢成功",
-                "data": {
-                    "id": role.id,
-                    "name_zh": role.name_zh,
-                    "total_user": users.count(),
-                },
+                "data": RoleUsersDetailSerializer(data).data,
             }
         )
 
@@ -326,21 +426,104 @@ class RoleUsersDetailView(GenericAPIView):
         )
 
 
+# 批次調整角色成員
+class RoleUsersBulkView(GenericAPIView):
+    @extend_schema(
+        summary="批次新增、移除或取代角色成員",
+        request=RoleUsersBulkUpdateSerializer,
+        responses={
+            200: RoleUsersBulkUpdateResponseSerializer,
+            400: BaseErrorSerializer,
+            401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+            404: BaseErrorSerializer,
+        },
+        tags=["RBAC: Role Users"],
+    )
+    def post(self, request, role_id):
+        serializer = RoleUsersBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        _, added_ids, removed_ids = RoleService.update_role_users(
+            role_id,
+            serializer.validated_data["user_ids"],
+            serializer.validated_data["mode"],
+            serializer.validated_data.get("expires_at"),
+        )
+        return Response(
+            {
+                "success": True,
+                "message": "角色成員更新成功",
+                "data": {"added": len(added_ids), "removed": len(removed_ids)},
+            }
+        )
+
+
+# 目前使用者的有效權限代碼
+class MyPermissionsView(GenericAPIView):
+    @extend_schema(
+        responses={
+            200: MyPermissionCodesResponseSerializer,
+            401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="取得目前使用者的有效權限代碼",
+        tags=["RBAC: Me"],
+    )
+    def get(self, request):
+        codes = UserPermissionService.get_permission_codes(request.user)
+        return Response(
+            {
+                "success": True,
+                "message": "查詢成功",
+                "data": {"codes": codes},
+            }
+        )
+
+
+# 批次檢查目前使用者的權限
+class MyPermissionsCheckView(GenericAPIView):
+    @extend_schema(
+        request=PermissionCheckSerializer,
+        responses={
+            200: PermissionCheckResponseSerializer,
+            400: BaseErrorSerializer,
+            401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
+        },
+        summary="批次檢查目前使用者是否可存取多個路徑或路由",
+        tags=["RBAC: Me"],
+    )
+    def post(self, request):
+        serializer = PermissionCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = UserPermissionService.check_permissions(
+            request.user, serializer.validated_data["checks"]
+        )
+        return Response(
+            {
+                "success": True,
+                "message": "查詢成功",
+                "data": {"results": results},
+            }
+        )
+
+
 # 角色使用者列表
 class RoleUsersListView(GenericAPIView):
-    permission_classes = [IsAuthenticated]
-
     @extend_schema(
         responses={
             200: RoleUserListResponseSerializer,
             401: BaseErrorSerializer,
+            403: BaseErrorSerializer,
         },
         summary="取得所有角色使用者",
         tags=["RBAC: Role Users"],
+        parameters=sparse_fields_parameters(RoleUserSerializer),
     )
     def get(self, request):
+        fields = sparse_fields(request.query_params, RoleUserSerializer)
         users = RoleService.list_all_role_users()
-        serializer = RoleUserSerializer(users, many=True)
+        serializer = RoleUserSerializer(users, many=True, fields=fields)
         return Response(
             {
                 "success": True,
@@ -0,0 +1,126 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("posts", "0003_post_search_vector"),
+        ("questions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("post_count", models.PositiveIntegerField(default=0, editable=False)),
+                (
+                    "question_count",
+                    models.PositiveIntegerField(default=0, editable=False),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="QuestionTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_links",
+                        to="questions.question",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="question_links",
+                        to="tags.tag",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "questions_question_tags",
+                "indexes": [
+                    models.Index(
+                        fields=["tag", "question"], name="question_tag_tag_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("question", "tag"), name="unique_question_tag"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PostTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_links",
+                        to="posts.post",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_links",
+                        to="tags.tag",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "posts_post_tags",
+                "indexes": [
+                    models.Index(fields=["tag", "post"], name="post_tag_tag_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("post", "tag"), name="unique_post_tag"
+                    )
+                ],
+            },
+        ),
+    ]
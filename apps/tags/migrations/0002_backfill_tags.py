@@ -0,0 +1,89 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:20
+
+import re
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+# 標籤切分規則複製自當時的 apps.tags.utils，遷移不引用應用程式碼
+TAG_SEPARATOR_RE = re.compile(r"[,，]")
+TAG_NAME_MAX_LENGTH = 50
+
+
+def parse_tags(value):
+    names = []
+    for raw in TAG_SEPARATOR_RE.split(value or ""):
+        name = raw.strip().casefold()[:TAG_NAME_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_links(apps, owner_model, link_model, owner_column):
+    Tag = apps.get_model("tags", "Tag")
+    last_id = 0
+    while True:
+        rows = list(
+            owner_model.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "tags")[:BATCH_SIZE]
+        )
+        if not rows:
+            return
+        names_by_owner = {owner_id: parse_tags(tags) for owner_id, tags in rows}
+        names = {
+            name for owner_names in names_by_owner.values() for name in owner_names
+        }
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in names], ignore_conflicts=True
+        )
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+        link_model.objects.bulk_create(
+            [
+                link_model(**{owner_column: owner_id, "tag_id": tag_ids[name]})
+                for owner_id, owner_names in names_by_owner.items()
+                for name in owner_names
+            ],
+            ignore_conflicts=True,
+        )
+        last_id = rows[-1][0]
+
+
+def link_count(link_model):
+    counts = (
+        link_model.objects.filter(tag_id=OuterRef("pk"))
+        .order_by()
+        .values("tag_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def backfill_tags(apps, schema_editor):
+    PostTag = apps.get_model("tags", "PostTag")
+    QuestionTag = apps.get_model("tags", "QuestionTag")
+    backfill_links(apps, apps.get_model("posts", "Post"), PostTag, "post_id")
+    backfill_links(
+        apps, apps.get_model("questions", "Question"), QuestionTag, "question_id"
+    )
+    apps.get_model("tags", "Tag").objects.update(
+        post_count=link_count(PostTag), question_count=link_count(QuestionTag)
+    )
+
+
+class Migration(migrations.Migration):
+    # 每批各自提交，避免大量資料時長時間持有鎖
+    atomic = False
+
+    dependencies = [
+        ("tags", "0001_initial"),
+        ("posts", "0004_post_tag_items"),
+        ("questions", "0002_question_tag_items"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from django.db import models
+
+from apps.tags.utils import TAG_NAME_MAX_LENGTH
+
+
+class Tag(models.Model):
+    # 名稱一律以小寫儲存，篩選時為精確比對
+    name = models.CharField(max_length=TAG_NAME_MAX_LENGTH, unique=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    question_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class PostTag(models.Model):
+    # (post, tag) 唯一索引與 (tag, post) 索引已涵蓋兩個方向的查詢，不另建單欄索引
+    post = models.ForeignKey(
+        "posts.Post", on_delete=models.CASCADE, related_name="tag_links", db_index=False
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name="post_links", db_index=False
+    )
+
+    class Meta:
+        db_table = "posts_post_tags"
+        constraints = [
+            models.UniqueConstraint(fields=["post", "tag"], name="unique_post_tag")
+        ]
+        indexes = [models.Index(fields=["tag", "post"], name="post_tag_tag_idx")]
+
+
+class QuestionTag(models.Model):
+    question = models.ForeignKey(
+        "questions.Question",
+        on_delete=models.CASCADE,
+        related_name="tag_links",
+        db_index=False,
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name="question_links", db_index=False
+    )
+
+    class Meta:
+        db_table = "questions_question_tags"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["question", "tag"], name="unique_question_tag"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["tag", "question"], name="question_tag_tag_idx")
+        ]
@@ -0,0 +1,150 @@
+from collections import Counter, defaultdict
+
+from apps.tags.models import PostTag, QuestionTag, Tag
+from apps.tags.utils import parse_tags
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+TAG_MATCH_ANY = "any"
+TAG_MATCH_ALL = "all"
+
+
+class TagRepository:
+    model_class = Tag
+
+    @classmethod
+    def get_or_create_ids(cls, names):
+        if not names:
+            return {}
+        cls.model_class.objects.bulk_create(
+            [cls.model_class(name=name) for name in names], ignore_conflicts=True
+        )
+        return dict(
+            cls.model_class.objects.filter(name__in=names).values_list("name", "id")
+        )
+
+    @classmethod
+    def adjust_counts(cls, counter_field, deltas):
+        """依增減量分組，每組一個 UPDATE；計數不會低於 0"""
+        tag_ids_by_delta = defaultdict(list)
+        for tag_id, delta in deltas.items():
+            if delta:
+                tag_ids_by_delta[delta].append(tag_id)
+        for delta, tag_ids in tag_ids_by_delta.items():
+            cls.model_class.objects.filter(id__in=tag_ids).update(
+                **{counter_field: Greatest(F(counter_field) + delta, 0)}
+            )
+
+    @classmethod
+    def recount(cls, tag_ids=None):
+        """以關聯表重算使用次數，用於回填或修正串聯刪除造成的誤差"""
+        tags = cls.model_class.objects.all()
+        if tag_ids is not None:
+            tags = tags.filter(id__in=tag_ids)
+        return tags.update(
+            post_count=_link_count(PostTag),
+            question_count=_link_count(QuestionTag),
+        )
+
+
+def _link_count(link_model):
+    counts = (
+        link_model.objects.filter(tag_id=OuterRef("pk"))
+        .order_by()
+        .values("tag_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class TaggedItemRepository:
+    """貼文與問題共用的標籤關聯操作，子類別指定關聯表與計數欄位"""
+
+    link_model = None
+    owner_field = None
+    counter_field = None
+
+    @classmethod
+    def _owner_column(cls):
+        return f"{cls.owner_field}_id"
+
+    @classmethod
+    @transaction.atomic
+    def set_tags(cls, owner_ids, value):
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return
+        owner_column = cls._owner_column()
+        tag_ids = set(TagRepository.get_or_create_ids(parse_tags(value)).values())
+        links = cls.link_model.objects.filter(**{f"{owner_column}__in": owner_ids})
+        current = set(links.values_list(owner_column, "tag_id"))
+        removed = [pair for pair in current if pair[1] not in tag_ids]
+        added = [
+            (owner_id, tag_id)
+            for owner_id in owner_ids
+            for tag_id in tag_ids
+            if (owner_id, tag_id) not in current
+        ]
+        if removed:
+            links.exclude(tag_id__in=tag_ids).delete()
+        if added:
+            cls.link_model.objects.bulk_create(
+                [
+                    cls.link_model(**{owner_column: owner_id, "tag_id": tag_id})
+                    for owner_id, tag_id in added
+                ],
+                ignore_conflicts=True,
+            )
+        deltas = Counter(tag_id for _, tag_id in added)
+        deltas.subtract(tag_id for _, tag_id in removed)
+        TagRepository.adjust_counts(cls.counter_field, deltas)
+
+    @classmethod
+    def release(cls, owner_ids):
+        """刪除擁有者前呼叫，扣回其標籤的使用次數；關聯列交給串聯刪除"""
+        deltas = Counter()
+        for tag_id, total in (
+            cls.link_model.objects.filter(
+                **{f"{cls._owner_column()}__in": list(owner_ids)}
+            )
+            .values("tag_id")
+            .annotate(total=Count("id"))
+            .values_list("tag_id", "total")
+        ):
+            deltas[tag_id] -= total
+        TagRepository.adjust_counts(cls.counter_field, deltas)
+
+    @classmethod
+    def filter(cls, queryset, value, match=TAG_MATCH_ANY):
+        """精確比對標籤；any 為任一標籤符合，all 為所有標籤皆符合"""
+        names = parse_tags(value)
+        if not names:
+            return queryset
+        tag_ids = list(Tag.objects.filter(name__in=names).values_list("id", flat=True))
+        owner_column = cls._owner_column()
+        links = cls.link_model.objects.filter(tag_id__in=tag_ids)
+        if match == TAG_MATCH_ALL:
+            if len(tag_ids) < len(names):
+                return queryset.none()
+            links = (
+                links.values(owner_column)
+                .annotate(matched=Count("tag_id"))
+                .filter(matched=len(tag_ids))
+            )
+        elif not tag_ids:
+            return queryset.none()
+        return queryset.filter(id__in=links.values(owner_column))
+
+
+class PostTagRepository(TaggedItemRepository):
+    link_model = PostTag
+    owner_field = "post"
+    counter_field = "post_count"
+
+
+class QuestionTagRepository(TaggedItemRepository):
+    link_model = QuestionTag
+    owner_field = "question"
+    counter_field = "question_count"
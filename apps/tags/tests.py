@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from apps.posts.models import Post
+from apps.posts.repository import PostRepository
+from apps.questions.repository import QuestionRepository
+from apps.tags.models import Tag
+from apps.tags.repository import TAG_MATCH_ALL, PostTagRepository
+from apps.tags.utils import parse_tags
+
+User = get_user_model()
+
+
+class ParseTagsTest(SimpleTestCase):
+    def test_parse_tags(self):
+        """測試標籤字串去除空白、重複並統一小寫"""
+        # Act & Assert
+        self.assertEqual(
+            parse_tags(" Python, django，python,, 資料庫 "),
+            ["python", "django", "資料庫"],
+        )
+
+
+class TaggedItemRepositoryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="tags@example.com", password="pw", nickname="tags"
+        )
+        self.python_post = PostRepository.create_post(
+            "p1", "c1", self.user, tags="python,django"
+        )
+        self.py_post = PostRepository.create_post("p2", "c2", self.user, tags="py")
+
+    def counts(self, field="post_count"):
+        return dict(Tag.objects.values_list("name", field))
+
+    def test_filter_is_exact_match(self):
+        """測試標籤為精確比對，py 不會命中 python"""
+        # Act
+        posts = PostTagRepository.filter(Post.objects.all(), "py")
+
+        # Assert
+        self.assertEqual(list(posts), [self.py_post])
+
+    def test_filter_any_and_all(self):
+        """測試 any 為任一標籤符合，all 為全部標籤符合"""
+        # Act
+        any_posts = PostTagRepository.filter(Post.objects.all(), "python,py")
+        all_posts = PostTagRepository.filter(
+            Post.objects.all(), "python,django", TAG_MATCH_ALL
+        )
+        missing = PostTagRepository.filter(
+            Post.objects.all(), "python,unknown", TAG_MATCH_ALL
+        )
+
+        # Assert
+        self.assertEqual(set(any_posts), {self.python_post, self.py_post})
+        self.assertEqual(list(all_posts), [self.python_post])
+        self.assertFalse(missing.exists())
+
+    def test_counts_follow_writes(self):
+        """測試新增、修改與刪除時同步更新標籤使用次數"""
+        # Act
+        PostRepository.update_post(self.python_post, {"tags": "django,orm"})
+        question = QuestionRepository.create_question(
+            "q1", "c1", self.user, tags="django"
+        )
+        PostRepository.delete_posts(self.user, [self.py_post.id])
+
+        # Assert
+        self.assertEqual(self.counts(), {"python": 0, "django": 1, "py": 0, "orm": 1})
+        self.assertEqual(self.counts("question_count")["django"], 1)
+        self.assertEqual(
+            list(question.tag_items.values_list("name", flat=True)), ["django"]
+        )
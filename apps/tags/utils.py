@@ -0,0 +1,14 @@
+import re
+
+TAG_SEPARATOR_RE = re.compile(r"[,，]")
+TAG_NAME_MAX_LENGTH = 50
+
+
+def parse_tags(value):
+    """將逗號分隔的標籤字串轉成去重、保留順序且不分大小寫的標籤名稱列表"""
+    names = []
+    for raw in TAG_SEPARATOR_RE.split(value or ""):
+        name = raw.strip().casefold()[:TAG_NAME_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rbac", "0009_userrole"),
+        ("users", "0002_alter_user_options_user_permissions_user_roles_and_more"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="user",
+                    name="roles",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="users",
+                        through="rbac.UserRole",
+                        to="rbac.role",
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+    ]
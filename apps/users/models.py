@@ -30,7 +30,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     updated_at = models.DateTimeField(auto_now=True)
     enabled_permissions = models.JSONField(default=list, blank=True)
     disabled_permissions = models.JSONField(default=list, blank=True)
-    roles = models.ManyToManyField("rbac.Role", related_name="users", blank=True)
+    roles = models.ManyToManyField(
+        "rbac.Role", through="rbac.UserRole", related_name="users", blank=True
+    )
     permissions = models.ManyToManyField(
         "rbac.Permission", related_name="users", blank=True
     )
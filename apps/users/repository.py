@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 
 User = get_user_model()
 
@@ -9,6 +11,10 @@ class UserRepository:
     def create_user(**kwargs):
         return User.objects.create_user(**kwargs)
 
+    @staticmethod
+    def get_by_id(user_id):
+        return User.objects.filter(id=user_id).first()
+
     @staticmethod
     def get_by_email(email):
         return User.objects.filter(email=email).first()
@@ -70,6 +76,8 @@ class UserRepository:
         )
 
     @staticmethod
+    @transaction.atomic
     def hard_delete_user(user):
+        user.roles.update(member_count=Greatest(F("member_count") - 1, 0))
         user.delete()
         return True
@@ -6,8 +6,11 @@ from django.core.cache import cache
 from django.contrib.auth.hashers import check_password
 from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.rbac.services.user_permissions_service import UserPermissionService
+
 from .repository import UserRepository
 from .serializers import (
     RegisterSerializer, LoginSerializer, ChangePasswordSerializer, ForgotPasswordSerializer, ResetPasswordSerializer
@@ -42,7 +45,7 @@ class UserService:
         refresh = RefreshToken.for_user(user)
         return {
             "user": user,
-            "access": str(refresh.access_token),
+            "access": str(cls._build_access_token(refresh, user)),
             "refresh": str(refresh),
             "message": "登入成功"
         }
@@ -51,7 +54,13 @@ class UserService:
     def refresh_token(cls, refresh_token):
         try:
             refresh = RefreshToken(refresh_token)
-            access_token = refresh.access_token
+            # 未啟用權限快照時不需要使用者資料，省去刷新時的查詢
+            user = None
+            if settings.RBAC_TOKEN_PERMISSIONS:
+                user = cls.repository_class.get_by_id(
+                    refresh[api_settings.USER_ID_CLAIM]
+                )
+            access_token = cls._build_access_token(refresh, user)
             return {
                 "access": str(access_token),
                 "refresh": str(refresh),
@@ -60,6 +69,14 @@ class UserService:
         except (InvalidToken, TokenError):
             raise ValidationError("Invalid refresh token")
 
+    @staticmethod
+    def _build_access_token(refresh, user):
+        access_token = refresh.access_token
+        if user is not None:
+            for claim, value in UserPermissionService.get_token_claims(user).items():
+                access_token[claim] = value
+        return access_token
+
     @classmethod
     def validate_refresh_token(cls, refresh_token):
         if not refresh_token:
@@ -1,6 +1,10 @@
+from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from ..service import UserService
 
@@ -195,3 +199,26 @@ class UserServiceTest(TestCase):
         with self.assertRaises(NotFound) as context:
             UserService.deactivate_user(non_existent_id)
         self.assertIn("User not found", str(context.exception))
+
+
+class RefreshTokenServiceTest(TestCase):
+    """UserService.refresh_token 測試類"""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="refresh@example.com", password="pw", nickname="refresh"
+        )
+        self.refresh = str(RefreshToken.for_user(user))
+
+    @override_settings(RBAC_TOKEN_PERMISSIONS=False)
+    def test_refresh_without_snapshot_skips_user_query(self):
+        """測試未啟用權限快照時刷新 token 不查詢使用者"""
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            result = UserService.refresh_token(self.refresh)
+
+        # Assert
+        self.assertIn("access", result)
+        self.assertFalse(
+            any("users_user" in query["sql"] for query in context.captured_queries)
+        )
@@ -0,0 +1,99 @@
+import hashlib
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+# 整表筆數由寫入路徑增減維護；TTL 讓串聯刪除等未經 repository 的異動最終被校正
+TABLE_COUNT_TIMEOUT = 3600
+
+
+class CountResult(NamedTuple):
+    value: int
+    exact: bool
+
+
+class CountStrategy:
+    """
+    分頁計數策略。
+
+    - 要求精確：直接 COUNT(*)
+    - 未篩選：使用快取的整表筆數，由 adjust 在寫入時增減，命中時標示為非精確；
+      快取不存在且 pg_class 估計值超過門檻時回傳估計值，不做整表 COUNT
+    - 有篩選：COUNT(*) 結果以 SQL 為鍵短暫快取，命中時標示為非精確
+    """
+
+    @staticmethod
+    def table_key(model):
+        return f"list_count:table:{model._meta.db_table}"
+
+    @staticmethod
+    def query_key(queryset):
+        """
+        以篩選條件組成快取鍵：去掉排序並只選主鍵，未被條件引用的 annotate
+        （例如每位使用者不同的 is_liked）與欄位子集都不影響鍵值
+        """
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        digest = hashlib.md5(f"{sql}{params!r}".encode()).hexdigest()
+        return f"list_count:query:{digest}"
+
+    @classmethod
+    def adjust(cls, model, delta):
+        """寫入成功提交後才增減整表筆數，交易回滾時不影響快取"""
+        if delta:
+            transaction.on_commit(lambda: cls._incr(model, delta))
+
+    @classmethod
+    def _incr(cls, model, delta):
+        try:
+            cache.incr(cls.table_key(model), delta)
+        except ValueError:
+            # 尚未快取時不處理，下次讀取會重新計算
+            pass
+
+    @staticmethod
+    def estimate(model):
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # 從未 ANALYZE 的資料表 reltuples 為 -1
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
+
+    @classmethod
+    def count(cls, queryset, exact=False):
+        if exact:
+            return CountResult(queryset.count(), True)
+        if not queryset.query.has_filters() and not queryset.query.distinct:
+            return cls._count_table(queryset)
+        key = cls.query_key(queryset)
+        cached = cache.get(key)
+        if cached is not None:
+            return CountResult(cached, False)
+        value = queryset.count()
+        cache.set(key, value, settings.LIST_COUNT_CACHE_TTL)
+        return CountResult(value, True)
+
+    @classmethod
+    def _count_table(cls, queryset):
+        key = cls.table_key(queryset.model)
+        cached = cache.get(key)
+        if cached is not None:
+            # 快取值只由 adjust 維護，串聯刪除、raw SQL 等異動不會反映，不標示為精確
+            return CountResult(cached, False)
+        estimated = cls.estimate(queryset.model)
+        if (
+            estimated is not None
+            and estimated >= settings.LIST_COUNT_ESTIMATE_THRESHOLD
+        ):
+            return CountResult(estimated, False)
+        value = queryset.count()
+        cache.set(key, value, TABLE_COUNT_TIMEOUT)
+        return CountResult(value, True)
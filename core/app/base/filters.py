@@ -0,0 +1,40 @@
+class FilterPipeline:
+    """
+    宣告式列表篩選與排序。
+
+    query_serializer_class 驗證查詢參數，未宣告的參數一律忽略；
+    filters 依宣告順序套用已驗證的值：字串為 ORM lookup，
+    以 "filter_" 開頭者則呼叫同名類別方法 (queryset, value, params)。
+    orderings 是排序白名單，所有條件最後組成同一個 queryset。
+    """
+
+    query_serializer_class = None
+    filters = {}
+    orderings = {}
+    default_ordering = "latest"
+
+    @classmethod
+    def validate(cls, params):
+        serializer = cls.query_serializer_class(data=params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @classmethod
+    def apply(cls, queryset, params):
+        for name, spec in cls.filters.items():
+            value = params.get(name)
+            if value is None or value == "":
+                continue
+            if spec.startswith("filter_"):
+                queryset = getattr(cls, spec)(queryset, value, params)
+            else:
+                queryset = queryset.filter(**{spec: value})
+        return cls.order(queryset, params)
+
+    @classmethod
+    def get_ordering(cls, queryset, params):
+        return params.get("sort") or cls.default_ordering
+
+    @classmethod
+    def order(cls, queryset, params):
+        return queryset.order_by(*cls.orderings[cls.get_ordering(queryset, params)])
@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+
+class LazyLoadError(RuntimeError):
+    """序列化期間觸發了資料庫查詢，表示查詢計畫漏了欄位、關聯或 annotate"""
+
+
+@contextmanager
+def forbid_queries(label="serializer"):
+    """LAZY_LOAD_GUARD 開啟時，區塊內的任何查詢都會拋出 LazyLoadError"""
+    if not settings.LAZY_LOAD_GUARD:
+        yield
+        return
+
+    def blocker(execute, sql, params, many, context):
+        raise LazyLoadError(f"{label} 序列化時觸發查詢（N+1）：{sql}")
+
+    with connection.execute_wrapper(blocker):
+        yield
+
+
+def render(serializer):
+    """
+    取得 serializer.data，資料須已由 projection_for 的查詢計畫一次載入。
+
+    開啟 LAZY_LOAD_GUARD 時（測試或需要檢查的環境），序列化過程讀取延遲載入的
+    欄位或關聯會直接報錯，避免列表頁每列多一次查詢的問題進到正式環境。
+    """
+    target = getattr(serializer, "child", serializer)
+    with forbid_queries(type(target).__name__):
+        return serializer.data
@@ -0,0 +1,30 @@
+from apps.rbac.services.user_permissions_service import UserPermissionService
+
+
+class OwnershipPolicy:
+    """
+    將「作者本人，或持有管理權限者」的規則轉成 queryset 條件。
+
+    更新與刪除直接在過濾後的 queryset 上執行並回傳筆數，
+    單筆與批次操作共用同一套判斷，不必逐筆取出物件比對作者。
+    """
+
+    owner_field = "author"
+    # 持有此 RBAC 權限代碼者可管理所有人的資料
+    manage_permission = None
+
+    @classmethod
+    def can_manage_all(cls, user):
+        if user.is_superuser:
+            return True
+        if cls.manage_permission is None:
+            return False
+        return UserPermissionService.has_permission_code(user, cls.manage_permission)
+
+    @classmethod
+    def scope(cls, queryset, user):
+        if user is None or not user.is_authenticated:
+            return queryset.none()
+        if cls.can_manage_all(user):
+            return queryset
+        return queryset.filter(**{cls.owner_field: user})
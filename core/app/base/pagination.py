@@ -1,5 +1,75 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+from functools import cached_property, partial
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from core.app.base.counting import CountStrategy
+
+
+class CountingPage(Page):
+    # 非精確總數時以多取一筆判斷是否有下一頁
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is None:
+            return super().has_next()
+        return self.has_more
+
+
+class CountingPaginator(Paginator):
+    """
+    以 CountStrategy 取得總筆數，count_result.exact 標示是否為精確值。
+
+    除非要求 count=exact，總數（快取或估計值）只供顯示：不據此拒絕頁碼或
+    截斷最後一頁，改為直接取該頁資料（多取一筆判斷下一頁），取不到資料才視為超出範圍。
+    """
+
+    def __init__(self, *args, exact_count=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact_count = exact_count
+
+    @cached_property
+    def count_result(self):
+        return CountStrategy.count(self.object_list, exact=self.exact_count)
+
+    @cached_property
+    def count(self):
+        return self.count_result.value
+
+    def validate_number(self, number):
+        if self.exact_count:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("頁碼必須是整數")
+        if number < 1:
+            raise EmptyPage("頁碼必須大於 0")
+        return number
+
+    def page(self, number):
+        if self.exact_count:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("此頁沒有資料")
+        page = self._get_page(rows[: self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return CountingPage(*args, **kwargs)
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -7,17 +77,184 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_query_param = "page"
     max_page_size = 100
     page_size = 10
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        exact = request.query_params.get(self.count_query_param) == "exact"
+        self.django_paginator_class = partial(CountingPaginator, exact_count=exact)
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        count = self.page.paginator.count_result
         return Response(
             {
                 "success": True,
                 "message": "查詢成功",
                 "pagination": {
-                    "count": self.page.paginator.count,
+                    "count": count.value,
+                    "count_exact": count.exact,
                     "next": self.get_next_link(),
                     "previous": self.get_previous_link(),
                 },
                 "data": data,
             }
         )
+
+
+class KeysetPagination(BasePagination):
+    """
+    以 queryset 的排序欄位作為游標的分頁，不做 COUNT 也不用 OFFSET。
+
+    排序欄位最後一定補上 id 以確保唯一，下一頁以「排序值嚴格小於（或大於）游標」過濾，
+    每次多取一筆判斷 has_next。游標是排序值的 base64 JSON，對呼叫端而言不透明。
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "size"
+    max_page_size = 100
+    page_size = 10
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = [
+            field
+            for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return ordering
+
+    @staticmethod
+    def encode_cursor(values):
+        payload = json.dumps(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in values
+            ]
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def get_field(queryset, name):
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        if name == "pk":
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+
+    @classmethod
+    def to_value(cls, queryset, name, value):
+        """依排序欄位的型別轉換游標值，時間一律轉成含時區"""
+        if value is None:
+            raise ValueError("游標值不可為空")
+        field = cls.get_field(queryset, name)
+        value = field.to_python(value)
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        field.get_prep_value(value)
+        return value
+
+    def decode_cursor(self, request, queryset, ordering):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError("游標長度不符")
+            # 游標來自用戶端，型別不符時視為無效游標而非讓查詢出錯
+            return [
+                self.to_value(queryset, field.lstrip("-"), value)
+                for field, value in zip(ordering, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound("無效的分頁游標")
+
+    @staticmethod
+    def after(ordering, values):
+        """組出 (a, b, id) > (x, y, z) 的字典序條件，方向依各欄位的排序決定"""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": values[index]})
+            for previous, value in zip(ordering[:index], values[:index]):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        names, defer = queryset.query.deferred_loading
+        if not defer:
+            # only() 未包含排序欄位時一併讀取，產生下一頁游標不需再查詢
+            queryset = queryset.only(
+                *names,
+                *(
+                    field.lstrip("-")
+                    for field in self.ordering
+                    if field.lstrip("-") not in queryset.query.annotations
+                ),
+            )
+        values = self.decode_cursor(request, queryset, self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self.after(self.ordering, values))
+        rows = list(queryset[: size + 1])
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = self.encode_cursor(
+            [getattr(last, field.lstrip("-")) for field in self.ordering]
+        )
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "success": True,
+                "message": "查詢成功",
+                "pagination": {
+                    "next": self.get_next_link(),
+                    "has_next": self.has_next,
+                },
+                "data": data,
+            }
+        )
+
+
+class SwitchablePaginationMixin:
+    """預設頁碼分頁；帶 cursor 或 pagination=cursor 時改用 KeysetPagination"""
+
+    cursor_pagination_class = KeysetPagination
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return "cursor" in params or params.get("pagination") == "cursor"
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -0,0 +1,172 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignObjectRel, Prefetch
+from rest_framework import serializers
+
+
+class Projection(NamedTuple):
+    only: tuple
+    select_related: tuple
+    prefetch_related: tuple = ()
+    # (名稱, builder)；builder(user) 回傳 annotate 用的 expression
+    annotations: tuple = ()
+
+    def apply(self, queryset, user=None):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        for name, builder in self.annotations:
+            queryset = queryset.annotate(**{name: builder(user)})
+        return queryset.only(*self.only)
+
+
+def apply_projection(queryset, projection, user=None):
+    return queryset if projection is None else projection.apply(queryset, user)
+
+
+class _Plan:
+    """推導過程中累積的欄位與關聯；annotations 為 None 表示此層不可 annotate"""
+
+    def __init__(self, annotations=True):
+        self.only = set()
+        self.related = set()
+        self.prefetch = {}
+        self.annotations = {} if annotations else None
+
+    def projection(self):
+        return Projection(
+            tuple(sorted(self.only)),
+            tuple(sorted(self.related)),
+            tuple(self.prefetch[lookup] for lookup in sorted(self.prefetch)),
+            tuple(sorted((self.annotations or {}).items())),
+        )
+
+
+def _resolve_source(model, path, only, related):
+    """將 "author.username" 這類 source 解析成 only/select_related 路徑；無法對應欄位時回傳 False"""
+    current = model
+    for index, attr in enumerate(path):
+        try:
+            field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        lookup = "__".join(path[: index + 1])
+        if index == len(path) - 1:
+            if field.many_to_many or field.one_to_many or not field.concrete:
+                return False
+            only.add(lookup)
+            return True
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return False
+        related.add(lookup)
+        current = field.related_model
+    return False
+
+
+def _resolve_many(model, path):
+    """解析多筆關聯（多對多或反向外鍵）的 source，前段只能是正向外鍵；找不到時回傳 None"""
+    for attr in path[:-1]:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return None
+        model = field.related_model
+    for field in model._meta.get_fields():
+        # 反向關聯在 serializer 中以 accessor（例如 answers、answer_set）引用
+        if isinstance(field, ForeignObjectRel):
+            name = field.get_accessor_name()
+        else:
+            name = field.name
+        if name == path[-1] and (field.many_to_many or field.one_to_many):
+            return field
+    return None
+
+
+def _collect_many(field, model, path, plan):
+    relation = _resolve_many(model, path)
+    if relation is None:
+        return False
+    lookup = "__".join(path)
+    child = getattr(field, "child", None)
+    if not isinstance(child, serializers.ModelSerializer):
+        plan.prefetch[lookup] = lookup
+        return True
+    child_plan = _Plan(annotations=False)
+    if not _collect(child, relation.related_model, [], child_plan):
+        return False
+    if relation.one_to_many:
+        # 反向外鍵需讀取外鍵欄位，prefetch 才能把資料對回父物件
+        child_plan.only.add(relation.field.attname)
+    queryset = child_plan.projection().apply(relation.related_model.objects.all())
+    plan.prefetch[lookup] = Prefetch(lookup, queryset=queryset)
+    return True
+
+
+def _collect(serializer, model, prefix, plan, field_names=None):
+    meta = getattr(serializer, "Meta", None)
+    # SerializerMethodField 讀取的欄位無法推導，需在 Meta.projection_sources 宣告
+    method_sources = getattr(meta, "projection_sources", {})
+    # 由 queryset.annotate 提供的欄位，值為 builder(user)
+    annotations = getattr(meta, "projection_annotations", {})
+    for name, field in serializer.fields.items():
+        if field.write_only or (field_names is not None and name not in field_names):
+            continue
+        if name in annotations:
+            # 只能 annotate 在最外層的 queryset 上
+            if prefix or plan.annotations is None:
+                return False
+            plan.annotations[name] = annotations[name]
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_sources:
+                return False
+            sources = [source.split(".") for source in method_sources[name]]
+        elif field.source == "*":
+            return False
+        elif isinstance(
+            field, (serializers.ListSerializer, serializers.ManyRelatedField)
+        ):
+            if not _collect_many(field, model, prefix + field.source_attrs, plan):
+                return False
+            continue
+        elif isinstance(field, serializers.BaseSerializer):
+            if not _resolve_source(
+                model, prefix + field.source_attrs, set(), plan.related
+            ):
+                return False
+            nested_model = field.Meta.model
+            nested_prefix = prefix + field.source_attrs
+            plan.related.add("__".join(nested_prefix))
+            if not _collect(field, nested_model, nested_prefix, plan):
+                return False
+            continue
+        else:
+            sources = [field.source_attrs]
+        for source in sources:
+            if not _resolve_source(model, prefix + source, plan.only, plan.related):
+                return False
+    if not prefix:
+        plan.only.add("pk")
+    return True
+
+
+@lru_cache(maxsize=None)
+def projection_for(serializer_class, field_names=None):
+    """
+    依 serializer 宣告的欄位推導查詢計畫：only()、select_related()、
+    多筆關聯的 prefetch_related()，以及 Meta.projection_annotations 宣告的 annotate。
+
+    field_names 為要輸出的欄位子集（frozenset）；遇到無法對應到資料欄位的
+    source（例如 "*" 或未宣告的 SerializerMethodField）時回傳 None，
+    由呼叫端取整列資料。
+    """
+    serializer = serializer_class()
+    plan = _Plan()
+    if not _collect(serializer, serializer.Meta.model, [], plan, field_names):
+        return None
+    return plan.projection()
@@ -1,4 +1,6 @@
-from drf_spectacular.utils import inline_serializer
+from functools import lru_cache
+
+from drf_spectacular.utils import OpenApiParameter, inline_serializer
 from rest_framework import serializers
 
 
@@ -24,3 +26,126 @@ def SuccessSerializer(data_serializer: serializers.Serializer, name: str):
             "data": data_serializer,
         },
     )
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+        help_text="資料ID列表",
+    )
+
+
+class BulkResultSerializer(serializers.Serializer):
+    count = serializers.IntegerField(help_text="實際異動的筆數")
+
+
+BulkResultResponseSerializer = SuccessSerializer(
+    BulkResultSerializer(), "BulkResultResponseSerializer"
+)
+
+
+class ListQuerySerializer(serializers.Serializer):
+    """列表查詢參數的共用欄位，子類別以 sort 欄位宣告排序白名單"""
+
+    keyword = serializers.CharField(
+        required=False, allow_blank=True, max_length=100, help_text="關鍵字"
+    )
+    tags = serializers.CharField(
+        required=False, allow_blank=True, max_length=200, help_text="逗號分隔的標籤"
+    )
+    tag_match = serializers.ChoiceField(
+        choices=["any", "all"],
+        default="any",
+        help_text="any 為符合任一標籤，all 為符合所有標籤",
+    )
+    author = serializers.IntegerField(required=False, min_value=1, help_text="作者ID")
+    created_after = serializers.DateTimeField(
+        required=False, help_text="建立時間起（含）"
+    )
+    created_before = serializers.DateTimeField(
+        required=False, help_text="建立時間迄（不含）"
+    )
+
+    def validate(self, attrs):
+        after = attrs.get("created_after")
+        before = attrs.get("created_before")
+        if after and before and after >= before:
+            raise serializers.ValidationError(
+                {"created_before": ["結束時間必須晚於開始時間"]}
+            )
+        return attrs
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """serializer 會輸出的欄位名稱，依宣告順序"""
+    return tuple(
+        name
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    )
+
+
+def _split_names(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def sparse_fields(params, serializer_class):
+    """
+    解析 ?fields= 與 ?exclude=，回傳要輸出的欄位 frozenset；都未提供時回傳 None。
+
+    結果同時交給 serializer 的 fields 參數與 projection_for，
+    未要求的欄位不會輸出，也不會從資料庫讀取。
+    """
+    requested = _split_names(params.get("fields"))
+    excluded = _split_names(params.get("exclude"))
+    if not requested and not excluded:
+        return None
+    available = readable_fields(serializer_class)
+    for param, names in (("fields", requested), ("exclude", excluded)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise serializers.ValidationError(
+                {param: [f"不支援的欄位：{', '.join(unknown)}"]}
+            )
+    selected = frozenset(requested or available) - set(excluded)
+    if not selected:
+        raise serializers.ValidationError({"exclude": ["至少需要保留一個欄位"]})
+    return selected
+
+
+def sparse_fields_parameters(serializer_class):
+    """fields / exclude 查詢參數的 OpenAPI 描述，可選值即 serializer 的輸出欄位"""
+    names = list(readable_fields(serializer_class))
+    return [
+        OpenApiParameter(
+            name="fields",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            many=True,
+            explode=False,
+            enum=names,
+            description="只回傳指定欄位（逗號分隔），其餘欄位不會出現在回應中",
+        ),
+        OpenApiParameter(
+            name="exclude",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            many=True,
+            explode=False,
+            enum=names,
+            description="不回傳指定欄位（逗號分隔）",
+        ),
+    ]
+
+
+class SparseFieldsMixin:
+    """接受 fields 參數（sparse_fields 的結果），移除未要求的欄位"""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
@@ -0,0 +1,24 @@
+import re
+
+SELECT_RE = re.compile(r"^SELECT (?:DISTINCT )?(?P<columns>.*?) FROM ", re.S)
+
+
+def selected_columns(sql):
+    """取出 SELECT 子句的欄位並去除引號，例如 "posts_post.title"，供測試斷言實際讀取的欄位"""
+    match = SELECT_RE.match(sql)
+    if match is None:
+        return []
+    return [column.replace('"', "") for column in match["columns"].split(", ")]
+
+
+def find_select(queries, table):
+    """從 CaptureQueriesContext 的紀錄中找出讀取指定資料表資料列（非 COUNT）的查詢"""
+    for query in queries:
+        sql = query["sql"]
+        if (
+            sql.startswith("SELECT")
+            and f'FROM "{table}"' in sql
+            and "COUNT(" not in sql
+        ):
+            return sql
+    return None
@@ -0,0 +1,121 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from apps.posts.models import Post
+from apps.posts.repository import PostRepository
+from apps.posts.search import search_enabled
+
+WORDS = (
+    "資料庫",
+    "效能",
+    "索引",
+    "全文檢索",
+    "快取",
+    "分頁",
+    "權限",
+    "部署",
+    "容器",
+    "非同步",
+    "django",
+    "postgres",
+    "redis",
+    "docker",
+    "python",
+)
+KEYWORDS = ("全文檢索", "索引", "快取", "非同步", "django", "檢")
+
+
+class _Rollback(Exception):
+    pass
+
+
+def build_posts(author, count, seed):
+    rng = random.Random(seed)
+    return [
+        Post(
+            title=" ".join(rng.choices(WORDS, k=3)),
+            content="，".join(rng.choices(WORDS, k=60)),
+            author=author,
+        )
+        for _ in range(count)
+    ]
+
+
+def time_queries(build_queryset, keywords, repeat, page_size):
+    hits = {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for keyword in keywords:
+            queryset = build_queryset(keyword)
+            hits[keyword] = queryset.count()
+            list(queryset[:page_size])
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(keywords)), hits
+
+
+class Command(BaseCommand):
+    help = "比較貼文搜尋（icontains vs. search_vector 全文檢索）每次查詢的延遲"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=0, help="額外產生的測試貼文數，結束後回滾"
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            raise CommandError("全文檢索需要 PostgreSQL")
+        try:
+            with transaction.atomic():
+                if options["posts"]:
+                    self._seed(options["posts"], options["seed"])
+                self._report(options["repeat"], options["page_size"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, count, seed):
+        author, _ = get_user_model().objects.get_or_create(
+            email="bench-search@example.com",
+            defaults={"nickname": "bench-search"},
+        )
+        started = time.perf_counter()
+        for start in range(0, count, 5000):
+            batch = build_posts(author, min(5000, count - start), seed + start)
+            ids = [post.id for post in Post.objects.bulk_create(batch)]
+            PostRepository.refresh_search_vectors(ids)
+        self.stdout.write(
+            f"seeded {count} posts in {time.perf_counter() - started:.1f} s"
+        )
+
+    def _report(self, repeat, page_size):
+        posts = Post.objects.defer("search_vector")
+        icontains_seconds, icontains_hits = time_queries(
+            lambda keyword: posts.filter(
+                Q(title__icontains=keyword) | Q(content__icontains=keyword)
+            ).order_by("-created_at"),
+            KEYWORDS,
+            repeat,
+            page_size,
+        )
+        search_seconds, search_hits = time_queries(
+            lambda keyword: PostRepository.search(posts, keyword),
+            KEYWORDS,
+            repeat,
+            page_size,
+        )
+        self.stdout.write(f"posts: {Post.objects.count()}")
+        self.stdout.write(f"icontains:     {icontains_seconds * 1000:.2f} ms/query")
+        self.stdout.write(f"search_vector: {search_seconds * 1000:.2f} ms/query")
+        for keyword in KEYWORDS:
+            self.stdout.write(
+                f"  {keyword!r}: icontains={icontains_hits[keyword]} "
+                f"search_vector={search_hits[keyword]}"
+            )
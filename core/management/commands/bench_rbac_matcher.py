@@ -0,0 +1,94 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.rbac.matcher import PermissionMatcher
+
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+
+def build_permissions(resource_count):
+    permissions = []
+    for index in range(resource_count):
+        base = f"/api/v1/resource-{index}/"
+        for method in ("GET", "POST"):
+            permissions.append((len(permissions), base, method))
+        for method in ("GET", "PUT", "PATCH", "DELETE"):
+            permissions.append((len(permissions), base + r"\d+/", method))
+        permissions.append((len(permissions), base + r"\d+/like/", "POST"))
+    return permissions
+
+
+def build_requests(resource_count, count):
+    rng = random.Random(42)
+    requests = []
+    for _ in range(count):
+        index = rng.randrange(resource_count)
+        path = rng.choice(
+            (
+                f"/api/v1/resource-{index}/",
+                f"/api/v1/resource-{index}/{rng.randrange(1, 10**6)}/",
+                f"/api/v1/resource-{index}/{rng.randrange(1, 10**6)}/like/",
+                f"/api/v1/unknown-{index}/",
+            )
+        )
+        requests.append((path, rng.choice(METHODS)))
+    return requests
+
+
+def linear_match(compiled, path, method):
+    return [
+        permission_id
+        for permission_id, pattern, permission_method in compiled
+        if permission_method == method and pattern.fullmatch(path)
+    ]
+
+
+class Command(BaseCommand):
+    help = "比較 RBAC 權限比對（線性掃描 vs. 路徑 trie）每次檢查的延遲"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resources", type=int, default=1000)
+        parser.add_argument("--checks", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        resource_count = options["resources"]
+        permissions = build_permissions(resource_count)
+        requests = build_requests(resource_count, options["checks"])
+
+        started = time.perf_counter()
+        matcher = PermissionMatcher(permissions)
+        build_seconds = time.perf_counter() - started
+
+        compiled = [
+            (permission_id, re.compile(api_url), method)
+            for permission_id, api_url, method in permissions
+        ]
+
+        linear_requests = requests[: max(1, len(requests) // 20)]
+        started = time.perf_counter()
+        for path, method in linear_requests:
+            linear_match(compiled, path, method)
+        linear_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for path, method in requests:
+            matcher.match(path, method)
+        trie_seconds = time.perf_counter() - started
+
+        for path, method in linear_requests:
+            if sorted(matcher.match(path, method)) != linear_match(
+                compiled, path, method
+            ):
+                raise AssertionError(f"比對結果不一致: {method} {path}")
+
+        self.stdout.write(f"permissions: {len(permissions)}")
+        self.stdout.write(f"trie build: {build_seconds * 1000:.2f} ms")
+        self.stdout.write(
+            f"linear scan: {linear_seconds / len(linear_requests) * 1e6:.2f} us/check"
+        )
+        self.stdout.write(
+            f"path trie:   {trie_seconds / len(requests) * 1e6:.2f} us/check"
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.rbac.repositories import PermissionMatcherRepository
+from apps.rbac.routes import get_api_routes
+
+
+class Command(BaseCommand):
+    help = "列出沒有任何啟用中權限對應的 API 路由"
+
+    def handle(self, *args, **options):
+        matcher = PermissionMatcherRepository.build_matcher()
+        missing = [
+            (route, method)
+            for route in get_api_routes()
+            for method in route.methods
+            if not matcher.match_route(route.name, method)
+        ]
+        for route, method in missing:
+            self.stdout.write(f"{method:<7} {route.name:<40} {route.sample_path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"共 {len(missing)} 個路由 method 沒有對應權限")
+        )
@@ -1,25 +1,98 @@
 # yourapp/management/commands/seed_data.py
+import hashlib
+import json
+from dataclasses import asdict
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
-from apps.rbac.models import Permission, Role
+from apps.rbac.models import Permission, Role, SeedState
+from apps.rbac.repositories import (
+    RBACVersionRepository,
+    RoleClosureRepository,
+    RoleRepository,
+)
 from apps.users.models import User
-from core.management.commands.seeds.bind_permissions import bind_permissions
+from core.management.commands.seeds.bind_permissions import (
+    bind_permissions,
+    set_bindings,
+)
 from core.management.commands.seeds.set_permissions import set_permissions
 from core.management.commands.seeds.set_roles import set_roles
 
+SEED_NAME = "init_data"
+
+
+def seed_fingerprint():
+    payload = {
+        "permissions": [asdict(permission) for permission in set_permissions()],
+        "roles": [asdict(role) for role in set_roles()],
+        "bindings": set_bindings(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _changed(seed_rows, model_class, fields):
+    """只挑出新增或欄位值不同的種子資料，回傳 (rows, 既有 code 對應的 bit_index)"""
+    codes = [row["code"] for row in seed_rows]
+    existing = {
+        row["code"]: row
+        for row in model_class.objects.filter(code__in=codes).values(*fields)
+    }
+    changed = [
+        row
+        for row in seed_rows
+        if any(existing.get(row["code"], {}).get(key) != row[key] for key in row)
+    ]
+    return changed, existing
+
 
 def create_permissions():
-    for permission_data in set_permissions():
-        permission_dict = permission_data.__dict__
-        Permission.objects.update_or_create(
-            code=permission_dict["code"], defaults=permission_dict
-        )
+    seed_rows = [asdict(permission) for permission in set_permissions()]
+    fields = list(seed_rows[0]) + ["bit_index"]
+    changed, existing = _changed(seed_rows, Permission, fields)
+    if not changed:
+        return False
+
+    # bulk_create 不會呼叫 save()，新權限的 bit_index 需在這裡配發
+    next_bit_index = Permission.next_bit_index()
+    permissions = []
+    for row in changed:
+        bit_index = existing.get(row["code"], {}).get("bit_index")
+        if bit_index is None:
+            bit_index = next_bit_index
+            next_bit_index += 1
+        permissions.append(Permission(bit_index=bit_index, **row))
+    Permission.objects.bulk_create(
+        permissions,
+        update_conflicts=True,
+        unique_fields=["code"],
+        update_fields=[field for field in fields if field != "code"] + ["updated_at"],
+    )
+    return True
 
 
 def create_roles():
-    for role_data in set_roles():
-        role_dict = role_data.__dict__
-        Role.objects.update_or_create(code=role_dict["code"], defaults=role_dict)
+    seed_rows = [asdict(role) for role in set_roles()]
+    fields = list(seed_rows[0])
+    changed, _ = _changed(seed_rows, Role, fields)
+    if not changed:
+        return False
+
+    Role.objects.bulk_create(
+        [Role(**row) for row in changed],
+        update_conflicts=True,
+        unique_fields=["code"],
+        update_fields=[field for field in fields if field != "code"] + ["updated_at"],
+    )
+    # bulk_create 不會呼叫 save()，新角色的閉包自身列需在這裡補上
+    RoleClosureRepository.create_self_links(
+        Role.objects.filter(code__in=[row["code"] for row in changed]).values_list(
+            "id", flat=True
+        )
+    )
+    return True
 
 
 def create_superuser(email, password):
@@ -37,7 +110,31 @@ def create_superuser(email, password):
 class Command(BaseCommand):
     help = "Seed initial data"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="忽略指紋比對，重新套用種子資料"
+        )
+
     def handle(self, **kwargs):
-        create_permissions()
-        create_roles()
-        bind_permissions()
+        fingerprint = seed_fingerprint()
+        stored = (
+            SeedState.objects.filter(name=SEED_NAME)
+            .values_list("fingerprint", flat=True)
+            .first()
+        )
+        if stored == fingerprint and not kwargs["force"]:
+            self.stdout.write("Seed data is up to date, skipped.")
+            return
+
+        with transaction.atomic():
+            permissions_changed = create_permissions()
+            roles_changed = create_roles()
+            bound_role_ids = bind_permissions()
+            if permissions_changed or roles_changed:
+                RBACVersionRepository.bump_global_version()
+            if bound_role_ids:
+                RoleRepository.invalidate_roles(bound_role_ids)
+            SeedState.objects.update_or_create(
+                name=SEED_NAME, defaults={"fingerprint": fingerprint}
+            )
+        self.stdout.write(self.style.SUCCESS("Seed data applied."))
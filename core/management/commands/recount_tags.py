@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.tags.repository import TagRepository
+
+
+class Command(BaseCommand):
+    help = "以關聯表重算標籤的貼文與問題使用次數"
+
+    def handle(self, *args, **options):
+        updated = TagRepository.recount()
+        self.stdout.write(self.style.SUCCESS(f"已重算 {updated} 個標籤"))
@@ -2,22 +2,45 @@ from apps.rbac.models import Permission, Role, RolePermission
 from core.management.commands.seeds.set_permissions import set_permissions
 
 
-def bind_permissions():
-    try:
-        admin_role = Role.objects.get(code="admin")
-    except Role.DoesNotExist as e:
-        print(f"Error: Required role not found: {e}")
-        return
+def set_bindings():
+    return {"admin": [permission.code for permission in set_permissions()]}
 
-    all_permission_codes = [permission.code for permission in set_permissions()]
 
-    for permission_code in all_permission_codes:
-        try:
-            permission = Permission.objects.get(code=permission_code)
-            RolePermission.objects.update_or_create(
-                role=admin_role, permission=permission, defaults={"is_active": True}
-            )
-        except Permission.DoesNotExist:
-            print(f"Warning: Permission '{permission_code}' not found in database")
+def bind_permissions(bindings=None):
+    """補齊角色與權限的綁定，回傳有異動的角色 ID"""
+    bindings = set_bindings() if bindings is None else bindings
+    role_ids = dict(Role.objects.filter(code__in=bindings).values_list("code", "id"))
+    for role_code in bindings.keys() - role_ids.keys():
+        print(f"Error: Required role not found: {role_code}")
 
-    return
+    permission_codes = {code for codes in bindings.values() for code in codes}
+    permission_ids = dict(
+        Permission.objects.filter(code__in=permission_codes).values_list("code", "id")
+    )
+    for permission_code in sorted(permission_codes - permission_ids.keys()):
+        print(f"Warning: Permission '{permission_code}' not found in database")
+
+    active = set(
+        RolePermission.objects.filter(
+            role_id__in=role_ids.values(), is_active=True
+        ).values_list("role_id", "permission_id")
+    )
+    missing = [
+        RolePermission(
+            role_id=role_ids[role_code],
+            permission_id=permission_ids[permission_code],
+            is_active=True,
+        )
+        for role_code, codes in bindings.items()
+        if role_code in role_ids
+        for permission_code in codes
+        if permission_code in permission_ids
+        and (role_ids[role_code], permission_ids[permission_code]) not in active
+    ]
+    RolePermission.objects.bulk_create(
+        missing,
+        update_conflicts=True,
+        unique_fields=["role", "permission"],
+        update_fields=["is_active", "updated_at"],
+    )
+    return {binding.role_id for binding in missing}
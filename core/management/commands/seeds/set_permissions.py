@@ -11,6 +11,7 @@ class PermissionField:
     resource: str
     category: str
     api_url: str
+    route_name: str
     method: str
 
 
@@ -26,6 +27,7 @@ def set_permissions():
             resource="permissions",
             category="rbac",
             api_url=r"/api/v1/rbac/permissions/",
+            route_name="rbac:permission-list",
             method="GET",
         ),
         PermissionField(
@@ -37,6 +39,7 @@ def set_permissions():
             resource="permissions",
             category="rbac",
             api_url=r"/api/v1/rbac/permissions/",
+            route_name="rbac:permission-list",
             method="POST",
         ),
         PermissionField(
@@ -47,7 +50,8 @@ def set_permissions():
             action="get",
             resource="permissions",
             category="rbac",
-            api_url=r"/api/v1/rbac/permissions/\\d+/",
+            api_url=r"/api/v1/rbac/permissions/\d+/",
+            route_name="rbac:permission-detail",
             method="GET",
         ),
         PermissionField(
@@ -58,7 +62,8 @@ def set_permissions():
             action="update",
             resource="permissions",
             category="rbac",
-            api_url=r"/api/v1/rbac/permissions/\\d+/",
+            api_url=r"/api/v1/rbac/permissions/\d+/",
+            route_name="rbac:permission-detail",
             method="PATCH",
         ),
         PermissionField(
@@ -69,7 +74,8 @@ def set_permissions():
             action="delete",
             resource="permissions",
             category="rbac",
-            api_url=r"/api/v1/rbac/permissions/\\d+/",
+            api_url=r"/api/v1/rbac/permissions/\d+/",
+            route_name="rbac:permission-detail",
             method="DELETE",
         ),
         PermissionField(
@@ -81,8 +87,21 @@ def set_permissions():
             resource="permissions",
             category="rbac",
             api_url=r"/api/v1/rbac/permissions/batch-update/",
+            route_name="rbac:permission-batch-update",
             method="PATCH",
         ),
+        PermissionField(
+            code="list-permission-users",
+            name="List Permission Users",
+            function_zh="取得持有權限的使用者",
+            is_active=True,
+            action="list",
+            resource="permission-users",
+            category="rbac",
+            api_url=r"/api/v1/rbac/permissions/\d+/users/",
+            route_name="rbac:permission-users",
+            method="GET",
+        ),
         PermissionField(
             code="list-roles",
             name="List Roles",
@@ -92,6 +111,7 @@ def set_permissions():
             resource="roles",
             category="rbac",
             api_url=r"/api/v1/rbac/roles/",
+            route_name="rbac:role-list",
             method="GET",
         ),
         PermissionField(
@@ -103,8 +123,21 @@ def set_permissions():
             resource="roles",
             category="rbac",
             api_url=r"/api/v1/rbac/roles/",
+            route_name="rbac:role-list",
             method="POST",
         ),
+        PermissionField(
+            code="get-role-matrix",
+            name="Get Role Matrix",
+            function_zh="取得角色權限矩陣",
+            is_active=True,
+            action="matrix",
+            resource="roles",
+            category="rbac",
+            api_url=r"/api/v1/rbac/roles/matrix/",
+            route_name="rbac:role-matrix",
+            method="GET",
+        ),
         PermissionField(
             code="get-role",
             name="Get Role Detail",
@@ -113,7 +146,8 @@ def set_permissions():
             action="get",
             resource="roles",
             category="rbac",
-            api_url=r"/api/v1/rbac/roles/\\d+/",
+            api_url=r"/api/v1/rbac/roles/\d+/",
+            route_name="rbac:role-detail",
             method="GET",
         ),
         PermissionField(
@@ -124,7 +158,8 @@ def set_permissions():
             action="update",
             resource="roles",
             category="rbac",
-            api_url=r"/api/v1/rbac/roles/\\d+/",
+            api_url=r"/api/v1/rbac/roles/\d+/",
+            route_name="rbac:role-detail",
             method="PUT",
         ),
         PermissionField(
@@ -135,7 +170,8 @@ def set_permissions():
             action="delete",
             resource="roles",
             category="rbac",
-            api_url=r"/api/v1/rbac/roles/\\d+/",
+            api_url=r"/api/v1/rbac/roles/\d+/",
+            route_name="rbac:role-detail",
             method="DELETE",
         ),
         PermissionField(
@@ -146,7 +182,8 @@ def set_permissions():
             action="id-list",
             resource="role-users",
             category="rbac",
-            api_url=r"/api/v1/rbac/roles/\\d+/users/",
+            api_url=r"/api/v1/rbac/roles/\d+/users/",
+            route_name="rbac:role-users-detail",
             method="GET",
         ),
         PermissionField(
@@ -157,9 +194,22 @@ def set_permissions():
             action="update",
             resource="role-users",
             category="rbac",
-            api_url=r"/api/v1/rbac/roles/\\d+/users/",
+            api_url=r"/api/v1/rbac/roles/\d+/users/",
+            route_name="rbac:role-users-detail",
             method="PUT",
         ),
+        PermissionField(
+            code="bulk-update-role-users",
+            name="Bulk Update Role Users",
+            function_zh="批次調整角色成員",
+            is_active=True,
+            action="bulk-update",
+            resource="role-users",
+            category="rbac",
+            api_url=r"/api/v1/rbac/roles/\d+/users/bulk/",
+            route_name="rbac:role-users-bulk",
+            method="POST",
+        ),
         PermissionField(
             code="list-all-role-users",
             name="List All Role Users",
@@ -169,8 +219,33 @@ def set_permissions():
             resource="role-users",
             category="rbac",
             api_url=r"/api/v1/rbac/roles/users/",
+            route_name="rbac:role-users-list",
             method="GET",
         ),
+        PermissionField(
+            code="get-my-permissions",
+            name="Get My Permissions",
+            function_zh="取得自己的有效權限代碼",
+            is_active=True,
+            action="list",
+            resource="my-permissions",
+            category="rbac",
+            api_url=r"/api/v1/rbac/me/permissions/",
+            route_name="rbac:my-permissions",
+            method="GET",
+        ),
+        PermissionField(
+            code="check-my-permissions",
+            name="Check My Permissions",
+            function_zh="批次檢查自己的權限",
+            is_active=True,
+            action="check",
+            resource="my-permissions",
+            category="rbac",
+            api_url=r"/api/v1/rbac/me/permissions/check/",
+            route_name="rbac:my-permissions-check",
+            method="POST",
+        ),
         # Posts
         PermissionField(
             code="post.create",
@@ -181,6 +256,7 @@ def set_permissions():
             resource="posts",
             category="posts",
             api_url=r"/api/v1/posts/",
+            route_name="posts:post_list",
             method="POST",
         ),
         PermissionField(
@@ -192,6 +268,7 @@ def set_permissions():
             resource="posts",
             category="posts",
             api_url=r"/api/v1/posts/",
+            route_name="posts:post_list",
             method="GET",
         ),
         PermissionField(
@@ -202,7 +279,8 @@ def set_permissions():
             action="get",
             resource="posts",
             category="posts",
-            api_url=r"/api/v1/posts/\\d+/",
+            api_url=r"/api/v1/posts/\d+/",
+            route_name="posts:post_detail",
             method="GET",
         ),
         PermissionField(
@@ -213,7 +291,8 @@ def set_permissions():
             action="update",
             resource="posts",
             category="posts",
-            api_url=r"/api/v1/posts/\\d+/",
+            api_url=r"/api/v1/posts/\d+/",
+            route_name="posts:post_detail",
             method="PUT",
         ),
         PermissionField(
@@ -224,7 +303,8 @@ def set_permissions():
             action="update",
             resource="posts",
             category="posts",
-            api_url=r"/api/v1/posts/\\d+/",
+            api_url=r"/api/v1/posts/\d+/",
+            route_name="posts:post_detail",
             method="PATCH",
         ),
         PermissionField(
@@ -235,9 +315,46 @@ def set_permissions():
             action="delete",
             resource="posts",
             category="posts",
-            api_url=r"/api/v1/posts/\\d+/",
+            api_url=r"/api/v1/posts/\d+/",
+            route_name="posts:post_detail",
             method="DELETE",
         ),
+        PermissionField(
+            code="post.bulk_update",
+            name="Bulk Update Posts",
+            function_zh="批次更新貼文",
+            is_active=True,
+            action="update",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/bulk-update/",
+            route_name="posts:post_bulk_update",
+            method="POST",
+        ),
+        PermissionField(
+            code="post.bulk_delete",
+            name="Bulk Delete Posts",
+            function_zh="批次刪除貼文",
+            is_active=True,
+            action="delete",
+            resource="posts",
+            category="posts",
+            api_url=r"/api/v1/posts/bulk-delete/",
+            route_name="posts:post_bulk_delete",
+            method="POST",
+        ),
+        PermissionField(
+            code="post.moderate",
+            name="Moderate Posts",
+            function_zh="管理所有人的貼文",
+            is_active=True,
+            action="moderate",
+            resource="posts",
+            category="posts",
+            api_url="",
+            route_name="",
+            method="",
+        ),
         # Questions
         PermissionField(
             code="question.create",
@@ -248,6 +365,7 @@ def set_permissions():
             resource="questions",
             category="questions",
             api_url=r"/api/v1/questions/",
+            route_name="questions:question_list",
             method="POST",
         ),
         PermissionField(
@@ -259,6 +377,7 @@ def set_permissions():
             resource="questions",
             category="questions",
             api_url=r"/api/v1/questions/",
+            route_name="questions:question_list",
             method="GET",
         ),
         PermissionField(
@@ -269,7 +388,8 @@ def set_permissions():
             action="get",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/",
+            api_url=r"/api/v1/questions/\d+/",
+            route_name="questions:question_detail",
             method="GET",
         ),
         PermissionField(
@@ -280,7 +400,8 @@ def set_permissions():
             action="update",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/",
+            api_url=r"/api/v1/questions/\d+/",
+            route_name="questions:question_detail",
             method="PUT",
         ),
         PermissionField(
@@ -291,7 +412,8 @@ def set_permissions():
             action="update",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/",
+            api_url=r"/api/v1/questions/\d+/",
+            route_name="questions:question_detail",
             method="PATCH",
         ),
         PermissionField(
@@ -302,7 +424,8 @@ def set_permissions():
             action="delete",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/",
+            api_url=r"/api/v1/questions/\d+/",
+            route_name="questions:question_detail",
             method="DELETE",
         ),
         PermissionField(
@@ -313,7 +436,8 @@ def set_permissions():
             action="like",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/like/",
+            api_url=r"/api/v1/questions/\d+/like/",
+            route_name="questions:question_like",
             method="POST",
         ),
         PermissionField(
@@ -324,9 +448,46 @@ def set_permissions():
             action="view",
             resource="questions",
             category="questions",
-            api_url=r"/api/v1/questions/\\d+/view/",
+            api_url=r"/api/v1/questions/\d+/view/",
+            route_name="questions:question_view",
+            method="POST",
+        ),
+        PermissionField(
+            code="question.bulk_update",
+            name="Bulk Update Questions",
+            function_zh="批次更新問題",
+            is_active=True,
+            action="update",
+            resource="questions",
+            category="questions",
+            api_url=r"/api/v1/questions/bulk-update/",
+            route_name="questions:question_bulk_update",
             method="POST",
         ),
+        PermissionField(
+            code="question.bulk_delete",
+            name="Bulk Delete Questions",
+            function_zh="批次刪除問題",
+            is_active=True,
+            action="delete",
+            resource="questions",
+            category="questions",
+            api_url=r"/api/v1/questions/bulk-delete/",
+            route_name="questions:question_bulk_delete",
+            method="POST",
+        ),
+        PermissionField(
+            code="question.moderate",
+            name="Moderate Questions",
+            function_zh="管理所有人的問題",
+            is_active=True,
+            action="moderate",
+            resource="questions",
+            category="questions",
+            api_url="",
+            route_name="",
+            method="",
+        ),
         # Answers
         PermissionField(
             code="answer.create",
@@ -337,6 +498,7 @@ def set_permissions():
             resource="answers",
             category="answers",
             api_url=r"/api/v1/answers/",
+            route_name="answers:answer_create",
             method="POST",
         ),
         PermissionField(
@@ -347,7 +509,8 @@ def set_permissions():
             action="get",
             resource="answers",
             category="answers",
-            api_url=r"/api/v1/answers/\\d+/",
+            api_url=r"/api/v1/answers/\d+/",
+            route_name="answers:answer_detail",
             method="GET",
         ),
         PermissionField(
@@ -358,7 +521,8 @@ def set_permissions():
             action="update",
             resource="answers",
             category="answers",
-            api_url=r"/api/v1/answers/\\d+/",
+            api_url=r"/api/v1/answers/\d+/",
+            route_name="answers:answer_detail",
             method="PUT",
         ),
         PermissionField(
@@ -369,7 +533,8 @@ def set_permissions():
             action="update",
             resource="answers",
             category="answers",
-            api_url=r"/api/v1/answers/\\d+/",
+            api_url=r"/api/v1/answers/\d+/",
+            route_name="answers:answer_detail",
             method="PATCH",
         ),
         PermissionField(
@@ -380,7 +545,8 @@ def set_permissions():
             action="delete",
             resource="answers",
             category="answers",
-            api_url=r"/api/v1/answers/\\d+/",
+            api_url=r"/api/v1/answers/\d+/",
+            route_name="answers:answer_detail",
             method="DELETE",
         ),
         PermissionField(
@@ -391,9 +557,46 @@ def set_permissions():
             action="like",
             resource="answers",
             category="answers",
-            api_url=r"/api/v1/answers/\\d+/like/",
+            api_url=r"/api/v1/answers/\d+/like/",
+            route_name="answers:answer_like",
             method="POST",
         ),
+        PermissionField(
+            code="answer.bulk_update",
+            name="Bulk Update Answers",
+            function_zh="批次更新回答",
+            is_active=True,
+            action="update",
+            resource="answers",
+            category="answers",
+            api_url=r"/api/v1/answers/bulk-update/",
+            route_name="answers:answer_bulk_update",
+            method="POST",
+        ),
+        PermissionField(
+            code="answer.bulk_delete",
+            name="Bulk Delete Answers",
+            function_zh="批次刪除回答",
+            is_active=True,
+            action="delete",
+            resource="answers",
+            category="answers",
+            api_url=r"/api/v1/answers/bulk-delete/",
+            route_name="answers:answer_bulk_delete",
+            method="POST",
+        ),
+        PermissionField(
+            code="answer.moderate",
+            name="Moderate Answers",
+            function_zh="管理所有人的回答",
+            is_active=True,
+            action="moderate",
+            resource="answers",
+            category="answers",
+            api_url="",
+            route_name="",
+            method="",
+        ),
         # Users
         PermissionField(
             code="user.register",
@@ -404,6 +607,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/register/",
+            route_name="user-register",
             method="POST",
         ),
         PermissionField(
@@ -415,6 +619,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/login/",
+            route_name="user-login",
             method="POST",
         ),
         PermissionField(
@@ -426,6 +631,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/logout/",
+            route_name="user-logout",
             method="POST",
         ),
         PermissionField(
@@ -437,6 +643,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/change-password/",
+            route_name="user-change-password",
             method="POST",
         ),
         PermissionField(
@@ -448,6 +655,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/forgot-password/",
+            route_name="user-forgot-password",
             method="POST",
         ),
         PermissionField(
@@ -459,6 +667,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/reset-password/",
+            route_name="user-reset-password",
             method="POST",
         ),
         PermissionField(
@@ -470,6 +679,7 @@ def set_permissions():
             resource="users",
             category="users",
             api_url=r"/api/v1/users/refresh/",
+            route_name="user-refresh-token",
             method="POST",
         ),
     ]
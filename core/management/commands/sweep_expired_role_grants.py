@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.rbac.services.role_service import RoleService
+
+
+class Command(BaseCommand):
+    help = "分批刪除過期的角色綁定，並只讓受影響使用者的權限快取失效"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        affected = RoleService.sweep_expired_grants(options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"已清除 {affected} 位使用者的過期角色"))
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "apps.questions",
     "apps.answers",
     "apps.rbac",
+    "apps.tags",
     "core",
 ]
 
@@ -159,6 +160,16 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 }
 
+# 在 access token 內嵌入權限快照，RBAC 檢查可直接由 claims 判斷
+RBAC_TOKEN_PERMISSIONS = os.getenv("RBAC_TOKEN_PERMISSIONS", "False").lower() == "true"
+
+# RBAC 判定稽核：寫入記憶體緩衝區後由背景執行緒批次寫入，允許的判定依比例取樣
+RBAC_AUDIT_ENABLED = os.getenv("RBAC_AUDIT_ENABLED", "False").lower() == "true"
+RBAC_AUDIT_BUFFER_SIZE = int(os.getenv("RBAC_AUDIT_BUFFER_SIZE", "10000"))
+RBAC_AUDIT_ALLOW_SAMPLE_RATE = float(os.getenv("RBAC_AUDIT_ALLOW_SAMPLE_RATE", "0.01"))
+RBAC_AUDIT_BATCH_SIZE = int(os.getenv("RBAC_AUDIT_BATCH_SIZE", "500"))
+RBAC_AUDIT_FLUSH_INTERVAL = float(os.getenv("RBAC_AUDIT_FLUSH_INTERVAL", "2"))
+
 # drf-spectacular 設定
 SPECTACULAR_SETTINGS = {
     "TITLE": "部落格 API",
@@ -193,10 +204,32 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True").lower() == "true"
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "False").lower() == "true"
 
-# 快取配置（用於存儲驗證碼）
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+# 快取配置（用於存儲驗證碼與 RBAC 世代計數器）
+# RBAC 計數器必須跨 worker 共用，正式環境請設定 REDIS_URL
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
     }
-}
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
+
+# RBAC 權限的 process 內快取秒數；失效通知遺失時最多延遲這麼久，設為 0 可停用
+RBAC_LOCAL_CACHE_TTL = float(os.getenv("RBAC_LOCAL_CACHE_TTL", "5"))
+
+# 列表分頁的計數策略：篩選後的 COUNT 快取秒數，以及改用 pg_class 估計值的資料表筆數門檻
+LIST_COUNT_CACHE_TTL = int(os.getenv("LIST_COUNT_CACHE_TTL", "30"))
+LIST_COUNT_ESTIMATE_THRESHOLD = int(
+    os.getenv("LIST_COUNT_ESTIMATE_THRESHOLD", "100000")
+)
+
+# 序列化時禁止延遲載入（N+1 查詢），違反時拋出 LazyLoadError；預設關閉，測試以 override_settings 開啟
+LAZY_LOAD_GUARD = os.getenv("LAZY_LOAD_GUARD", "False").lower() == "true"